@@ -0,0 +1,128 @@
+"""
+Compare cache container backends on the lookup patterns of the data
+operations.
+
+Usage:
+    python benchmarks/bench_cache_containers.py [--designs N] [--properties N]
+
+A synthetic repository of ObservableProperties, ObservationDesigns and
+(Derived)Observations is loaded in every registered container type. The
+script prints one JSON document with the timings per container.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from peh_model.peh import (
+    DerivedObservation,
+    Observation,
+    ObservableProperty,
+    ObservablePropertySpecification,
+    ObservationDesign,
+)
+
+from pypeh.core.cache.containers import CacheContainerFactory
+
+
+def synthetic_entities(n_designs: int, n_properties: int) -> list:
+    properties = [
+        ObservableProperty(id=f"prop_{i}", ui_label=f"prop_{i}")
+        for i in range(n_properties)
+    ]
+    designs = [
+        ObservationDesign(
+            id=f"design_{i}",
+            observable_property_specifications=[
+                ObservablePropertySpecification(
+                    observable_property=f"prop_{(i + j) % n_properties}"
+                )
+                for j in range(20)
+            ],
+        )
+        for i in range(n_designs)
+    ]
+    observations = [
+        Observation(id=f"obs_{i}", observation_design=f"design_{i}")
+        for i in range(n_designs)
+    ]
+    derived = [
+        DerivedObservation(
+            id=f"derived_{i}",
+            observation_design=f"design_{i}",
+            was_derived_from=f"obs_{i}",
+        )
+        for i in range(n_designs)
+    ]
+    return properties + designs + observations + derived
+
+
+def _timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(container_type: str, entities: list, repeat: int) -> dict:
+    container = CacheContainerFactory.new(container_type)
+
+    def load():
+        for entity in entities:
+            container.add(entity)
+
+    observations = [e for e in entities if type(e) is Observation]
+
+    def lookup_specifications():
+        # extract_labeled_observable_property_specifications
+        for _ in range(repeat):
+            for observation in observations:
+                design = container.get(
+                    observation.observation_design, "ObservationDesign"
+                )
+                for spec in design.observable_property_specifications:
+                    container.get(
+                        spec.observable_property, "ObservableProperty"
+                    )
+
+    def lookup_by_type():
+        for _ in range(repeat):
+            for _ in container.get_all("Observation"):
+                pass
+
+    def reverse_lookup():
+        for _ in range(repeat):
+            for observation in observations:
+                container.get_observation_design_id(observation.id)
+
+    return {
+        "load": _timed(load),
+        "get": _timed(lookup_specifications),
+        "get_all": _timed(lookup_by_type),
+        "design_by_observation": _timed(reverse_lookup),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--designs", type=int, default=2000)
+    parser.add_argument("--properties", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    entities = synthetic_entities(args.designs, args.properties)
+    results = {
+        container_type: run(container_type, entities, args.repeat)
+        for container_type in ("mapping", "indexed")
+    }
+    print(
+        json.dumps(
+            {"entities": len(entities), "seconds": results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
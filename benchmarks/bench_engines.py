@@ -0,0 +1,177 @@
+"""
+Compare peak memory of enrich and aggregate between execution engines.
+
+Usage:
+    python benchmarks/bench_engines.py [--rows N] [--sections N]
+        [--measurements N] [--calculated N] [--strata N]
+        [--engines in-memory,streaming,auto] [--memory-budget SIZE]
+        [--output results.json]
+
+Every engine runs in its own process, so the peak resident set size (RSS)
+of that process is the peak of the engine. The synthetic data (see
+synthetic.py) is built in memory; `setup_peak_rss_bytes` is the peak before
+enrichment starts and `peak_rss_bytes` the peak after aggregation, both as
+reported by getrusage. The script writes one JSON document with the peaks
+and timings per engine. Unix only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+from pypeh import Session
+from pypeh.core.cache.containers import CacheContainerView
+from pypeh.core.cache.utils import load_entities_from_tree
+from pypeh.core.models.internal_data_layout import DatasetSeries
+from synthetic import (
+    ENRICHED_OBSERVATION_ID,
+    IMPORT_CONFIG_ID,
+    SyntheticScale,
+    build_data,
+    build_entities,
+    observation_id,
+    section_label,
+    summary_observation_ids,
+)
+
+ENGINES = ("in-memory", "streaming", "auto")
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_engine(
+    scale: SyntheticScale,
+    engine: str,
+    memory_budget: str | None,
+    seed: int,
+) -> dict:
+    session = Session(
+        default_connection=None, memory_budget=memory_budget, engine=engine
+    )
+    for entity in load_entities_from_tree(build_entities(scale)):
+        session.cache.add(entity)
+    dataset_series = DatasetSeries.from_peh_data_import_config(
+        data_import_config=session.cache.get(
+            IMPORT_CONFIG_ID, "DataImportConfig"
+        ),
+        cache_view=CacheContainerView(session.cache),
+    )
+    for dataset_label, frame in build_data(scale, seed=seed).items():
+        dataset_series.add_data(
+            dataset_label=dataset_label,
+            data=frame,
+            data_labels=frame.columns,
+        )
+    source_observation = session.cache.get(
+        observation_id(section_label(1)), "Observation"
+    )
+    setup_peak = peak_rss_bytes()
+
+    start = time.perf_counter()
+    enriched = session.enrich(
+        dataset_series,
+        [session.cache.get(ENRICHED_OBSERVATION_ID, "Observation")],
+        [source_observation],
+    )
+    enrich_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    summary_observations = [
+        session.cache.get(summary_id, "Observation")
+        for summary_id in summary_observation_ids(scale)
+    ]
+    session.aggregate(
+        enriched,
+        summary_observations,
+        [source_observation] * len(summary_observations),
+    )
+    aggregate_seconds = time.perf_counter() - start
+    return {
+        "setup_peak_rss_bytes": setup_peak,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "seconds": {
+            "enrich": enrich_seconds,
+            "aggregate": aggregate_seconds,
+        },
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    defaults = SyntheticScale()
+    for field in dataclasses.fields(SyntheticScale):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int,
+            default=getattr(defaults, field.name),
+        )
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    parser.add_argument(
+        "--memory-budget",
+        help="memory budget of the sessions, e.g. 100MB, used by 'auto'",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=argparse.FileType("w"), help="write to a file"
+    )
+    # runs a single engine and prints its results, used by the parent
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    scale = SyntheticScale(
+        **{
+            field.name: getattr(args, field.name)
+            for field in dataclasses.fields(SyntheticScale)
+        }
+    )
+    if args.child is not None:
+        result = run_engine(scale, args.child, args.memory_budget, args.seed)
+        print(json.dumps(result))
+        return
+
+    child_argv = [f"--seed={args.seed}"]
+    child_argv.extend(
+        f"--{field.name.replace('_', '-')}={getattr(scale, field.name)}"
+        for field in dataclasses.fields(SyntheticScale)
+    )
+    if args.memory_budget is not None:
+        child_argv.append(f"--memory-budget={args.memory_budget}")
+    engines = {}
+    for engine in args.engines.split(","):
+        completed = subprocess.run(
+            [sys.executable, __file__, *child_argv, "--child", engine],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        engines[engine] = json.loads(completed.stdout.splitlines()[-1])
+
+    results = {
+        "benchmark": "engines",
+        "scale": dataclasses.asdict(scale),
+        "memory_budget": args.memory_budget,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "engines": engines,
+    }
+    document = json.dumps(results, indent=2)
+    if args.output is not None:
+        args.output.write(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Time the import -> validate -> enrich -> aggregate pipeline of a Session.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--rows N] [--sections N]
+        [--measurements N] [--calculated N] [--strata N] [--repeat N]
+        [--output results.json]
+
+A synthetic repository and matching Excel workbook (see synthetic.py) are
+written to a temporary folder. Before timing, the pipeline runs once and its
+enriched and aggregated results are checked against the same calculations
+done directly in polars. Every repeat imports the workbook, validates
+and enriches the resulting DatasetSeries, aggregates it per stratum and
+round trips it through parquet, timing each step. The script writes one
+JSON document with the scale, the environment and the timings per step, so
+results can be stored and compared between releases.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import platform
+import statistics
+import tempfile
+import time
+
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import polars as pl
+import xlsxwriter
+
+from polars.testing import assert_frame_equal
+from pypeh import LocalFileConfig, Session
+from pypeh.core.cache.utils import load_entities_from_tree
+from synthetic import (
+    ENRICHED_OBSERVATION_ID,
+    IMPORT_CONFIG_ID,
+    SUBJECT_KEY,
+    SyntheticScale,
+    build_data,
+    build_entities,
+    calculated_label,
+    measurement_label,
+    observation_id,
+    section_label,
+    stratum_label,
+    summary_label,
+    summary_observation_id,
+    summary_observation_ids,
+)
+
+CONNECTION_LABEL = "benchmark"
+SOURCE_FILE = "data.xlsx"
+
+STEPS = (
+    "import",
+    "validate",
+    "enrich",
+    "aggregate",
+    "parquet_dump",
+    "parquet_read",
+)
+
+
+def _version(package: str) -> str | None:
+    try:
+        return version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def write_workbook(data: dict, path: Path) -> None:
+    with xlsxwriter.Workbook(path) as workbook:
+        for sheet_name, frame in data.items():
+            frame.write_excel(workbook, worksheet=sheet_name)
+
+
+def new_session(scale: SyntheticScale, root_folder: Path) -> Session:
+    session = Session(
+        connection_config=[
+            LocalFileConfig(
+                label=CONNECTION_LABEL,
+                config_dict={"root_folder": str(root_folder)},
+            )
+        ],
+        default_connection=None,
+    )
+    for entity in load_entities_from_tree(build_entities(scale)):
+        session.cache.add(entity)
+    return session
+
+
+def check_results(
+    session: Session, scale: SyntheticScale, data: dict[str, pl.DataFrame]
+) -> None:
+    """
+    Run import, enrich and aggregate once and compare the calculated
+    properties with the same calculations on the source data in polars.
+    """
+    source_label = section_label(1)
+    source_data = data[source_label]
+    source_observation = session.cache.get(
+        observation_id(source_label), "Observation"
+    )
+    dataset_series = session.import_tabular_dataset_series(
+        SOURCE_FILE,
+        session.cache.get(IMPORT_CONFIG_ID, "DataImportConfig"),
+        connection_label=CONNECTION_LABEL,
+    )
+    enriched = session.enrich(
+        dataset_series,
+        [session.cache.get(ENRICHED_OBSERVATION_ID, "Observation")],
+        [source_observation],
+    )
+    calculated = [
+        (pl.col(measurement_label(1, c % scale.measurements)) * (c + 1))
+        .cast(pl.Float64)
+        .alias(calculated_label(c))
+        for c in range(scale.calculated)
+    ]
+    expected = source_data.select(SUBJECT_KEY, *calculated)
+    assert_frame_equal(
+        enriched[source_label].data.select(expected.columns),
+        expected,
+        check_row_order=False,
+        check_dtypes=False,
+    )
+
+    summary_ids = summary_observation_ids(scale)
+    aggregated = session.aggregate(
+        enriched,
+        [session.cache.get(obs_id, "Observation") for obs_id in summary_ids],
+        [source_observation] * len(summary_ids),
+    )
+    strata = [stratum_label(k) for k in range(scale.strata)]
+    for m in range(scale.measurements):
+        label = measurement_label(1, m)
+        expected = source_data.group_by(strata).agg(
+            pl.col(label).mean().alias(summary_label(label))
+        )
+        dataset_label = summary_observation_id(label).split(":", 1)[-1]
+        assert_frame_equal(
+            aggregated[dataset_label].data.select(expected.columns),
+            expected,
+            check_row_order=False,
+            check_dtypes=False,
+        )
+
+
+def run_pipeline(
+    session: Session, scale: SyntheticScale, repeat: int
+) -> dict[str, list[float]]:
+    timings: dict[str, list[float]] = {step: [] for step in STEPS}
+
+    def timed(step: str, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[step].append(time.perf_counter() - start)
+        return result
+
+    data_import_config = session.cache.get(
+        IMPORT_CONFIG_ID, "DataImportConfig"
+    )
+    source_observation = session.cache.get(
+        observation_id(section_label(1)), "Observation"
+    )
+    enriched_observation = session.cache.get(
+        ENRICHED_OBSERVATION_ID, "Observation"
+    )
+    summary_observations = [
+        session.cache.get(obs_id, "Observation")
+        for obs_id in summary_observation_ids(scale)
+    ]
+
+    for run in range(repeat):
+        # enrichment adds the calculated properties to the imported series,
+        # so every run starts from a fresh import
+        dataset_series = timed(
+            "import",
+            lambda: session.import_tabular_dataset_series(
+                SOURCE_FILE,
+                data_import_config,
+                connection_label=CONNECTION_LABEL,
+            ),
+        )
+        reports = timed(
+            "validate",
+            lambda: session.validate_tabular_dataset_series(dataset_series),
+        )
+        total_errors = sum(report.total_errors for report in reports.values())
+        if total_errors > 0:
+            raise RuntimeError(
+                f"Synthetic data failed validation with {total_errors} errors."
+            )
+        enriched = timed(
+            "enrich",
+            lambda: session.enrich(
+                dataset_series, [enriched_observation], [source_observation]
+            ),
+        )
+        timed(
+            "aggregate",
+            lambda: session.aggregate(
+                enriched,
+                summary_observations,
+                [source_observation] * len(summary_observations),
+            ),
+        )
+        paths = timed(
+            "parquet_dump",
+            lambda: session.dump_tabular_dataset_series(
+                enriched,
+                f"parquet_{run}",
+                connection_label=CONNECTION_LABEL,
+            ),
+        )
+        timed(
+            "parquet_read",
+            lambda: session.read_tabular_dataset_series(
+                paths, connection_label=CONNECTION_LABEL
+            ),
+        )
+    return timings
+
+
+def summarize(timings: dict[str, list[float]], rows: int) -> dict:
+    return {
+        step: {
+            "min": min(runs),
+            "median": statistics.median(runs),
+            "runs": runs,
+            "rows_per_second": rows / min(runs) if min(runs) > 0 else None,
+        }
+        for step, runs in timings.items()
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    defaults = SyntheticScale()
+    for field in dataclasses.fields(SyntheticScale):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}",
+            type=int,
+            default=getattr(defaults, field.name),
+        )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path, help="write the results to a file"
+    )
+    args = parser.parse_args(argv)
+
+    scale = SyntheticScale(
+        **{
+            field.name: getattr(args, field.name)
+            for field in dataclasses.fields(SyntheticScale)
+        }
+    )
+    with tempfile.TemporaryDirectory() as root_folder:
+        start = time.perf_counter()
+        data = build_data(scale, seed=args.seed)
+        write_workbook(data, Path(root_folder) / SOURCE_FILE)
+        setup_seconds = time.perf_counter() - start
+        session = new_session(scale, Path(root_folder))
+        check_results(session, scale, data)
+        timings = run_pipeline(session, scale, args.repeat)
+
+    results = {
+        "benchmark": "pipeline",
+        "scale": dataclasses.asdict(scale),
+        "repeat": args.repeat,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pypeh": _version("pypeh"),
+            "polars": _version("polars"),
+        },
+        "setup_seconds": setup_seconds,
+        "seconds": summarize(timings, scale.rows),
+    }
+    document = json.dumps(results, indent=2)
+    if args.output is not None:
+        args.output.write_text(document + "\n")
+    else:
+        print(document)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Synthetic PEH repositories and datasets for the benchmarks.
+
+The generated layout has a SUBJECT section holding the subject key, plus
+`sections` measurement sections that link to SUBJECT through a foreign key.
+The first measurement section also holds the stratification properties.
+
+On top of the ingested observations two calculated observations are defined:
+an enriched observation with `calculated` properties derived from the first
+measurement section, and per measurement of that section a summary
+observation with its mean per stratum. Aggregation summarizes a single
+source element per summary observation.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+
+import peh_model.peh as peh
+import polars as pl
+
+IMPORT_CONFIG_ID = "peh:BENCHMARK_IMPORT_CONFIG"
+LAYOUT_ID = "peh:BENCHMARK_LAYOUT"
+SUBJECT_SECTION = "SUBJECT"
+ENRICHED_OBSERVATION_ID = "peh:BENCHMARK_OBSERVATION_ENRICHED"
+
+SUBJECT_KEY = "id_subject"
+SCALE_FUNCTION = f"{__name__}.scale"
+MEAN_FUNCTION = (
+    "pypeh.adapters.aggregation.polars_adapter.statistics.statistics_mean"
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class SyntheticScale:
+    rows: int = 10_000
+    sections: int = 3
+    measurements: int = 5
+    calculated: int = 2
+    strata: int = 2
+    stratum_levels: int = 4
+
+    def __post_init__(self):
+        if self.sections < 1 or self.measurements < 1:
+            raise ValueError(
+                "A synthetic repository needs at least one measurement "
+                "section with one measurement."
+            )
+
+
+def scale(measurement: pl.Series, factor: float) -> pl.Series:
+    """Calculation used by the calculated properties."""
+    return measurement * float(factor)
+
+
+def section_label(section: int) -> str:
+    return f"SECTION_{section}"
+
+
+def observation_id(section_label: str) -> str:
+    return f"peh:BENCHMARK_OBSERVATION_{section_label}"
+
+
+def measurement_label(section: int, measurement: int) -> str:
+    return f"s{section}_m{measurement}"
+
+
+def stratum_label(stratum: int) -> str:
+    return f"stratum_{stratum}"
+
+
+def calculated_label(calculated: int) -> str:
+    return f"calc_{calculated}"
+
+
+def summary_label(measurement_label: str) -> str:
+    return f"mean_{measurement_label}"
+
+
+def summary_observation_id(measurement_label: str) -> str:
+    return f"peh:BENCHMARK_OBSERVATION_SUMMARY_{measurement_label}"
+
+
+def summary_observation_ids(scale: SyntheticScale) -> list[str]:
+    """Ids of the summary observations, one per measurement."""
+    return [
+        summary_observation_id(measurement_label(1, m))
+        for m in range(scale.measurements)
+    ]
+
+
+def _property(
+    label: str,
+    value_type: str,
+    calculation_design: peh.CalculationDesign | None = None,
+    bounds: tuple[float, float] | None = None,
+) -> peh.ObservableProperty:
+    value_metadata = None
+    if bounds is not None:
+        # range checks give the validation benchmark some work per row
+        value_metadata = [
+            peh.ObservablePropertyMetadataElement(
+                field="min", value=str(bound)
+            )
+            for bound in bounds[:1]
+        ] + [
+            peh.ObservablePropertyMetadataElement(
+                field="max", value=str(bound)
+            )
+            for bound in bounds[1:]
+        ]
+    return peh.ObservableProperty(
+        id=f"peh:{label}",
+        name=label,
+        ui_label=label,
+        value_type=value_type,
+        categorical=False,
+        multivalued=False,
+        required=label == SUBJECT_KEY,
+        zeroallowed=True,
+        value_metadata=value_metadata,
+        calculation_design=calculation_design,
+    )
+
+
+def _calculation(
+    function_name: str,
+    dataset_label: str,
+    field_label: str,
+    mapping_name: str | None = None,
+    **values,
+) -> peh.CalculationDesign:
+    function_kwargs = [
+        peh.CalculationKeywordArgument(
+            mapping_name=mapping_name,
+            contextual_field_reference=peh.ContextualFieldReference(
+                dataset_label=dataset_label,
+                field_label=field_label,
+            ),
+        )
+    ]
+    function_kwargs.extend(
+        peh.CalculationKeywordArgument(mapping_name=name, value=str(value))
+        for name, value in values.items()
+    )
+    return peh.CalculationDesign(
+        calculation_name=function_name.rsplit(".", 1)[-1],
+        calculation_implementation=peh.CalculationImplementation(
+            function_name=function_name,
+            function_kwargs=function_kwargs,
+        ),
+    )
+
+
+def _design(
+    design_id: str,
+    result_type: str,
+    identifying: list[str],
+    optional: list[str],
+) -> peh.ObservationDesign:
+    specifications = [
+        peh.ObservablePropertySpecification(
+            observable_property=f"peh:{label}",
+            specification_category="identifying",
+        )
+        for label in identifying
+    ]
+    specifications.extend(
+        peh.ObservablePropertySpecification(
+            observable_property=f"peh:{label}",
+            specification_category="optional",
+        )
+        for label in optional
+    )
+    return peh.ObservationDesign(
+        id=design_id,
+        observation_result_type=result_type,
+        observable_entity_type="person",
+        observable_property_specifications=specifications,
+    )
+
+
+def _observation(obs_id: str, design: peh.ObservationDesign):
+    name = obs_id.split(":", 1)[-1]
+    return peh.Observation(
+        id=obs_id, name=name, ui_label=name, observation_design=design.id
+    )
+
+
+def build_entities(scale: SyntheticScale) -> peh.EntityList:
+    """
+    ObservableProperties, DataLayout, ObservationDesigns, Observations and
+    the DataImportConfig of a synthetic repository. Use
+    `load_entities_from_tree` to add them to a cache.
+    """
+    strata = [stratum_label(k) for k in range(scale.strata)]
+    measurements = {
+        section_label(s): [
+            measurement_label(s, m) for m in range(scale.measurements)
+        ]
+        for s in range(1, scale.sections + 1)
+    }
+    first_section = section_label(1)
+    calculated = [calculated_label(c) for c in range(scale.calculated)]
+
+    properties = [_property(SUBJECT_KEY, "string")]
+    properties.extend(_property(label, "string") for label in strata)
+    for labels in measurements.values():
+        properties.extend(
+            _property(label, "float", bounds=(0.0, 100.0)) for label in labels
+        )
+    for c, label in enumerate(calculated):
+        source = measurements[first_section][c % scale.measurements]
+        properties.append(
+            _property(
+                label,
+                "float",
+                _calculation(
+                    SCALE_FUNCTION,
+                    observation_id(first_section),
+                    f"peh:{source}",
+                    mapping_name="measurement",
+                    factor=c + 1,
+                ),
+            )
+        )
+    for label in measurements[first_section]:
+        properties.append(
+            _property(
+                summary_label(label),
+                "float",
+                _calculation(
+                    MEAN_FUNCTION,
+                    observation_id(first_section),
+                    f"peh:{label}",
+                ),
+            )
+        )
+
+    section_elements = {SUBJECT_SECTION: [SUBJECT_KEY]}
+    section_elements.update(
+        (label, [SUBJECT_KEY, *labels])
+        for label, labels in measurements.items()
+    )
+    # aggregation works on a single dataset, so the strata are recorded
+    # next to the measurements the summary is calculated from
+    section_elements[first_section][1:1] = strata
+    sections = []
+    for label, element_labels in section_elements.items():
+        elements = [
+            peh.DataLayoutElement(
+                label=element_label,
+                observable_property=f"peh:{element_label}",
+                is_observable_entity_key=element_label == SUBJECT_KEY,
+                foreign_key_link=(
+                    peh.DataLayoutElementLink(
+                        section=f"peh:BENCHMARK_SECTION_{SUBJECT_SECTION}",
+                        label=SUBJECT_KEY,
+                    )
+                    if element_label == SUBJECT_KEY
+                    and label != SUBJECT_SECTION
+                    else None
+                ),
+            )
+            for element_label in element_labels
+        ]
+        sections.append(
+            peh.DataLayoutSection(
+                id=f"peh:BENCHMARK_SECTION_{label}",
+                ui_label=label,
+                section_type="data_table",
+                observable_entity_type="person",
+                elements=elements,
+            )
+        )
+    layout = peh.DataLayout(
+        id=LAYOUT_ID, name="BENCHMARK_LAYOUT", sections=sections
+    )
+
+    designs = []
+    observations = []
+    mapping_links = []
+    for label, element_labels in section_elements.items():
+        design = _design(
+            f"{observation_id(label)}_DESIGN",
+            "measurement",
+            [SUBJECT_KEY],
+            element_labels[1:],
+        )
+        designs.append(design)
+        observations.append(_observation(observation_id(label), design))
+        mapping_links.append(
+            peh.DataImportSectionMappingLink(
+                section=f"peh:BENCHMARK_SECTION_{label}",
+                observation_id_list=[observation_id(label)],
+            )
+        )
+    enriched_design = _design(
+        f"{ENRICHED_OBSERVATION_ID}_DESIGN",
+        "calculation",
+        [SUBJECT_KEY],
+        calculated,
+    )
+    designs.append(enriched_design)
+    observations.append(_observation(ENRICHED_OBSERVATION_ID, enriched_design))
+    for label in measurements[first_section]:
+        summary_design = _design(
+            f"{summary_observation_id(label)}_DESIGN",
+            "calculation",
+            strata,
+            [summary_label(label)],
+        )
+        designs.append(summary_design)
+        observations.append(
+            _observation(summary_observation_id(label), summary_design)
+        )
+
+    import_config = peh.DataImportConfig(
+        id=IMPORT_CONFIG_ID,
+        layout=LAYOUT_ID,
+        section_mapping=peh.DataImportSectionMapping(
+            section_mapping_links=mapping_links
+        ),
+    )
+    return peh.EntityList(
+        observable_properties=properties,
+        layouts=[layout],
+        observation_designs=designs,
+        observations=observations,
+        import_configs=[import_config],
+    )
+
+
+def build_data(
+    scale: SyntheticScale, seed: int = 0
+) -> dict[str, pl.DataFrame]:
+    """One frame per section of the layout built by build_entities."""
+    subject_ids = pl.Series(
+        SUBJECT_KEY, [f"subject_{i}" for i in range(scale.rows)]
+    )
+    row_index = pl.int_range(scale.rows, eager=True)
+
+    def uniform(salt: int, levels: int) -> pl.Series:
+        return row_index.hash(seed + salt) % levels
+
+    strata = [
+        uniform(k, scale.stratum_levels)
+        .cast(pl.String)
+        .alias(stratum_label(k))
+        for k in range(scale.strata)
+    ]
+    data = {SUBJECT_SECTION: pl.DataFrame([subject_ids])}
+    for s in range(1, scale.sections + 1):
+        columns = [subject_ids]
+        if s == 1:
+            columns.extend(strata)
+        columns.extend(
+            (uniform(1000 * s + m, 10_000) / 100.0).alias(
+                measurement_label(s, m)
+            )
+            for m in range(scale.measurements)
+        )
+        data[section_label(s)] = pl.DataFrame(columns)
+    return data
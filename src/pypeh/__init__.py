@@ -1,14 +1,11 @@
-try:
-    from importlib.metadata import version, PackageNotFoundError
-except ImportError:
-    # For Python < 3.8
-    raise NotImplementedError(
-        "pypeh requires Python 3.8+ because importlib.metadata is unavailable."
-    )
+import importlib
+
+from typing import TYPE_CHECKING
 
-from pypeh.core.session.session import Session
-from pypeh.core.models.settings import LocalFileConfig, S3Config
-from pypeh.core.utils.namespaces import NamespaceManager
+if TYPE_CHECKING:
+    from pypeh.core.session.session import Session
+    from pypeh.core.models.settings import LocalFileConfig, S3Config
+    from pypeh.core.utils.namespaces import NamespaceManager
 
 __all__ = [
     "Session",
@@ -17,7 +14,38 @@ __all__ = [
     "NamespaceManager",
 ]
 
-try:
-    __version__ = version("pypeh")
-except PackageNotFoundError:
-    __version__ = "0.0.0"
+# The public names are imported on first access: importing Session pulls in
+# the peh model, linkml and the persistence adapters, which tools that only
+# need part of pypeh should not pay for.
+_LAZY_IMPORTS = {
+    "Session": "pypeh.core.session.session",
+    "LocalFileConfig": "pypeh.core.models.settings",
+    "S3Config": "pypeh.core.models.settings",
+    "NamespaceManager": "pypeh.core.utils.namespaces",
+}
+
+
+def _get_version() -> str:
+    # importlib.metadata is slow to import as well
+    from importlib.metadata import version, PackageNotFoundError
+
+    try:
+        return version("pypeh")
+    except PackageNotFoundError:
+        return "0.0.0"
+
+
+def __getattr__(name: str):
+    if name == "__version__":
+        value = _get_version()
+    elif name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name])
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__) | {"__version__"})
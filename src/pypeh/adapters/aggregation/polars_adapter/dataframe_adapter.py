@@ -6,6 +6,7 @@ import polars as pl
 
 from pypeh.core.interfaces.dataops import AggregationInterface
 from pypeh.adapters.dataops.dataframe_adapter import DataFrameAdapter
+from pypeh.core.utils.profiling import traced
 import pypeh.adapters.aggregation.polars_adapter.statistics as stats
 
 
@@ -14,6 +15,7 @@ class DataFrameAggregationAdapter(
 ):
     data_format = pl.DataFrame
 
+    @traced()
     def calculate_for_strata(
         self,
         df: pl.LazyFrame,
@@ -23,13 +25,16 @@ class DataFrameAggregationAdapter(
         **kwargs,
     ) -> pl.DataFrame:
         if not stratifications:
-            return self._calculate_for_stratum(
-                df=df,
-                group_cols=None,
-                value_col=value_col,
-                stat_builders=stat_builders,
-                **kwargs,
-            ).collect()
+            return self._collect(
+                self._calculate_for_stratum(
+                    df=df,
+                    group_cols=None,
+                    value_col=value_col,
+                    stat_builders=stat_builders,
+                    **kwargs,
+                ),
+                "calculate_for_strata",
+            )
 
         summary_dfs = []
         for strat in stratifications:
@@ -42,8 +47,11 @@ class DataFrameAggregationAdapter(
             )
             summary_dfs.append(summary_df)
 
-        combined_summary = pl.concat(summary_dfs, how="diagonal").collect()
-        return combined_summary
+        return self._collect(
+            pl.concat(summary_dfs, how="diagonal"),
+            "calculate_for_strata",
+            stratum=stratifications,
+        )
 
     def _calculate_for_stratum(
         self,
@@ -101,7 +109,7 @@ class DataFrameAggregationAdapter(
                 lambda left, right: left.join(right, on=strata, how="inner"),
                 results_to_collect,
             )
-        return ret.collect()
+        return self._collect(ret, "group_results", stratum=strata)
 
     def _calculate_frequency(
         self,
@@ -118,4 +126,6 @@ class DataFrameAggregationAdapter(
         fn = self._get_stat_function_from_name("frequency_table")(
             cols, result_aliases=result_aliases
         )
-        return fn(df).collect()
+        return self._collect(
+            fn(df), "_calculate_frequency", stratum=group_cols
+        )
@@ -1,19 +1,36 @@
 from __future__ import annotations
 
 import logging
+import os
 import polars as pl
+import tempfile
+import warnings
 from typing import TYPE_CHECKING
 
 from polars.datatypes import DataType
 from enum import Enum
 
 from pypeh.core.interfaces.dataops import (
+    JoinEdge,
+    JoinEdgeDiagnostics,
     JoinPlan,
     DataOpsInterface,
 )
 from pypeh.core.models.constants import ObservablePropertyValueType
+from pypeh.core.utils.execution import (
+    collect_engine,
+    current_spill_directory,
+)
+from pypeh.core.utils.profiling import current_span, span, traced
+from pypeh.core.utils.query_plans import (
+    QueryPlan,
+    active_report,
+    current_plan_labels,
+)
 
 if TYPE_CHECKING:
+    import pyarrow as pa
+
     from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -26,11 +43,57 @@ class DataFrameAdapter(DataOpsInterface[pl.DataFrame]):
         return data.columns
 
     def get_element_values(
-        self, data: pl.DataFrame, element_label: str, as_list=False
-    ) -> list[str] | set[str]:
+        self,
+        data: pl.DataFrame | pl.LazyFrame,
+        element_label: str,
+        as_list=False,
+        as_series=False,
+    ) -> list[str] | set[str] | pl.Series:
+        if isinstance(data, pl.LazyFrame):
+            column = self._collect(
+                data.select(element_label), "get_element_values"
+            ).to_series()
+        else:
+            column = data.get_column(element_label)
+        if as_series:
+            return column
         if as_list:
-            return data.get_column(element_label).to_list()
-        return set(data.get_column(element_label))
+            return column.to_list()
+        return set(column.unique().to_list())
+
+    def estimate_row_count(
+        self, data: pl.DataFrame | pl.LazyFrame
+    ) -> int | None:
+        if isinstance(data, pl.DataFrame):
+            return data.height
+        return None
+
+    def estimate_byte_size(
+        self, data: pl.DataFrame | pl.LazyFrame
+    ) -> int | None:
+        if isinstance(data, pl.DataFrame):
+            return data.estimated_size()
+        return None
+
+    def spill(
+        self, data: pl.DataFrame | pl.LazyFrame, dataset_label: str
+    ) -> pl.DataFrame | pl.LazyFrame:
+        directory = current_spill_directory()
+        if directory is None:
+            return data
+        fd, path = tempfile.mkstemp(
+            dir=directory, prefix=f"{dataset_label}-", suffix=".arrow"
+        )
+        os.close(fd)
+        with span("spill", dataset_label=dataset_label) as active:
+            if isinstance(data, pl.LazyFrame):
+                data.sink_ipc(path)
+            else:
+                data.write_ipc(path)
+            active.set_attribute("file_bytes", os.path.getsize(path))
+        # not memory mapped, collected frames must not keep the spill
+        # files open once the spill directory is removed
+        return pl.scan_ipc(path, memory_map=False)
 
     def check_element_has_empty_values(
         self, data: pl.DataFrame, element_label: str
@@ -44,20 +107,69 @@ class DataFrameAdapter(DataOpsInterface[pl.DataFrame]):
 
     def subset(
         self,
-        data: pl.DataFrame,
+        data: pl.DataFrame | pl.LazyFrame,
         element_group: list[str],
-        id_group: list[tuple[Any]] | None = None,
+        id_group: list[tuple[Any]]
+        | pl.DataFrame
+        | pl.LazyFrame
+        | pa.Table
+        | None = None,
         identifying_elements: list[str] | None = None,
-    ) -> pl.DataFrame:
+    ) -> pl.DataFrame | pl.LazyFrame:
         if id_group is None:
-            ret = data.select(element_group)
-        else:
-            assert identifying_elements is not None
-            ret = data.filter(
-                pl.struct(identifying_elements).is_in(id_group)
-            ).select(element_group)
+            return data.select(element_group)
 
-        return ret
+        assert identifying_elements is not None
+        ids = self._id_group_frame(data, id_group, identifying_elements)
+        return data.join(
+            ids,
+            on=identifying_elements,
+            how="semi",
+            nulls_equal=True,
+            maintain_order="left",
+        ).select(element_group)
+
+    def _id_group_frame(
+        self,
+        data: pl.DataFrame | pl.LazyFrame,
+        id_group: list[tuple[Any]] | pl.DataFrame | pl.LazyFrame | pa.Table,
+        identifying_elements: list[str],
+    ) -> pl.DataFrame | pl.LazyFrame:
+        """
+        Turn an id group into a frame with one column per identifying
+        element, cast to the dtypes of data so it can be semi-joined.
+        Frame and Arrow id groups are matched positionally when their
+        column names differ from the identifying elements.
+        """
+        if isinstance(id_group, (pl.DataFrame, pl.LazyFrame)):
+            ids = id_group
+        elif hasattr(id_group, "__arrow_c_stream__"):
+            ids = pl.DataFrame(id_group)
+        else:
+            ids = pl.DataFrame(
+                list(id_group),
+                schema=identifying_elements,
+                orient="row",
+            )
+        id_columns = ids.collect_schema().names()
+        if len(id_columns) != len(identifying_elements):
+            raise ValueError(
+                f"id_group has {len(id_columns)} columns, expected one for "
+                f"each of the identifying elements {identifying_elements}."
+            )
+        if id_columns != identifying_elements:
+            ids = ids.rename(dict(zip(id_columns, identifying_elements)))
+        data_schema = data.collect_schema()
+        ids = ids.select(
+            pl.col(element).cast(data_schema[element])
+            for element in identifying_elements
+        )
+        # the join needs both sides to be either eager or lazy
+        if isinstance(data, pl.LazyFrame):
+            return ids.lazy()
+        if isinstance(ids, pl.LazyFrame):
+            return self._collect(ids, "subset")
+        return ids
 
     def relabel(
         self, data: pl.DataFrame, element_mapping: dict[str, str]
@@ -95,33 +207,185 @@ class DataFrameAdapter(DataOpsInterface[pl.DataFrame]):
         self, data: pl.DataFrame | pl.LazyFrame
     ) -> pl.DataFrame:
         if isinstance(data, pl.LazyFrame):
-            return data.collect()
+            return self._collect(data, "normalize_output")
         return data
 
+    def _collect(
+        self, data: pl.LazyFrame, operation: str, **labels: Any
+    ) -> pl.DataFrame:
+        """
+        Collect data, capturing its optimized plan inside an `explain`
+        block. Labels default to the ones set with `plan_labels`.
+        """
+        engine = collect_engine()
+        report = active_report()
+        if report is None:
+            return data.collect(engine=engine)
+        labels = {**current_plan_labels(), **labels}
+        plan = data.explain()
+        node_timings = None
+        if report.profile:
+            # profile is deprecated as it only runs the in-memory engine,
+            # which is the engine collect defaults to in polars 1.x
+            if engine != "in-memory":
+                logger.warning(
+                    f"Profiling {operation} with the in-memory engine "
+                    f"instead of the {engine} engine."
+                )
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                result, node_timings = data.profile()
+        else:
+            result = data.collect(engine=engine)
+        report.add(
+            QueryPlan(
+                operation=operation,
+                plan=plan,
+                node_timings=node_timings,
+                **labels,
+            )
+        )
+        return result
+
+    def _join_edge(
+        self,
+        joined: pl.DataFrame | pl.LazyFrame,
+        other: pl.DataFrame | pl.LazyFrame,
+        left_on: list[str],
+        right_on: list[str],
+        edge: JoinEdge,
+        join_plan: JoinPlan,
+    ) -> pl.DataFrame | pl.LazyFrame:
+        diagnostics = JoinEdgeDiagnostics(
+            edge=edge,
+            left_rows=self.estimate_row_count(joined),
+            right_rows=self.estimate_row_count(other),
+        )
+        eager = isinstance(joined, pl.DataFrame) and isinstance(
+            other, pl.DataFrame
+        )
+        # Right rows without a matching left key never reach the output of
+        # a left or inner join: drop them up front when the left side has
+        # fewer rows, and so fewer distinct keys, than the right side.
+        if (
+            eager
+            and join_plan.semi_join
+            and join_plan.how in ("left", "inner")
+            and joined.height < other.height
+        ):
+            other = other.join(
+                joined.select(left_on),
+                left_on=right_on,
+                right_on=left_on,
+                how="semi",
+            )
+            diagnostics.prefiltered_right_rows = other.height
+
+        join_kwargs = {}
+        if eager:
+            # hash the smaller side
+            if joined.height < other.height:
+                diagnostics.build_side = "prefer_left"
+                if join_plan.how == "left":
+                    join_kwargs["maintain_order"] = "left"
+            else:
+                diagnostics.build_side = "prefer_right"
+            join_kwargs["build_side"] = diagnostics.build_side
+        if join_plan.enforce_unique_keys:
+            diagnostics.validate = "m:1"
+            join_kwargs["validate"] = "m:1"
+
+        try:
+            ret = joined.join(
+                other,
+                left_on=left_on,
+                right_on=right_on,
+                how=join_plan.how,
+                **join_kwargs,
+            )
+        except pl.exceptions.ComputeError as e:
+            if join_plan.enforce_unique_keys:
+                raise ValueError(
+                    f"Join keys {right_on} of dataset '{edge.right_dataset}' "
+                    f"are not unique."
+                ) from e
+            raise
+
+        diagnostics.output_rows = self.estimate_row_count(ret)
+        join_plan.diagnostics.append(diagnostics)
+        logger.debug(
+            "Joined '%s' onto '%s': %s",
+            edge.right_dataset,
+            edge.left_dataset,
+            diagnostics,
+        )
+        if (
+            join_plan.how == "left"
+            and edge.right_dataset not in join_plan.unique_key_datasets
+            and diagnostics.output_rows is not None
+            and diagnostics.left_rows is not None
+            and diagnostics.output_rows > diagnostics.left_rows
+        ):
+            # expected for one-to-many joins, set `enforce_unique_keys` to
+            # reject them instead
+            logger.debug(
+                f"Joining dataset '{edge.right_dataset}' onto "
+                f"'{edge.left_dataset}' increased the row count from "
+                f"{diagnostics.left_rows} to {diagnostics.output_rows}: "
+                f"join keys {right_on} are not unique."
+            )
+        return ret
+
+    @staticmethod
+    def _column_names(data: pl.DataFrame | pl.LazyFrame) -> list[str]:
+        if isinstance(data, pl.LazyFrame):
+            return data.collect_schema().names()
+        return data.columns
+
+    @traced()
     def execute_join_plan(
         self,
         base_data: pl.DataFrame | pl.LazyFrame,
         datasets: dict[str, pl.DataFrame | pl.LazyFrame],
         join_plan: JoinPlan,
     ) -> pl.DataFrame | pl.LazyFrame:
+        current_span().set_attribute(
+            "base_dataset_label", join_plan.base_dataset_label
+        )
+        current_span().set_attribute("edges", len(join_plan.edges))
         joined = base_data
         seen_edges = set()
+        joined_datasets = {join_plan.base_dataset_label}
+        # Multi-hop plans join on fields of datasets joined by an earlier
+        # edge. Track the column each of those fields ended up in: right
+        # join keys are merged into the left keys and clashing names get
+        # the "_right" suffix.
+        joined_columns: set[str] | None = None
+        if any(
+            edge.left_dataset != join_plan.base_dataset_label
+            for edge in join_plan.edges
+        ):
+            joined_columns = set(self._column_names(base_data))
+        column_by_field: dict[tuple[str, str], str] = {}
 
         for edge in join_plan.edges:
             # Invariant: JoinPlan.from_join_specs orients every edge so the
-            # base dataset is always the left side.
-            if edge.left_dataset != join_plan.base_dataset_label:
+            # left side is the base or a dataset joined by an earlier edge.
+            if edge.left_dataset not in joined_datasets:
                 raise ValueError(
                     "JoinEdge is not oriented to base dataset "
                     f"'{join_plan.base_dataset_label}': {edge}"
                 )
-            left_on = edge.left_elements
+            left_on = tuple(
+                column_by_field.get((edge.left_dataset, element), element)
+                for element in edge.left_elements
+            )
             right_on = edge.right_elements
             other_dataset_label = edge.right_dataset
 
             edge_signature = (
                 left_on,
-                join_plan.base_dataset_label,
+                edge.left_dataset,
                 right_on,
                 other_dataset_label,
             )
@@ -140,29 +404,37 @@ class DataFrameAdapter(DataOpsInterface[pl.DataFrame]):
                 if field not in required_fields:
                     required_fields.append(field)
 
+            selected = other_dataset.select(required_fields)
             if isinstance(joined, pl.LazyFrame):
-                if isinstance(other_dataset, pl.LazyFrame):
-                    selected_lf = other_dataset.select(required_fields)
-                else:
-                    selected_lf = other_dataset.select(required_fields).lazy()
-                joined = joined.join(
-                    selected_lf,
-                    left_on=list(left_on),
-                    right_on=list(right_on),
-                    how=join_plan.how,
-                )
-            else:
-                if isinstance(other_dataset, pl.LazyFrame):
-                    selected_df = other_dataset.select(
-                        required_fields
-                    ).collect()
-                else:
-                    selected_df = other_dataset.select(required_fields)
-                joined = joined.join(
-                    selected_df,
-                    left_on=list(left_on),
-                    right_on=list(right_on),
-                    how=join_plan.how,
+                selected = selected.lazy()
+            elif isinstance(selected, pl.LazyFrame):
+                selected = self._collect(
+                    selected,
+                    "execute_join_plan",
+                    dataset_label=other_dataset_label,
                 )
+            joined = self._join_edge(
+                joined,
+                selected,
+                list(left_on),
+                list(right_on),
+                edge,
+                join_plan,
+            )
+
+            joined_datasets.add(other_dataset_label)
+            if joined_columns is not None:
+                for left_column, right_element in zip(left_on, right_on):
+                    column_by_field[(other_dataset_label, right_element)] = (
+                        left_column
+                    )
+                for field in required_fields:
+                    if field in right_on:
+                        continue
+                    column = field
+                    if column in joined_columns:
+                        column = f"{field}_right"
+                    column_by_field[(other_dataset_label, field)] = column
+                    joined_columns.add(column)
 
         return joined
@@ -8,6 +8,7 @@ from pypeh.adapters.dataops.dataframe_adapter import DataFrameAdapter
 from pypeh.core.interfaces.dataops import (
     DataEnrichmentInterface,
 )
+from pypeh.core.utils.profiling import current_span, span
 
 
 logger = logging.getLogger(__name__)
@@ -40,12 +41,29 @@ class DataFrameEnrichmentAdapter(
 
         if len(aliased_exprs) > 0:
             struct_expr = pl.struct(list(aliased_exprs.values()))
+            function_name = getattr(map_fn, "__name__", type(map_fn).__name__)
+            udf_span_name = f"apply_map.{function_name}"
+            struct_fields = list(aliased_exprs)
+            # polars may call the UDF on its own threads, where the span of
+            # the data operation is not active
+            parent_span = current_span()
+
+            def apply_batch(s: pl.Series) -> pl.Series:
+                # polars calls the UDF when the plan is collected, the span
+                # times the Python call for each batch
+                with span(
+                    udf_span_name,
+                    parent=parent_span,
+                    field_label=new_field_name,
+                ) as active:
+                    active.set_attribute("rows", len(s))
+                    fields = {
+                        name: s.struct.field(name) for name in struct_fields
+                    }
+                    return map_fn(**fields, **scalar_kwargs)
+
             mapped = struct_expr.map_batches(
-                lambda s: map_fn(
-                    **{name: s.struct.field(name) for name in aliased_exprs},
-                    **scalar_kwargs,
-                ),
-                return_dtype=output_dtype,
+                apply_batch, return_dtype=output_dtype
             ).alias(new_field_name)
         else:
             mapped = pl.lit(map_fn(**scalar_kwargs), dtype=output_dtype).alias(
@@ -0,0 +1,284 @@
+"""
+Arrow IPC (Feather v2) persistence for DatasetSeries.
+
+The IPC files carry the same pypeh dataset metadata payload as the parquet
+backend, stored under the same Arrow schema metadata key. Uncompressed IPC
+files written to a local path can be reopened through a memory map, so the
+resulting polars frames reference the mapped pages instead of decoded copies.
+"""
+
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+from typing import BinaryIO, Iterable, Literal
+from urllib.parse import quote
+
+from pypeh.adapters.persistence.dataset_parquet import (
+    PYPEH_DATASET_METADATA_KEY,
+    _DatasetContextLink,
+    _DatasetParquetRecord,
+    _DatasetSeriesMetadata,
+    _build_dataset_series_from_records,
+    _build_metadata_payload,
+    _decode_metadata,
+    _ensure_filesystem_directory,
+    _join_filesystem_path,
+    _metadata_to_dataset,
+    _record_file_size,
+)
+from pypeh.core.models.internal_data_layout import Dataset, DatasetSeries
+from pypeh.core.utils.profiling import span
+
+
+IPC_FILE_SUFFIX = ".arrow"
+IpcCompression = Literal["uncompressed", "lz4", "zstd"]
+_FilesystemIpcSource = str | list[str] | tuple[str, ...]
+
+
+def _require_dependencies():
+    try:
+        import polars as pl
+        import pyarrow as pa
+        import pyarrow.ipc as ipc
+    except ImportError as exc:
+        raise ImportError(
+            "Dataset IPC persistence requires the dataframe dependencies "
+            "('polars' and 'pyarrow')."
+        ) from exc
+    return pl, pa, ipc
+
+
+def _dataset_filename(dataset_label: str) -> str:
+    return f"{quote(dataset_label, safe='')}{IPC_FILE_SUFFIX}"
+
+
+def _dump_dataset_to_ipc(
+    dataset: Dataset,
+    destination: str | Path | BinaryIO,
+    compression: IpcCompression = "uncompressed",
+) -> str | Path | BinaryIO:
+    """
+    Dump one Dataset to one Arrow IPC file with pypeh schema metadata.
+
+    Only uncompressed files can be read back zero-copy; compressed buffers
+    have to be decoded on read.
+    """
+    pl, pa, ipc = _require_dependencies()
+    if not isinstance(dataset.data, pl.DataFrame):
+        raise TypeError(
+            "DatasetSeries IPC persistence expects each dataset.data to be a "
+            "polars.DataFrame."
+        )
+    table = dataset.data.to_arrow()
+    metadata = dict(table.schema.metadata or {})
+    metadata[PYPEH_DATASET_METADATA_KEY] = json.dumps(
+        _build_metadata_payload(dataset),
+        sort_keys=True,
+    ).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    options = ipc.IpcWriteOptions(
+        compression=None if compression == "uncompressed" else compression
+    )
+    if isinstance(destination, (str, Path)):
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        sink = pa.OSFile(str(destination), "wb")
+    else:
+        sink = pa.PythonFile(destination, mode="w")
+    try:
+        with ipc.new_file(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    finally:
+        sink.close()
+    return destination
+
+
+def _load_dataset_record(
+    source: str | Path | BinaryIO,
+    memory_map: bool = True,
+) -> _DatasetParquetRecord:
+    pl, pa, ipc = _require_dependencies()
+    if isinstance(source, (str, Path)):
+        normalized_source: Path | BinaryIO = Path(source)
+        if memory_map:
+            arrow_source = pa.memory_map(str(normalized_source), "r")
+        else:
+            arrow_source = pa.OSFile(str(normalized_source), "rb")
+        # the table keeps the mapped buffers alive after the file is closed
+        with arrow_source:
+            table = ipc.open_file(arrow_source).read_all()
+    else:
+        # caller owns the stream, leave it open
+        normalized_source = source
+        table = ipc.open_file(pa.PythonFile(source, mode="r")).read_all()
+
+    metadata = _decode_metadata(
+        (table.schema.metadata or {}).get(PYPEH_DATASET_METADATA_KEY),
+        file_kind="Arrow IPC",
+    )
+    dataset = _metadata_to_dataset(
+        metadata, pl.from_arrow(table, rechunk=False)
+    )
+    return _DatasetParquetRecord(
+        dataset=dataset,
+        series_metadata=_DatasetSeriesMetadata.from_metadata(
+            metadata.get("series")
+        ),
+        context_links=[
+            _DatasetContextLink.from_metadata(link)
+            for link in metadata.get("context_links", [])
+        ],
+        source=normalized_source,
+    )
+
+
+def dump_dataset_series_to_ipc(
+    dataset_series: DatasetSeries,
+    destination: str | Path,
+    *,
+    compression: IpcCompression = "uncompressed",
+) -> list[Path]:
+    """
+    Dump every Dataset in a DatasetSeries to an Arrow IPC file in destination.
+    """
+    if hasattr(destination, "write"):
+        raise TypeError(
+            "DatasetSeries IPC persistence writes one IPC file per Dataset, "
+            "so destination must be a directory path."
+        )
+    destination = Path(destination)
+    destination.mkdir(parents=True, exist_ok=True)
+    outputs = []
+    for dataset_label in dataset_series:
+        dataset = dataset_series[dataset_label]
+        assert dataset is not None
+        output = _dump_dataset_to_ipc(
+            dataset,
+            destination / _dataset_filename(dataset.label),
+            compression=compression,
+        )
+        assert isinstance(output, Path)
+        outputs.append(output)
+    return outputs
+
+
+def dump_dataset_series_to_ipc_filesystem(
+    dataset_series: DatasetSeries,
+    file_system,
+    destination: str,
+    *,
+    compression: IpcCompression = "uncompressed",
+) -> list[str]:
+    """
+    Dump every Dataset in a DatasetSeries as Arrow IPC through fsspec.
+    """
+    _ensure_filesystem_directory(file_system, destination)
+    outputs = []
+    for dataset_label in dataset_series:
+        dataset = dataset_series[dataset_label]
+        assert dataset is not None
+        output_path = _join_filesystem_path(
+            file_system, destination, _dataset_filename(dataset.label)
+        )
+        with span("ipc.dump", dataset_label=dataset.label) as active:
+            with file_system.open(output_path, "wb") as output_file:
+                _dump_dataset_to_ipc(
+                    dataset, output_file, compression=compression
+                )
+            active.record_data(dataset)
+            _record_file_size(active, file_system, output_path)
+        outputs.append(output_path)
+    return outputs
+
+
+def _normalize_ipc_sources(
+    source: str | Path | BinaryIO | Iterable[str | Path],
+):
+    if hasattr(source, "read") and not isinstance(source, (str, Path)):
+        return [source]
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.is_dir():
+            return sorted(path.glob(f"*{IPC_FILE_SUFFIX}"))
+        return [path]
+    return [Path(item) for item in source]
+
+
+def _ipc_files_from_filesystem(
+    file_system, source: _FilesystemIpcSource
+) -> list[str]:
+    if not isinstance(source, str):
+        return list(source)
+
+    if file_system.isfile(source):
+        return [source]
+    if file_system.isdir(source):
+        pattern = _join_filesystem_path(
+            file_system, source, f"*{IPC_FILE_SUFFIX}"
+        )
+        return sorted(file_system.glob(pattern))
+    raise ValueError(f"Path does not exist: {source}")
+
+
+def _is_local_filesystem(file_system) -> bool:
+    protocol = getattr(file_system, "protocol", None)
+    if isinstance(protocol, str):
+        protocol = (protocol,)
+    return bool(protocol) and ("file" in protocol or "local" in protocol)
+
+
+def load_dataset_series_from_ipc(
+    source: str | Path | BinaryIO | Iterable[str | Path],
+    *,
+    validate_foreign_keys: bool = True,
+    memory_map: bool = True,
+) -> DatasetSeries:
+    """
+    Load one or more pypeh dataset Arrow IPC files into a DatasetSeries.
+
+    With memory_map=True, local files are mapped rather than read, so the
+    dataset frames share the operating system page cache across processes.
+    """
+    sources = _normalize_ipc_sources(source)
+    if len(sources) == 0:
+        raise ValueError("No Arrow IPC files found to load.")
+
+    records = [
+        _load_dataset_record(path, memory_map=memory_map) for path in sources
+    ]
+    return _build_dataset_series_from_records(records, validate_foreign_keys)
+
+
+def load_dataset_series_from_ipc_filesystem(
+    file_system,
+    source: _FilesystemIpcSource,
+    *,
+    validate_foreign_keys: bool = True,
+    memory_map: bool = True,
+) -> DatasetSeries:
+    """
+    Load a DatasetSeries from pypeh dataset Arrow IPC files via fsspec.
+
+    Files on a local filesystem are memory mapped; other filesystems are
+    streamed through their file objects.
+    """
+    sources = _ipc_files_from_filesystem(file_system, source)
+    if len(sources) == 0:
+        raise ValueError("No Arrow IPC files found to load.")
+
+    records = []
+    local = memory_map and _is_local_filesystem(file_system)
+    for path in sources:
+        with span("ipc.load", memory_map=local) as active:
+            if local:
+                record = _load_dataset_record(path, memory_map=True)
+            else:
+                with file_system.open(path, "rb") as source_file:
+                    record = _load_dataset_record(source_file)
+            active.record_data(record.dataset)
+            _record_file_size(active, file_system, path)
+        records.append(record)
+    return _build_dataset_series_from_records(records, validate_foreign_keys)
@@ -16,6 +16,7 @@ from pypeh.core.models.internal_data_layout import (
     ElementReference,
     ForeignKey,
 )
+from pypeh.core.utils.profiling import Span, span
 
 
 PYPEH_DATASET_METADATA_KEY = b"pypeh.dataset.v1"
@@ -194,17 +195,21 @@ def _build_metadata_payload(dataset: Dataset) -> dict[str, Any]:
     }
 
 
-def _decode_metadata(payload: bytes | None) -> dict[str, Any]:
+def _decode_metadata(
+    payload: bytes | None, file_kind: str = "Parquet"
+) -> dict[str, Any]:
     if payload is None:
         raise ValueError(
-            "Parquet file does not contain pypeh dataset metadata."
+            f"{file_kind} file does not contain pypeh dataset metadata."
         )
     data = json.loads(payload.decode("utf-8"))
     if data.get("format") != "pypeh.dataset.parquet":
-        raise ValueError("Parquet file contains unsupported pypeh metadata.")
+        raise ValueError(
+            f"{file_kind} file contains unsupported pypeh metadata."
+        )
     if data.get("version") != 1:
         raise ValueError(
-            "Parquet file contains unsupported pypeh metadata version."
+            f"{file_kind} file contains unsupported pypeh metadata version."
         )
     return data
 
@@ -375,12 +380,20 @@ def dump_dataset_series_to_parquet_filesystem(
         output_path = _join_filesystem_path(
             file_system, destination, _dataset_filename(dataset.label)
         )
-        with file_system.open(output_path, "wb") as output_file:
-            _dump_dataset_to_parquet(dataset, output_file)
+        with span("parquet.dump", dataset_label=dataset.label) as active:
+            with file_system.open(output_path, "wb") as output_file:
+                _dump_dataset_to_parquet(dataset, output_file)
+            active.record_data(dataset)
+            _record_file_size(active, file_system, output_path)
         outputs.append(output_path)
     return outputs
 
 
+def _record_file_size(active: Span, file_system, path: str) -> None:
+    if active.recording:
+        active.add_to_attribute("file_bytes", file_system.size(path))
+
+
 def _normalize_parquet_sources(
     source: str | Path | BinaryIO | Iterable[str | Path],
 ):
@@ -464,8 +477,12 @@ def load_dataset_series_from_parquet_filesystem(
 
     records = []
     for path in sources:
-        with file_system.open(path, "rb") as source_file:
-            records.append(_load_dataset_record(source_file))
+        with span("parquet.load") as active:
+            with file_system.open(path, "rb") as source_file:
+                record = _load_dataset_record(source_file)
+            active.record_data(record.dataset)
+            _record_file_size(active, file_system, path)
+        records.append(record)
     return _build_dataset_series_from_records(records, validate_foreign_keys)
 
 
@@ -0,0 +1,438 @@
+"""
+Identifier index over the YAML files of a filesystem connection.
+
+The index maps every entity identifier to the file that defines it and, for
+entities listed directly in an EntityList slot, to the byte range of their
+YAML node. It is built from the YAML node tree, without linkml validation,
+so a caller can parse a single entity instead of the whole repository.
+
+An index can be kept as a sidecar file next to the repository. Every indexed
+file is recorded with its size, modification time and sha256, so `refresh`
+only parses files that changed since the index was written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+
+import yaml
+
+from dataclasses import asdict, dataclass, replace
+from typing import TYPE_CHECKING, Any, Iterator
+
+from peh_model.peh import EntityList, NamedThing
+
+from pypeh.adapters.persistence.serializations import (
+    _YamlSafeLoader,
+    _yaml_load,
+)
+from pypeh.core.models.peh_wrappers import get_entity_list_field_types
+
+if TYPE_CHECKING:
+    import fsspec
+
+    from pypeh.adapters.persistence.hosts import DirectoryIO
+
+logger = logging.getLogger(__name__)
+
+INDEXED_FORMATS = ("yaml", "yml")
+# no registered file extension, so directory loads never pick it up
+ENTITY_INDEX_FILENAME = ".pypeh-entity-index.idx"
+ENTITY_INDEX_VERSION = 1
+
+
+@dataclass(frozen=True)
+class EntityLocation:
+    path: str
+    # None for entities inlined in another entity: their type is only known
+    # once the containing entity is loaded
+    entity_type: str | None
+    # byte range and first-line indentation of the entity's YAML node;
+    # None when the entity can only be loaded with its whole file
+    start: int | None = None
+    end: int | None = None
+    column: int = 0
+
+
+@dataclass(frozen=True)
+class IndexedFile:
+    size: int
+    mtime: str
+    content_hash: str
+
+
+def _file_mtime(info: dict[str, Any]) -> str:
+    # local filesystems report "mtime", object stores a last-modified date
+    for key in ("mtime", "LastModified", "last_modified", "updated"):
+        if info.get(key) is not None:
+            return str(info[key])
+    return ""
+
+
+def _sha256(content: bytes) -> str:
+    return f"sha256:{hashlib.sha256(content).hexdigest()}"
+
+
+def _scalar_value(node: yaml.MappingNode, key: str) -> str | None:
+    for key_node, value_node in node.value:
+        if key_node.value == key and isinstance(value_node, yaml.ScalarNode):
+            return value_node.value
+    return None
+
+
+def _nested_node_identifiers(node: yaml.Node) -> Iterator[str]:
+    stack = []
+    if isinstance(node, yaml.MappingNode):
+        stack.extend(value for _, value in node.value)
+    seen = set()
+    while stack:
+        child = stack.pop()
+        if id(child) in seen:
+            continue
+        seen.add(id(child))
+        if isinstance(child, yaml.MappingNode):
+            nested_id = _scalar_value(child, "id")
+            if nested_id is not None:
+                yield nested_id
+            stack.extend(value for _, value in child.value)
+        elif isinstance(child, yaml.SequenceNode):
+            stack.extend(child.value)
+
+
+def _slot_entities(
+    node: yaml.Node,
+) -> list[tuple[str, yaml.MappingNode]] | None:
+    """
+    Return (identifier, node) for every entity of an EntityList slot, or
+    None for slot forms that are not indexed per entity.
+    """
+    entities = []
+    if isinstance(node, yaml.SequenceNode):
+        for item in node.value:
+            if not isinstance(item, yaml.MappingNode):
+                return None
+            identifier = _scalar_value(item, "id")
+            if identifier is None:
+                return None
+            entities.append((identifier, item))
+        return entities
+    if isinstance(node, yaml.MappingNode):
+        for key_node, item in node.value:
+            if not isinstance(item, yaml.MappingNode):
+                return None
+            identifier = _scalar_value(item, "id") or key_node.value
+            entities.append((identifier, item))
+        return entities
+    return None
+
+
+class _ByteOffsets:
+    """Convert increasing character offsets of a text to byte offsets."""
+
+    def __init__(self, text: str):
+        self._text = text
+        self._char = 0
+        self._byte = 0
+
+    def __call__(self, char_offset: int) -> int:
+        if char_offset < self._char:
+            self._char = 0
+            self._byte = 0
+        segment = self._text[self._char : char_offset]
+        self._byte += len(segment.encode("utf-8"))
+        self._char = char_offset
+        return self._byte
+
+
+class EntityIndex:
+    def __init__(self):
+        self._locations: dict[str, list[EntityLocation]] = {}
+        self._files: dict[str, IndexedFile] = {}
+        self._identifiers_by_file: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self._locations
+
+    def add(self, identifier: str, location: EntityLocation) -> None:
+        locations = self._locations.setdefault(identifier, [])
+        if location not in locations:
+            locations.append(location)
+            self._identifiers_by_file.setdefault(location.path, set()).add(
+                identifier
+            )
+
+    def locate(
+        self, identifier: str, entity_type: str | None = None
+    ) -> EntityLocation | None:
+        """
+        Return where identifier is defined. With entity_type, locations of
+        another type are skipped; nested locations (type unknown) match any
+        type.
+        """
+        for location in self._locations.get(identifier, ()):
+            if entity_type is None or location.entity_type in (
+                None,
+                entity_type,
+            ):
+                return location
+        return None
+
+    def paths(self) -> set[str]:
+        return set(self._identifiers_by_file) | set(self._files)
+
+    def _drop_file(self, path: str) -> None:
+        self._files.pop(path, None)
+        for identifier in self._identifiers_by_file.pop(path, ()):
+            locations = [
+                location
+                for location in self._locations.get(identifier, ())
+                if location.path != path
+            ]
+            if locations:
+                self._locations[identifier] = locations
+            else:
+                self._locations.pop(identifier, None)
+
+    def index_file(
+        self, path: str, content: bytes, info: dict[str, Any] | None = None
+    ) -> int:
+        """
+        (Re)index one YAML file from its content. Replaces all locations
+        previously recorded for path.
+        """
+        self._drop_file(path)
+        self._files[path] = IndexedFile(
+            size=len(content),
+            mtime=_file_mtime(info or {}),
+            content_hash=_sha256(content),
+        )
+        text = content.decode("utf-8")
+        try:
+            root = yaml.compose(text, Loader=_YamlSafeLoader)
+        except yaml.YAMLError:
+            logger.warning(f"Skipping {path}: not a valid YAML document")
+            return 0
+        if not isinstance(root, yaml.MappingNode):
+            return 0
+
+        field_types = get_entity_list_field_types(EntityList)
+        to_bytes = _ByteOffsets(text)
+        count = 0
+        for key_node, value_node in root.value:
+            entity_type = field_types.get(key_node.value)
+            if entity_type is None or not issubclass(entity_type, NamedThing):
+                continue
+            entities = _slot_entities(value_node)
+            if entities is None:
+                logger.debug(
+                    f"Skipping slot {key_node.value} in {path}: "
+                    "unsupported form"
+                )
+                continue
+            for identifier, node in entities:
+                self.add(
+                    identifier,
+                    EntityLocation(
+                        path,
+                        entity_type.__name__,
+                        start=to_bytes(node.start_mark.index),
+                        end=to_bytes(node.end_mark.index),
+                        column=node.start_mark.column,
+                    ),
+                )
+                for nested_id in _nested_node_identifiers(node):
+                    self.add(nested_id, EntityLocation(path, None))
+                count += 1
+        return count
+
+    def is_current(
+        self, file_system: fsspec.AbstractFileSystem, path: str
+    ) -> bool:
+        """Check size and modification time of an indexed file."""
+        record = self._files.get(path)
+        if record is None:
+            return False
+        try:
+            info = file_system.info(path)
+        except FileNotFoundError:
+            return False
+        return (
+            info.get("size") == record.size
+            and _file_mtime(info) == record.mtime
+        )
+
+    def _refresh_file(
+        self, file_system: fsspec.AbstractFileSystem, path: str
+    ) -> bool:
+        if self.is_current(file_system, path):
+            return False
+        try:
+            info = file_system.info(path)
+        except FileNotFoundError:
+            self._drop_file(path)
+            return True
+        content = file_system.cat_file(path)
+        record = self._files.get(path)
+        if record is not None and record.content_hash == _sha256(content):
+            # touched but unchanged
+            self._files[path] = replace(
+                record, size=len(content), mtime=_file_mtime(info)
+            )
+            return False
+        self.index_file(path, content, info)
+        return True
+
+    def refresh(
+        self,
+        directory_io: DirectoryIO,
+        source: str = "",
+        maxdepth: int | None = None,
+    ) -> int:
+        """
+        Bring the index up to date with the YAML files below source. Only
+        new or changed files are parsed. Returns the number of files that
+        were (re)indexed or dropped.
+        """
+        file_system = directory_io.file_system
+        seen = set()
+        changed = 0
+        for path in _iter_yaml_files(directory_io, source, maxdepth):
+            seen.add(path)
+            changed += self._refresh_file(file_system, path)
+        for path in self.paths() - seen:
+            self._drop_file(path)
+            changed += 1
+        if changed:
+            logger.debug(
+                f"Re-indexed {changed} files; {len(self)} entity identifiers"
+            )
+        return changed
+
+    @classmethod
+    def build(
+        cls,
+        directory_io: DirectoryIO,
+        source: str = "",
+        maxdepth: int | None = None,
+    ) -> "EntityIndex":
+        """Index all YAML files below source on a filesystem connection."""
+        index = cls()
+        index.refresh(directory_io, source=source, maxdepth=maxdepth)
+        return index
+
+    def read_entity(
+        self,
+        file_system: fsspec.AbstractFileSystem,
+        identifier: str,
+        entity_type: str | None = None,
+    ) -> dict | None:
+        """
+        Parse only the YAML node of one entity. Returns the raw entity dict,
+        or None when the entity has to be loaded with its whole file (nested
+        entities, or nodes that do not parse on their own, e.g. because they
+        use anchors defined elsewhere in the file).
+        """
+        location = self.locate(identifier, entity_type)
+        if location is None:
+            return None
+        if self._refresh_file(file_system, location.path):
+            location = self.locate(identifier, entity_type)
+            if location is None:
+                return None
+        if location.start is None or location.end is None:
+            return None
+
+        with file_system.open(location.path, "rb") as f:
+            f.seek(location.start)
+            data = f.read(location.end - location.start)
+        # re-indent the first line so the node parses as a block mapping
+        text = " " * location.column + data.decode("utf-8")
+        try:
+            item = _yaml_load(text)
+        except yaml.YAMLError:
+            return None
+        if not isinstance(item, dict):
+            return None
+        if "id" not in item:
+            item = {"id": identifier, **item}
+        if item["id"] != identifier:
+            return None
+        return item
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "version": ENTITY_INDEX_VERSION,
+            "files": {
+                path: asdict(record) for path, record in self._files.items()
+            },
+            "entities": {
+                identifier: [
+                    [
+                        location.path,
+                        location.entity_type,
+                        location.start,
+                        location.end,
+                        location.column,
+                    ]
+                    for location in locations
+                ]
+                for identifier, locations in self._locations.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, payload: dict[str, Any]) -> "EntityIndex":
+        if payload.get("version") != ENTITY_INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported entity index version {payload.get('version')}"
+            )
+        index = cls()
+        for path, record in payload["files"].items():
+            index._files[path] = IndexedFile(**record)
+        for identifier, locations in payload["entities"].items():
+            for location in locations:
+                index.add(identifier, EntityLocation(*location))
+        return index
+
+    @staticmethod
+    def sidecar_path(directory_io: DirectoryIO) -> str:
+        return directory_io._normalize_path(ENTITY_INDEX_FILENAME)
+
+    def save(self, directory_io: DirectoryIO) -> str:
+        """Write the index as a sidecar file at the connection root."""
+        path = self.sidecar_path(directory_io)
+        with directory_io.file_system.open(path, "w") as f:
+            json.dump(self.to_json(), f, separators=(",", ":"))
+        return path
+
+    @classmethod
+    def load(cls, directory_io: DirectoryIO) -> "EntityIndex | None":
+        """
+        Read the sidecar index of a connection. Returns None when there is
+        no usable sidecar file.
+        """
+        path = cls.sidecar_path(directory_io)
+        file_system = directory_io.file_system
+        if not file_system.exists(path):
+            return None
+        try:
+            with file_system.open(path, "r") as f:
+                return cls.from_json(json.load(f))
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable entity index {path}: {e}")
+            return None
+
+
+def _iter_yaml_files(
+    directory_io: DirectoryIO, source: str, maxdepth: int | None
+) -> Iterator[str]:
+    for path, file_format in directory_io.iter_files(
+        source, maxdepth=maxdepth
+    ):
+        if file_format in INDEXED_FORMATS:
+            yield path
@@ -4,33 +4,62 @@
 
 from __future__ import annotations
 
+import asyncio
 import fsspec
 import fsspec.utils
 import json
 import logging
 import os
 import pathlib
-import requests
-import urllib3
 
 from abc import abstractmethod
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from contextlib import contextmanager
 from pathlib import Path, PurePosixPath
 from peh_model.peh import EntityList
-from requests.adapters import HTTPAdapter
-from typing import TYPE_CHECKING, Generic, Callable, Any, Optional, Dict
-from urllib3.util.retry import Retry
+from typing import (
+    TYPE_CHECKING,
+    Generic,
+    Callable,
+    Any,
+    Literal,
+    Optional,
+    Dict,
+)
 from urllib.parse import urlparse, urljoin
 
 from pypeh.core.interfaces.persistence import PersistenceInterface
 from pypeh.adapters.persistence import serializations
+from pypeh.adapters.persistence.http_cache import (
+    HTTP_CACHE_MODES,
+    HttpCache,
+    HttpCacheMiss,
+    HttpCacheMode,
+)
 from pypeh.core.models.typing import T_Dataclass
 from pypeh.core.models.settings import LocalFileSettings, S3Settings
 
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from typing import Optional, Any, Dict, List, Generator, Type, Union
+    from typing import (
+        Optional,
+        Any,
+        Dict,
+        List,
+        Generator,
+        Iterable,
+        Type,
+        Union,
+    )
+    import requests
+
     from pydantic import BaseModel
     from pypeh.core.models.transform import FieldMapping
 
@@ -46,6 +75,12 @@ class HostAdapter(PersistenceInterface):
             "Abstract method on class HostAdapter was called without supporting implementation."
         )
 
+    def is_alive(self) -> bool:
+        """
+        Health check used before a pooled connection is handed out again.
+        """
+        return True
+
 
 ## fsspec-based file interactions: local or cloud
 
@@ -117,6 +152,18 @@ class FileIO(PersistenceInterface):
             raise
 
 
+def _load_file(
+    file_system: fsspec.AbstractFileSystem,
+    file_path: str,
+    format: str,
+    load_options: dict[str, Any],
+) -> Any:
+    """Pool worker for DirectoryIO.walk; module level so it can be pickled."""
+    return FileIO(file_system=file_system).load(
+        file_path, format=format, **load_options
+    )
+
+
 class DirectoryIO(HostAdapter):
     """The DirectoryIO logic only accepts absolute paths"""
 
@@ -184,19 +231,16 @@ class DirectoryIO(HostAdapter):
         sep = self.file_system.sep
         return sep.join(parts)
 
-    def walk(
+    def iter_files(
         self,
         source: Union[str, Any],
         format: Optional[str] = None,
         maxdepth: Optional[int] = None,
-        **load_options,
-    ) -> Generator[Any, None, None]:
+    ) -> Generator[tuple[str, str], None, None]:
         """
-        Yield loaded entities from a directory tree.
+        Yield (path, format) for every supported file in a directory tree.
         """
         base_path = self._normalize_path(source)
-        file_io = FileIO(file_system=self.file_system)
-
         for root, _, files in self.file_system.walk(
             base_path, maxdepth=maxdepth
         ):
@@ -210,9 +254,109 @@ class DirectoryIO(HostAdapter):
                 if inferred_format not in self.supported_formats:
                     continue
 
+                yield file_path, inferred_format
+
+    def walk(
+        self,
+        source: Union[str, Any],
+        format: Optional[str] = None,
+        maxdepth: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        executor: Literal["process", "thread"] = "process",
+        max_in_flight: Optional[int] = None,
+        **load_options,
+    ) -> Generator[Any, None, None]:
+        """
+        Yield loaded entities from a directory tree.
+
+        With `max_workers` larger than one, files are parsed concurrently in
+        a process pool (or a thread pool for I/O bound formats). Results are
+        still yielded in walk order, and at most `max_in_flight` files
+        (default: twice `max_workers`) are submitted ahead of the consumer.
+        """
+        files = self.iter_files(source, format=format, maxdepth=maxdepth)
+        if max_workers is None or max_workers <= 1:
+            file_io = FileIO(file_system=self.file_system)
+            for file_path, file_format in files:
                 yield file_io.load(
-                    file_path, format=inferred_format, **load_options
+                    file_path, format=file_format, **load_options
+                )
+            return
+
+        if max_in_flight is None:
+            max_in_flight = 2 * max_workers
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        pool: Executor
+        if executor == "process":
+            pool = ProcessPoolExecutor(max_workers=max_workers)
+        elif executor == "thread":
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        else:
+            raise ValueError(f"Unsupported executor: {executor!r}")
+
+        pending: deque[Future] = deque()
+        try:
+            for file_path, file_format in files:
+                pending.append(
+                    pool.submit(
+                        _load_file,
+                        self.file_system,
+                        file_path,
+                        file_format,
+                        load_options,
+                    )
                 )
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=True)
+
+    def iter_load(
+        self,
+        source: Union[str, Any],
+        format: Optional[str] = None,
+        maxdepth: int = 1,
+        max_workers: Optional[int] = None,
+        executor: Literal["process", "thread"] = "process",
+        max_in_flight: Optional[int] = None,
+        **load_options,
+    ) -> Generator[Any, None, None]:
+        """
+        Lazily load a single file or all supported files in a directory.
+
+        Directories are loaded through `walk` with the given parallelism
+        options; loaded roots are yielded as soon as they are available.
+        """
+        path = self._normalize_path(source)
+        if not self.file_system.exists(path):
+            raise ValueError(f"Path does not exist: {path}")
+        if self.file_system.isfile(path):
+            yield FileIO(file_system=self.file_system).load(
+                path, format=format, **load_options
+            )
+            return
+
+        if self.file_system.isdir(path):
+            yield from self.walk(
+                source=source,
+                format=format,
+                maxdepth=maxdepth,
+                max_workers=max_workers,
+                executor=executor,
+                max_in_flight=max_in_flight,
+                **load_options,
+            )
+            return
+
+        raise ValueError(
+            f"Path does not exist: {source!r} was resolved as {path}"
+        )
 
     def load(
         self,
@@ -327,11 +471,36 @@ class WebIO(HostAdapter):
         custom_ca_bundle: Optional[str] = None,
         verify_ssl: bool = True,
         user_agent: str | None = None,
+        max_connections: int = 10,
+        http_cache: str | Path | HttpCache | None = None,
+        cache_mode: HttpCacheMode = "default",
     ):
+        """
+        Args:
+            max_connections: size of the per-host connection pool, and so
+                the useful upper bound for `resolve_many` concurrency.
+            http_cache: directory (or HttpCache) in which responses are
+                cached. Cached URLs are revalidated with a conditional GET
+                using the stored ETag/Last-Modified validators.
+            cache_mode: "default" revalidates cached responses,
+                "cache_only" never touches the network and raises
+                HttpCacheMiss for uncached URLs, "refresh" always downloads
+                and replaces the cached response.
+        """
+        if cache_mode not in HTTP_CACHE_MODES:
+            raise ValueError(
+                f"Unsupported cache_mode {cache_mode!r}; expected one of "
+                f"{', '.join(HTTP_CACHE_MODES)}."
+            )
         self.timeout = timeout
         self.max_retries = max_retries
         self.custom_ca_bundle = custom_ca_bundle
         self.user_agent = user_agent
+        self.max_connections = max_connections
+        if http_cache is not None and not isinstance(http_cache, HttpCache):
+            http_cache = HttpCache(http_cache)
+        self.http_cache: HttpCache | None = http_cache
+        self.cache_mode = cache_mode
 
         # Dictionary to store format adapters
         self.adapters: Dict[str, Callable] = (
@@ -342,12 +511,23 @@ class WebIO(HostAdapter):
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
+        # requests is only needed for WebIO, import it on first use
+        import requests
+        import urllib3
+
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         session = requests.Session()
         retry_strategy = Retry(
             total=self.max_retries,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_connections=self.max_connections,
+            pool_maxsize=self.max_connections,
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         if self.user_agent is not None:
@@ -380,11 +560,14 @@ class WebIO(HostAdapter):
         format_type: str | None = None,
         follow_redirects: bool = True,
         max_redirects: int = 5,
+        headers: dict[str, str] | None = None,
     ) -> requests.Response:
+        import requests
+
         try:
-            headers = None
+            headers = dict(headers or {})
             if format_type:
-                headers = {"Accept": format_type}
+                headers["Accept"] = format_type
 
             response = self.session.get(
                 url,
@@ -412,6 +595,7 @@ class WebIO(HostAdapter):
                             redirect_url,
                             follow_redirects=follow_redirects,
                             max_redirects=max_redirects - 1,
+                            headers=headers,
                         )
                     else:
                         raise requests.exceptions.TooManyRedirects(
@@ -425,17 +609,50 @@ class WebIO(HostAdapter):
             logger.error(f"Failed to resolve URL {url}: {e}")
             raise
 
+    def fetch(
+        self, url: str, format_type: Optional[str] = None
+    ) -> tuple[bytes, str | None]:
+        """
+        Return the body and Content-Type of url, going through the HTTP
+        cache when one is configured.
+        """
+        if self.http_cache is None:
+            response = self.resolve_url(url, format_type=format_type)
+            return response.content, response.headers.get("Content-Type")
+
+        # the headers resolve_url sends, which the cache entries depend on
+        request_headers = dict(self.session.headers)
+        if format_type:
+            request_headers["Accept"] = format_type
+        entry = self.http_cache.get(url, request_headers)
+        if self.cache_mode == "cache_only":
+            if entry is None:
+                raise HttpCacheMiss(f"{url} is not in the HTTP cache")
+            return self.http_cache.read(entry), entry.content_type
+
+        headers = None
+        if entry is not None and self.cache_mode == "default":
+            headers = entry.conditional_headers()
+        response = self.resolve_url(
+            url, format_type=format_type, headers=headers
+        )
+        if response.status_code == 304 and entry is not None:
+            response.close()
+            logger.info(f"Not modified, using cached response for: {url}")
+            entry = self.http_cache.touch(entry)
+            return self.http_cache.read(entry), entry.content_type
+
+        content = response.content
+        self.http_cache.store(url, content, response.headers, request_headers)
+        return content, response.headers.get("Content-Type")
+
     def retrieve_data(
         self, url: str, format_type: Optional[str] = None, **adapter_kwargs
     ) -> Any:
         logger.info(f"Retrieving data from: {url}")
 
         # Resolve the URL
-        response = self.resolve_url(url, format_type=format_type)
-
-        # Get content and metadata
-        content = response.content
-        content_type = response.headers.get("Content-Type", None)
+        content, content_type = self.fetch(url, format_type=format_type)
 
         # Detect format if not specified
         if format_type is None:
@@ -462,10 +679,59 @@ class WebIO(HostAdapter):
         logger.info(f"Successfully processed data with {format_type} adapter")
         return result
 
+    async def aresolve_many(
+        self,
+        urls: Iterable[str],
+        format_type: Optional[str] = None,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Retrieve many URLs concurrently, at most max_concurrency at a time.
+        Duplicate URLs are fetched once. With return_exceptions=True, failed
+        URLs map to their exception instead of aborting the batch.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        unique_urls = list(dict.fromkeys(urls))
+
+        async def resolve(url: str) -> Any:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.retrieve_data, url, format_type
+                )
+
+        results = await asyncio.gather(
+            *(resolve(url) for url in unique_urls),
+            return_exceptions=return_exceptions,
+        )
+        return dict(zip(unique_urls, results))
+
+    def resolve_many(
+        self,
+        urls: Iterable[str],
+        format_type: Optional[str] = None,
+        max_concurrency: int = 8,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Blocking wrapper around `aresolve_many`. Use `aresolve_many` from
+        code that already runs an event loop.
+        """
+        return asyncio.run(
+            self.aresolve_many(
+                urls,
+                format_type=format_type,
+                max_concurrency=max_concurrency,
+                return_exceptions=return_exceptions,
+            )
+        )
+
     def load(self, source: str, format: str = "json", **kwargs):
         return self.retrieve_data(source, format_type=format, **kwargs)
 
     def get_metadata(self, url: str) -> Dict[str, Any]:
+        import requests
+
         try:
             response = self.session.head(url, timeout=self.timeout)
             response.raise_for_status()
@@ -476,6 +742,7 @@ class WebIO(HostAdapter):
                 "content_type": response.headers.get("Content-Type"),
                 "content_length": response.headers.get("Content-Length"),
                 "last_modified": response.headers.get("Last-Modified"),
+                "etag": response.headers.get("ETag"),
                 "headers": dict(response.headers),
             }
         except requests.exceptions.RequestException as e:
@@ -489,6 +756,14 @@ class WebIO(HostAdapter):
         except Exception:
             return False
 
+    def connect(self) -> "WebIO":
+        if not self._open_session:
+            self.session = self._create_session()
+        return self
+
+    def is_alive(self) -> bool:
+        return self._open_session
+
     def close(self):
         self.session.close()
         self._open_session = False
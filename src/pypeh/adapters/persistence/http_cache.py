@@ -0,0 +1,175 @@
+"""
+Content-addressed on-disk cache for HTTP responses.
+
+Layout::
+
+    <directory>/objects/<hash[:2]>/<hash>    response bodies, by sha256
+    <directory>/entries/<sha256(key)>.json   validators and body hash per
+                                             URL and Accept header
+
+Bodies are stored once per distinct content, so URLs that serve the same
+document share one object. Entries are keyed on the URL and the Accept
+request header, as content negotiated URLs serve a different document per
+Accept value. Entries keep the ETag and Last-Modified validators, which
+WebIO sends back as a conditional GET, and the values of the request
+headers named in the Vary response header: an entry is only used for
+requests with the same values. Responses with `Vary: *` are not cached.
+
+All writes go through a temporary file and `os.replace`, so concurrent
+readers never see partially written files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Literal, Mapping
+
+HttpCacheMode = Literal["default", "cache_only", "refresh"]
+HTTP_CACHE_MODES = ("default", "cache_only", "refresh")
+
+
+class HttpCacheMiss(LookupError):
+    """Raised in cache_only mode for URLs that are not cached."""
+
+
+@dataclass(frozen=True)
+class HttpCacheEntry:
+    url: str
+    content_hash: str
+    content_type: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+    fetched_at: float = 0.0
+    accept: str | None = None
+    # lower-cased request header names from Vary, and their values
+    vary: dict[str, str | None] = field(default_factory=dict)
+
+    def matches(self, request_headers: Mapping[str, str]) -> bool:
+        """Whether the varied request headers equal the recorded ones."""
+        if "*" in self.vary:
+            return False
+        headers = _lower_keys(request_headers)
+        return all(
+            headers.get(name) == value for name, value in self.vary.items()
+        )
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _lower_keys(headers: Mapping[str, str]) -> dict[str, str]:
+    return {name.lower(): value for name, value in headers.items()}
+
+
+def _vary_names(vary: str | None) -> list[str]:
+    if vary is None:
+        return []
+    return [name.strip().lower() for name in vary.split(",") if name.strip()]
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class HttpCache:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory).expanduser()
+
+    def _entry_path(self, url: str, accept: str | None = None) -> Path:
+        key = url if accept is None else f"{url}\nAccept: {accept}"
+        return self.directory / "entries" / f"{_sha256(key.encode())}.json"
+
+    def _object_path(self, content_hash: str) -> Path:
+        return self.directory / "objects" / content_hash[:2] / content_hash
+
+    def get(
+        self, url: str, request_headers: Mapping[str, str] | None = None
+    ) -> HttpCacheEntry | None:
+        """
+        Return the entry for a request of url with request_headers, or None
+        when no matching response is cached.
+        """
+        request_headers = _lower_keys(request_headers or {})
+        accept = request_headers.get("accept")
+        try:
+            with open(self._entry_path(url, accept), "rb") as f:
+                entry = HttpCacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        if not entry.matches(request_headers):
+            return None
+        if not self._object_path(entry.content_hash).exists():
+            return None
+        return entry
+
+    def read(self, entry: HttpCacheEntry) -> bytes:
+        return self._object_path(entry.content_hash).read_bytes()
+
+    def store(
+        self,
+        url: str,
+        content: bytes,
+        headers: Mapping[str, str],
+        request_headers: Mapping[str, str] | None = None,
+    ) -> HttpCacheEntry | None:
+        """
+        Store a 200 response body and its validators for a request of url
+        with request_headers. Returns None for uncacheable `Vary: *`
+        responses.
+        """
+        request_headers = _lower_keys(request_headers or {})
+        vary_names = _vary_names(headers.get("Vary"))
+        if "*" in vary_names:
+            return None
+        content_hash = _sha256(content)
+        object_path = self._object_path(content_hash)
+        if not object_path.exists():
+            _atomic_write(object_path, content)
+        entry = HttpCacheEntry(
+            url=url,
+            content_hash=content_hash,
+            content_type=headers.get("Content-Type"),
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            fetched_at=time.time(),
+            accept=request_headers.get("accept"),
+            vary={name: request_headers.get(name) for name in vary_names},
+        )
+        self._write_entry(entry)
+        return entry
+
+    def touch(self, entry: HttpCacheEntry) -> HttpCacheEntry:
+        """Record a successful revalidation (304 Not Modified) of entry."""
+        entry = HttpCacheEntry(**{**asdict(entry), "fetched_at": time.time()})
+        self._write_entry(entry)
+        return entry
+
+    def _write_entry(self, entry: HttpCacheEntry) -> None:
+        _atomic_write(
+            self._entry_path(entry.url, entry.accept),
+            json.dumps(asdict(entry), sort_keys=True).encode("utf-8"),
+        )
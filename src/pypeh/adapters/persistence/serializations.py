@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import dataclasses
+import functools
 import logging
 import json
 import yaml
@@ -11,19 +12,139 @@ from linkml_runtime.dumpers import YAMLDumper, RDFLibDumper
 from pydantic import TypeAdapter, BaseModel, ConfigDict
 from pathlib import Path
 from rdflib import Graph
-from typing import TYPE_CHECKING, Union, Any, IO, get_type_hints, cast
+from typing import (
+    TYPE_CHECKING,
+    Union,
+    Any,
+    Callable,
+    IO,
+    get_type_hints,
+    cast,
+)
 
 from pypeh.core.interfaces.persistence import PersistenceInterface
-from pypeh.core.models.peh_wrappers import get_schema_view
-from peh_model.peh import EntityList, YAMLRoot
+from pypeh.core.models.peh_wrappers import (
+    get_entity_list_field_types,
+    get_schema_view,
+)
+from pypeh.core.models.proxy import TypedLazyProxy
+from peh_model.peh import EntityList, NamedThing, YAMLRoot
 from pypeh.core.models.typing import T_Dataclass
 
+try:
+    from yaml import CSafeLoader as _YamlSafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlSafeLoader  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from typing import Type
 
 logger = logging.getLogger(__name__)
 
 
+def _json_loads(data: Union[str, bytes]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_load(stream: IO) -> Any:
+    if orjson is not None:
+        return orjson.loads(stream.read())
+    return json.load(stream)
+
+
+def _yaml_load(stream: IO | str) -> Any:
+    return yaml.load(stream, Loader=_YamlSafeLoader)
+
+
+def _entity_items(value: Any) -> list[dict] | None:
+    """
+    Return the raw entity dicts of an EntityList slot, or None when the
+    slot uses a form that has to go through the regular linkml loader.
+    """
+    if isinstance(value, list):
+        for item in value:
+            if not isinstance(item, dict) or not isinstance(
+                item.get("id"), str
+            ):
+                return None
+        return value
+    if isinstance(value, dict):
+        items = []
+        for key, item in value.items():
+            if not isinstance(item, dict):
+                return None
+            if "id" not in item:
+                item = {"id": key, **item}
+            items.append(item)
+        return items
+    return None
+
+
+def _nested_identifiers(item: dict) -> tuple[str, ...]:
+    found = []
+    stack = list(item.values())
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            nested_id = value.get("id")
+            if isinstance(nested_id, str):
+                found.append(nested_id)
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return tuple(found)
+
+
+def load_trusted_entity_list(
+    data_dict: Any,
+    target_class: Type[EntityList],
+    validate: Callable[[Any, Any], Any],
+) -> Any:
+    """
+    Split parsed EntityList data into lazily validated entities.
+
+    Every NamedThing in the EntityList slots becomes a TypedLazyProxy whose
+    loader builds the linkml dataclass on first access. Slots that cannot be
+    deferred are validated eagerly into a regular EntityList. Returns a list
+    of roots that `CacheContainer.unpack_entity_list` accepts.
+    """
+    if not isinstance(data_dict, dict):
+        return validate(data_dict, target_class)
+
+    field_types = get_entity_list_field_types(target_class)
+    eager: dict[str, Any] = {}
+    roots: list[Any] = []
+    for field_name, value in data_dict.items():
+        entity_type = field_types.get(field_name)
+        items = _entity_items(value)
+        if (
+            entity_type is None
+            or not issubclass(entity_type, NamedThing)
+            or items is None
+        ):
+            eager[field_name] = value
+            continue
+        for item in items:
+            roots.append(
+                TypedLazyProxy(
+                    item["id"],
+                    entity_type,
+                    loader=functools.partial(entity_type, **item),
+                    nested_identifiers=_nested_identifiers(item),
+                )
+            )
+    if eager:
+        roots.insert(0, validate(eager, target_class))
+    return roots
+
+
 def is_dataclass_type(cls: Any) -> bool:
     return dataclasses.is_dataclass(cls) and isinstance(cls, type)
 
@@ -85,6 +206,12 @@ def validate_pydantic(
     return target_class.model_validate(data)
 
 
+def _is_entity_list_class(target_class: Any) -> bool:
+    return isinstance(target_class, type) and issubclass(
+        target_class, EntityList
+    )
+
+
 class IOAdapter(PersistenceInterface):
     read_mode: str = NotImplementedError  # type: ignore
     write_mode: str = NotImplementedError  # type: ignore
@@ -145,6 +272,7 @@ class JsonIO(IOAdapter):
         self,
         stream: IO,
         target_class: Type[T_Dataclass] | None = EntityList,
+        trusted: bool = False,
         **kwargs,
     ) -> dict | T_Dataclass | Any:
         """
@@ -152,16 +280,27 @@ class JsonIO(IOAdapter):
         # TODO: test with: fake_file = StringIO('{"key": "value"}')
 
         """
-        data_dict = json.load(stream)
+        data_dict = _json_load(stream)
+        if trusted and _is_entity_list_class(target_class):
+            return load_trusted_entity_list(
+                data_dict, target_class, self._validate
+            )
         return self._validate(data_dict, target_class)
 
     def _loads(
-        self, data: Union[str, bytes], target_class: Type[T_Dataclass] | None
+        self,
+        data: Union[str, bytes],
+        target_class: Type[T_Dataclass] | None,
+        trusted: bool = False,
     ) -> dict | T_Dataclass | Any:
         if isinstance(data, bytes):
             data = data.decode("utf-8")
         try:
-            data_dict = json.loads(data)
+            data_dict = _json_loads(data)
+            if trusted and _is_entity_list_class(target_class):
+                return load_trusted_entity_list(
+                    data_dict, target_class, self._validate
+                )
             return self._validate(data_dict, target_class)
         except Exception as e:
             logger.error("Failed to parse JSON data from string or bytes.")
@@ -171,6 +310,7 @@ class JsonIO(IOAdapter):
         self,
         source: Union[str, Path, IO[str], IO[bytes], bytes],
         target_class: Type[T_Dataclass] | None = EntityList,
+        trusted: bool = False,
         **kwargs,
     ) -> Any:
         """
@@ -178,6 +318,9 @@ class JsonIO(IOAdapter):
         - file paths (str/Path)
         - file-like objects (IO)
         - raw JSON strings or bytes (e.g., from requests)
+
+        With `trusted=True` and an EntityList target, entities are returned
+        as lazy proxies and only validated when first accessed.
         """
         try:
             if isinstance(source, str):
@@ -187,13 +330,13 @@ class JsonIO(IOAdapter):
 
             if isinstance(source, Path):
                 with open(source, self.read_mode, encoding="utf-8") as f:
-                    return self._load(f, target_class)
+                    return self._load(f, target_class, trusted=trusted)
             elif hasattr(source, "read"):
                 # File-like object
                 stream = cast(IO, source)
-                return self._load(stream, target_class)
+                return self._load(stream, target_class, trusted=trusted)
             elif isinstance(source, (bytes, str)):
-                return self._loads(source, target_class)
+                return self._loads(source, target_class, trusted=trusted)
             else:
                 raise TypeError(
                     f"Unsupported source type for JSON loading: {type(source)}"
@@ -242,6 +385,7 @@ class YamlIO(IOAdapter):
         self,
         stream: IO,
         target_class: Type[T_Dataclass] | None = EntityList,
+        trusted: bool = False,
         **kwargs,
     ) -> dict | T_Dataclass | Any:
         """
@@ -249,16 +393,27 @@ class YamlIO(IOAdapter):
         # TODO: test with: fake_file = StringIO('{"key": "value"}')
 
         """
-        data_dict = yaml.safe_load(stream)
+        data_dict = _yaml_load(stream)
+        if trusted and _is_entity_list_class(target_class):
+            return load_trusted_entity_list(
+                data_dict, target_class, self._validate
+            )
         return self._validate(data_dict, target_class)
 
     def _loads(
-        self, data: Union[str, bytes], target_class: Type[T_Dataclass] | None
+        self,
+        data: Union[str, bytes],
+        target_class: Type[T_Dataclass] | None,
+        trusted: bool = False,
     ) -> dict | T_Dataclass | Any:
         if isinstance(data, bytes):
             data = data.decode("utf-8")
         try:
-            data_dict = json.loads(data)
+            data_dict = _json_loads(data)
+            if trusted and _is_entity_list_class(target_class):
+                return load_trusted_entity_list(
+                    data_dict, target_class, self._validate
+                )
             return self._validate(data_dict, target_class)
         except Exception as e:
             logger.error("Failed to parse JSON data from string or bytes.")
@@ -268,6 +423,7 @@ class YamlIO(IOAdapter):
         self,
         source: Union[str, Path, IO[str], IO[bytes], bytes],
         target_class: Type[T_Dataclass] | None = EntityList,
+        trusted: bool = False,
         **kwargs,
     ) -> BaseModel | EntityList | dict | Any:
         """
@@ -275,6 +431,9 @@ class YamlIO(IOAdapter):
         - file paths (str/Path)
         - file-like objects (IO)
         - raw YAML strings or bytes (e.g., from requests)
+
+        With `trusted=True` and an EntityList target, entities are returned
+        as lazy proxies and only validated when first accessed.
         """
         try:
             if isinstance(source, str):
@@ -284,13 +443,13 @@ class YamlIO(IOAdapter):
 
             if isinstance(source, Path):
                 with open(source, self.read_mode, encoding="utf-8") as f:
-                    return self._load(f, target_class)
+                    return self._load(f, target_class, trusted=trusted)
             elif hasattr(source, "read"):
                 # File-like object
                 stream = cast(IO, source)
-                return self._load(stream, target_class)
+                return self._load(stream, target_class, trusted=trusted)
             elif isinstance(source, (bytes, str)):
-                return self._loads(source, target_class)
+                return self._loads(source, target_class, trusted=trusted)
             else:
                 raise TypeError(
                     f"Unsupported source type for YAML loading: {type(source)}"
@@ -470,6 +629,29 @@ class TurtleIO(RdfIO):
         )
 
 
+class SnapshotIO(IOAdapter):
+    """
+    Binary snapshot of a complete CacheContainer.
+    See `pypeh.core.cache.snapshot` for the format.
+    """
+
+    read_mode: str = "rb"
+    write_mode: str = "wb"
+
+    def load(self, source: Union[str, Path, IO[bytes]], **kwargs):
+        from pypeh.core.cache.snapshot import load_snapshot
+
+        if isinstance(source, (str, Path)):
+            with open(source, self.read_mode) as f:
+                return load_snapshot(f, **kwargs)
+        return load_snapshot(source, **kwargs)
+
+    def dump(self, source, file_obj: IO[bytes], **kwargs):
+        from pypeh.core.cache.snapshot import dump_snapshot
+
+        return dump_snapshot(source, file_obj)
+
+
 class IOAdapterFactory:
     _adapters = {
         "json": JsonIO,
@@ -487,6 +669,8 @@ class IOAdapterFactory:
         "json-ld": JsonldIO,
         "ttl": TurtleIO,
         "turtle": TurtleIO,
+        "snapshot": SnapshotIO,
+        "pypeh-snapshot": SnapshotIO,
     }
 
     @classmethod
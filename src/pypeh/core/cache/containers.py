@@ -11,10 +11,16 @@ Usage:
 from __future__ import annotations
 
 import logging
+import sys
 
 from abc import ABC, abstractmethod
 from collections import defaultdict
-from peh_model.peh import NamedThing, EntityList
+from peh_model.peh import (
+    DerivedObservation,
+    EntityList,
+    NamedThing,
+    Observation,
+)
 from typing import Dict, Type, TYPE_CHECKING, Set, TypeVar, Generic
 
 from pypeh.core.cache.utils import get_entity_type, load_entities_from_tree
@@ -33,6 +39,8 @@ T_Container = TypeVar("T_Container")
 class CacheContainer(ABC, Generic[T_Container]):
     """Abstract base class for cache backends"""
 
+    __slots__ = ()
+
     def __init__(self):
         self._storage = T_Container
         self._class_index: Dict[str, Set[str]] = defaultdict(set)
@@ -91,6 +99,28 @@ class CacheContainer(ABC, Generic[T_Container]):
 
         return EntityList(**grouped)
 
+    def get_observation_design_id(self, observation_id: str) -> str | None:
+        """Id of the ObservationDesign of an Observation"""
+        observation = self.get(observation_id)
+        if not isinstance(observation, Observation):
+            return None
+        return _reference_id(observation.observation_design)
+
+    def get_derived_from_id(self, observation_id: str) -> str | None:
+        """Id of the source Observation of a DerivedObservation"""
+        observation = self.get(observation_id)
+        if not isinstance(observation, DerivedObservation):
+            return None
+        return _reference_id(observation.was_derived_from)
+
+
+def _reference_id(reference) -> str | None:
+    if reference is None:
+        return None
+    if isinstance(reference, NamedThing):
+        reference = reference.id
+    return sys.intern(str(reference))
+
 
 class CacheContainerView(Generic[T_Container]):
     """Immutable view of any CacheContainer that only exposes read operations."""
@@ -143,6 +173,28 @@ class CacheContainerView(Generic[T_Container]):
     def pack_entity_list(self) -> EntityList:
         return self._container.pack_entity_list()
 
+    def get_observation_design_id(self, observation_id: str) -> str | None:
+        return self._container.get_observation_design_id(observation_id)
+
+    def get_derived_from_id(self, observation_id: str) -> str | None:
+        return self._container.get_derived_from_id(observation_id)
+
+    def get_observation_design(
+        self, observation: Observation
+    ) -> Optional[T_NamedThingLike]:
+        """
+        ObservationDesign of an Observation, resolved through its own
+        reference and through the cached Observation when it has none.
+        """
+        design_id = _reference_id(observation.observation_design)
+        if design_id is None:
+            design_id = self._container.get_observation_design_id(
+                observation.id
+            )
+            if design_id is None:
+                return None
+        return self._container.get(design_id, "ObservationDesign")
+
     def __len__(self) -> int:
         return len(self._container)
 
@@ -151,28 +203,71 @@ class CacheContainerView(Generic[T_Container]):
 
 
 class MappingContainer(CacheContainer[Dict]):
+    """
+    Dict-backed cache container.
+
+    Proxies that carry a loader (e.g. entities read in trusted mode) are
+    materialised on first access through `get` or `get_all` and replaced
+    by the loaded entity. Entities inlined in a not yet loaded proxy are
+    tracked by identifier, so looking one of them up loads its parent.
+    """
+
     def __init__(self):
         self._storage: Dict[str, T_NamedThingLike] = dict()
         self._class_index: Dict[str, Set[str]] = defaultdict(set)
+        # nested entity id -> id of the deferred entity that inlines it
+        self._deferred_nested: Dict[str, str] = dict()
 
     def _add_object(
         self, entity: T_NamedThingLike, entity_id: str, entity_type: str
     ) -> None:
         self._storage[entity_id] = entity
         self._class_index[entity_type].add(entity_id)
+        if isinstance(entity, TypedLazyProxy) and entity.has_loader:
+            for nested_id in entity.nested_identifiers:
+                if nested_id not in self._storage:
+                    self._deferred_nested.setdefault(nested_id, entity_id)
+
+    def _materialize(
+        self, entity_id: str, entity: T_NamedThingLike
+    ) -> T_NamedThingLike:
+        if not isinstance(entity, TypedLazyProxy) or not entity.has_loader:
+            return entity
+        target = entity.resolve()
+        assert target is not None
+        self._storage[entity_id] = target
+        for nested_id in entity.nested_identifiers:
+            self._deferred_nested.pop(nested_id, None)
+        for nested in load_entities_from_tree(target):
+            if nested is not target:
+                self.add(nested)
+        return target
+
+    def _materialize_deferred_parents(self) -> None:
+        for parent_id in set(self._deferred_nested.values()):
+            parent = self._storage.get(parent_id)
+            if parent is not None:
+                self._materialize(parent_id, parent)
+        self._deferred_nested.clear()
 
     def exists(self, entity_id: str, entity_type: str | None = None) -> bool:
-        return entity_id in self._storage.keys()
+        return entity_id in self._storage or entity_id in self._deferred_nested
 
     def _get(
         self, entity_id: str, entity_type: str | None = None
     ) -> Optional[T_NamedThingLike]:
-        if self.exists(entity_id, entity_type):
-            return self._storage[entity_id]
+        entity = self._storage.get(entity_id)
+        if entity is not None:
+            return self._materialize(entity_id, entity)
+        parent_id = self._deferred_nested.get(entity_id)
+        if parent_id is not None:
+            self._materialize(parent_id, self._storage[parent_id])
+            return self._storage.get(entity_id)
+        return None
 
     def add(self, entity: T_NamedThingLike) -> None:
         class_name = get_entity_type(entity)
-        container_entity = self._get(entity.id, class_name)
+        container_entity = self._storage.get(entity.id)
         if container_entity is not None:
             if isinstance(container_entity, NamedThing):
                 return
@@ -192,24 +287,230 @@ class MappingContainer(CacheContainer[Dict]):
     def clear(self) -> None:
         self._storage.clear()
         self._class_index.clear()
+        self._deferred_nested.clear()
 
     def pop(
         self, entity_id: str, entity_type: str
     ) -> Optional[T_NamedThingLike]:
         if entity_type in self._class_index:
             self._class_index[entity_type].remove(entity_id)
-        return self._storage.pop(entity_id, None)
+        entity = self._storage.pop(entity_id, None)
+        if isinstance(entity, TypedLazyProxy) and entity.has_loader:
+            # nested entities of a popped proxy can no longer be loaded
+            for nested_id in entity.nested_identifiers:
+                if self._deferred_nested.get(nested_id) == entity_id:
+                    del self._deferred_nested[nested_id]
+        return entity
 
     def get_all(
         self, entity_type: str | None = None
     ) -> Generator[T_NamedThingLike, None, None]:
+        if self._deferred_nested:
+            self._materialize_deferred_parents()
         if entity_type is None:
-            for entity_id in self._storage.keys():
-                yield self._storage[entity_id]
+            for entity_id in list(self._storage.keys()):
+                yield self._materialize(entity_id, self._storage[entity_id])
         else:
             if entity_type in self._class_index:
-                for entity_id in self._class_index[entity_type]:
-                    yield self._storage[entity_id]
+                for entity_id in list(self._class_index[entity_type]):
+                    yield self._materialize(
+                        entity_id, self._storage[entity_id]
+                    )
+
+    def __len__(self) -> int:
+        return len(self._storage)
+
+    def __repr__(self):
+        return self._storage.__repr__()
+
+
+class IndexedContainer(CacheContainer[Dict]):
+    """
+    Cache container tuned for lookup-heavy workloads.
+
+    Identifiers are interned, entities are kept in one dense dict per type
+    next to a flat id map, and the references that the data operations
+    follow most are indexed as entities are added:
+
+    - Observation id -> ObservationDesign id
+    - DerivedObservation id -> id of the Observation it was derived from
+
+    Deferred proxies behave as in `MappingContainer`; their references are
+    indexed once they are materialised.
+    """
+
+    __slots__ = (
+        "_storage",
+        "_class_index",
+        "_entity_types",
+        "_deferred",
+        "_deferred_nested",
+        "_design_by_observation",
+        "_derived_from",
+    )
+
+    def __init__(self):
+        self._storage: Dict[str, T_NamedThingLike] = dict()
+        # entity type -> (entity id -> entity), in insertion order
+        self._class_index: Dict[str, Dict[str, T_NamedThingLike]] = dict()
+        self._entity_types: Dict[str, str] = dict()
+        # entity type -> ids of proxies that have not been loaded yet
+        self._deferred: Dict[str, Set[str]] = defaultdict(set)
+        # nested entity id -> id of the deferred entity that inlines it
+        self._deferred_nested: Dict[str, str] = dict()
+        self._design_by_observation: Dict[str, str] = dict()
+        self._derived_from: Dict[str, str] = dict()
+
+    def _index(self, entity: T_NamedThingLike, entity_id: str) -> None:
+        if isinstance(entity, Observation):
+            design_id = _reference_id(entity.observation_design)
+            if design_id is not None:
+                self._design_by_observation[entity_id] = design_id
+            if isinstance(entity, DerivedObservation):
+                source_id = _reference_id(entity.was_derived_from)
+                if source_id is not None:
+                    self._derived_from[entity_id] = source_id
+
+    def _unindex(self, entity: T_NamedThingLike, entity_id: str) -> None:
+        self._design_by_observation.pop(entity_id, None)
+        self._derived_from.pop(entity_id, None)
+
+    def _store(
+        self, entity: T_NamedThingLike, entity_id: str, entity_type: str
+    ) -> None:
+        previous_type = self._entity_types.get(entity_id)
+        if previous_type is not None:
+            self._deferred[previous_type].discard(entity_id)
+            if previous_type != entity_type:
+                del self._class_index[previous_type][entity_id]
+        self._storage[entity_id] = entity
+        self._entity_types[entity_id] = entity_type
+        type_index = self._class_index.get(entity_type)
+        if type_index is None:
+            type_index = self._class_index[entity_type] = dict()
+        type_index[entity_id] = entity
+
+    def _add_object(
+        self, entity: T_NamedThingLike, entity_id: str, entity_type: str
+    ) -> None:
+        self._store(entity, entity_id, entity_type)
+        if isinstance(entity, TypedLazyProxy):
+            if entity.has_loader:
+                self._deferred[entity_type].add(entity_id)
+                for nested_id in entity.nested_identifiers:
+                    if nested_id not in self._storage:
+                        self._deferred_nested.setdefault(
+                            sys.intern(nested_id), entity_id
+                        )
+        else:
+            self._index(entity, entity_id)
+
+    def _materialize(
+        self, entity_id: str, entity: T_NamedThingLike
+    ) -> T_NamedThingLike:
+        if not isinstance(entity, TypedLazyProxy) or not entity.has_loader:
+            return entity
+        target = entity.resolve()
+        assert target is not None
+        self._store(target, entity_id, get_entity_type(target))
+        self._index(target, entity_id)
+        for nested_id in entity.nested_identifiers:
+            self._deferred_nested.pop(nested_id, None)
+        for nested in load_entities_from_tree(target):
+            if nested is not target:
+                self.add(nested)
+        return target
+
+    def _materialize_deferred_parents(self) -> None:
+        for parent_id in set(self._deferred_nested.values()):
+            parent = self._storage.get(parent_id)
+            if parent is not None:
+                self._materialize(parent_id, parent)
+        self._deferred_nested.clear()
+
+    def add(self, entity: T_NamedThingLike) -> None:
+        entity_id = sys.intern(str(entity.id))
+        container_entity = self._storage.get(entity_id)
+        if container_entity is not None:
+            if isinstance(container_entity, NamedThing):
+                return
+            if isinstance(entity, TypedLazyProxy):
+                return
+        self._add_object(entity, entity_id, get_entity_type(entity))
+
+    def exists(self, entity_id: str, entity_type: str | None = None) -> bool:
+        return entity_id in self._storage or entity_id in self._deferred_nested
+
+    def get(
+        self, entity_id: str, entity_type: str | None = None
+    ) -> Optional[T_NamedThingLike]:
+        entity = self._storage.get(entity_id)
+        if entity is not None:
+            if isinstance(entity, TypedLazyProxy):
+                return self._materialize(entity_id, entity)
+            return entity
+        parent_id = self._deferred_nested.get(entity_id)
+        if parent_id is not None:
+            self._materialize(parent_id, self._storage[parent_id])
+            return self._storage.get(entity_id)
+        logger.debug(
+            f"Storage error: Object of class '{entity_type}' with id '{entity_id}' not found."
+        )
+        return None
+
+    def get_all(
+        self, entity_type: str | None = None
+    ) -> Generator[T_NamedThingLike, None, None]:
+        if self._deferred_nested:
+            self._materialize_deferred_parents()
+        if entity_type is None:
+            entities = self._storage
+        else:
+            entities = self._class_index.get(entity_type)
+            if entities is None:
+                return
+        for entity_id, entity in list(entities.items()):
+            if isinstance(entity, TypedLazyProxy):
+                entity = self._materialize(entity_id, entity)
+            yield entity
+
+    def clear(self) -> None:
+        self._storage.clear()
+        self._class_index.clear()
+        self._entity_types.clear()
+        self._deferred.clear()
+        self._deferred_nested.clear()
+        self._design_by_observation.clear()
+        self._derived_from.clear()
+
+    def pop(
+        self, entity_id: str, entity_type: str | None = None
+    ) -> Optional[T_NamedThingLike]:
+        entity = self._storage.pop(entity_id, None)
+        if entity is None:
+            return None
+        stored_type = self._entity_types.pop(entity_id)
+        self._deferred[stored_type].discard(entity_id)
+        type_index = self._class_index[stored_type]
+        del type_index[entity_id]
+        if not type_index:
+            del self._class_index[stored_type]
+        self._unindex(entity, entity_id)
+        if isinstance(entity, TypedLazyProxy) and entity.has_loader:
+            for nested_id in entity.nested_identifiers:
+                if self._deferred_nested.get(nested_id) == entity_id:
+                    del self._deferred_nested[nested_id]
+        return entity
+
+    def get_observation_design_id(self, observation_id: str) -> str | None:
+        if not isinstance(self._storage.get(observation_id), NamedThing):
+            _ = self.get(observation_id)
+        return self._design_by_observation.get(observation_id)
+
+    def get_derived_from_id(self, observation_id: str) -> str | None:
+        if not isinstance(self._storage.get(observation_id), NamedThing):
+            _ = self.get(observation_id)
+        return self._derived_from.get(observation_id)
 
     def __len__(self) -> int:
         return len(self._storage)
@@ -220,15 +521,29 @@ class MappingContainer(CacheContainer[Dict]):
 
 class CacheContainerFactory:
     _default_container: Type[CacheContainer] = MappingContainer
+    _registry: Dict[str, Type[CacheContainer]] = {
+        "mapping": MappingContainer,
+        "indexed": IndexedContainer,
+    }
 
     @classmethod
     def set_default_container(cls, container_class: Type[CacheContainer]):
         cls._default_container = container_class
 
+    @classmethod
+    def register(
+        cls, container_type: str, container_class: Type[CacheContainer]
+    ) -> None:
+        cls._registry[container_type] = container_class
+
     @classmethod
     def new(cls, container_type: str | None = None) -> CacheContainer:
-        if container_type is not None:
+        if container_type is None:
+            return cls._default_container()
+        container_class = cls._registry.get(container_type)
+        if container_class is None:
             raise ValueError(
-                "Only a single Cachecontainer adapter has been implemented"
+                f"Unknown cache container type '{container_type}'. "
+                f"Registered types: {', '.join(sorted(cls._registry))}"
             )
-        return cls._default_container()
+        return container_class()
@@ -0,0 +1,475 @@
+"""
+Binary snapshots of a CacheContainer.
+
+A snapshot stores every entity of a container as an individually pickled
+record, followed by a JSON index that maps entity identifiers and types to
+those records. Entities that are inlined in another cached entity (e.g. the
+sections of a DataLayout) are not stored twice: the index points them to the
+record of the entity that contains them.
+
+Layout::
+
+    MAGIC (8 bytes) | header length (uint32, little endian) | header (JSON)
+    body: pickled entity records
+    index (JSON)
+
+The header carries the format version, the pypeh and peh-model versions the
+snapshot was written with, and a sha256 content hash over body and index.
+
+`load_snapshot` unpacks a snapshot into a regular container. `SnapshotContainer`
+instead memory-maps the snapshot file and unpickles records on first access,
+so processes that open the same file share one copy of it in the page cache.
+
+Snapshots are pickles: only load snapshots from trusted locations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import mmap
+import pickle
+import struct
+import sys
+
+from dataclasses import asdict, dataclass
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Dict
+
+from pypeh.core.cache.containers import (
+    CacheContainer,
+    CacheContainerFactory,
+    MappingContainer,
+)
+from pypeh.core.cache.utils import get_entity_type, load_entities_from_tree
+
+if TYPE_CHECKING:
+    from typing import Generator, Optional
+
+    from pypeh.core.models.typing import T_NamedThingLike
+
+SNAPSHOT_MAGIC = b"PYPEHSNP"
+SNAPSHOT_FORMAT = "pypeh.cache.snapshot"
+SNAPSHOT_VERSION = 1
+PICKLE_PROTOCOL = 5
+
+_LENGTH = struct.Struct("<I")
+
+
+def _package_version(name: str) -> str:
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "0.0.0"
+
+
+@dataclass(frozen=True)
+class SnapshotIndexEntry:
+    entity_id: str
+    entity_type: str
+    record: int
+    # True when the entity is the record itself, False when it is inlined
+    # in the entity stored in that record
+    is_record_root: bool
+
+
+@dataclass(frozen=True)
+class SnapshotHeader:
+    format: str
+    version: int
+    pypeh_version: str
+    peh_model_version: str
+    python_version: str
+    pickle_protocol: int
+    entity_count: int
+    record_count: int
+    body_length: int
+    index_length: int
+    content_hash: str
+
+    @classmethod
+    def from_metadata(cls, metadata: dict[str, Any]) -> "SnapshotHeader":
+        return cls(**metadata)
+
+    def to_metadata(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class SnapshotIndex:
+    records: list[tuple[int, int]]
+    entities: list[SnapshotIndexEntry]
+
+    @classmethod
+    def from_bytes(cls, data: bytes | memoryview) -> "SnapshotIndex":
+        payload = json.loads(bytes(data).decode("utf-8"))
+        return cls(
+            records=[
+                (offset, length) for offset, length in payload["records"]
+            ],
+            entities=[
+                SnapshotIndexEntry(entity_id, entity_type, record, bool(root))
+                for entity_id, entity_type, record, root in payload["entities"]
+            ],
+        )
+
+    def to_bytes(self) -> bytes:
+        payload = {
+            "records": [list(record) for record in self.records],
+            "entities": [
+                [
+                    entry.entity_id,
+                    entry.entity_type,
+                    entry.record,
+                    int(entry.is_record_root),
+                ]
+                for entry in self.entities
+            ],
+        }
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
+
+def _record_roots(
+    entities: dict[str, T_NamedThingLike],
+) -> dict[str, str]:
+    """Map ids of entities inlined in another cached entity to that entity."""
+    parent_of: dict[str, str] = {}
+    for entity_id, entity in entities.items():
+        for nested in load_entities_from_tree(entity):
+            if nested is entity:
+                continue
+            nested_id = getattr(nested, "id", None)
+            if nested_id in parent_of or nested_id == entity_id:
+                continue
+            if entities.get(nested_id) is nested:
+                parent_of[nested_id] = entity_id
+
+    roots = {}
+    for entity_id in parent_of:
+        root_id = parent_of[entity_id]
+        while root_id in parent_of:
+            root_id = parent_of[root_id]
+        roots[entity_id] = root_id
+    return roots
+
+
+def dump_snapshot(
+    container: CacheContainer, file_obj: IO[bytes]
+) -> SnapshotHeader:
+    """Write all entities of container to file_obj as a binary snapshot."""
+    entities = {entity.id: entity for entity in container.get_all()}
+    roots = _record_roots(entities)
+
+    body = io.BytesIO()
+    records: list[tuple[int, int]] = []
+    record_numbers: dict[str, int] = {}
+    for entity_id, entity in entities.items():
+        if entity_id in roots:
+            continue
+        data = pickle.dumps(entity, protocol=PICKLE_PROTOCOL)
+        record_numbers[entity_id] = len(records)
+        records.append((body.tell(), len(data)))
+        body.write(data)
+
+    index_entries = []
+    for entity_id, entity in entities.items():
+        root_id = roots.get(entity_id)
+        index_entries.append(
+            SnapshotIndexEntry(
+                entity_id=entity_id,
+                entity_type=get_entity_type(entity),
+                record=record_numbers[root_id or entity_id],
+                is_record_root=root_id is None,
+            )
+        )
+    index_bytes = SnapshotIndex(records, index_entries).to_bytes()
+    body_bytes = body.getbuffer()
+
+    content_hash = hashlib.sha256()
+    content_hash.update(body_bytes)
+    content_hash.update(index_bytes)
+    header = SnapshotHeader(
+        format=SNAPSHOT_FORMAT,
+        version=SNAPSHOT_VERSION,
+        pypeh_version=_package_version("pypeh"),
+        peh_model_version=_package_version("peh-model"),
+        python_version=f"{sys.version_info.major}.{sys.version_info.minor}",
+        pickle_protocol=PICKLE_PROTOCOL,
+        entity_count=len(index_entries),
+        record_count=len(records),
+        body_length=len(body_bytes),
+        index_length=len(index_bytes),
+        content_hash=f"sha256:{content_hash.hexdigest()}",
+    )
+    header_bytes = json.dumps(header.to_metadata(), sort_keys=True).encode(
+        "utf-8"
+    )
+
+    file_obj.write(SNAPSHOT_MAGIC)
+    file_obj.write(_LENGTH.pack(len(header_bytes)))
+    file_obj.write(header_bytes)
+    file_obj.write(body_bytes)
+    file_obj.write(index_bytes)
+    return header
+
+
+def _check_header(
+    header: SnapshotHeader, check_peh_model_version: bool
+) -> None:
+    if header.format != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format: {header.format!r}")
+    if header.version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {header.version}; expected "
+            f"{SNAPSHOT_VERSION}."
+        )
+    current = _package_version("peh-model")
+    if check_peh_model_version and header.peh_model_version != current:
+        raise ValueError(
+            "Snapshot was written with peh-model "
+            f"{header.peh_model_version}, but {current} is installed. "
+            "Rebuild the snapshot."
+        )
+
+
+def parse_snapshot_header(
+    data: bytes | memoryview, check_peh_model_version: bool = True
+) -> tuple[SnapshotHeader, int]:
+    """Return the snapshot header and the offset at which the body starts."""
+    prefix_length = len(SNAPSHOT_MAGIC) + _LENGTH.size
+    if bytes(data[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+        raise ValueError("Not a pypeh cache snapshot.")
+    (header_length,) = _LENGTH.unpack(
+        bytes(data[len(SNAPSHOT_MAGIC) : prefix_length])
+    )
+    header_end = prefix_length + header_length
+    header = SnapshotHeader.from_metadata(
+        json.loads(bytes(data[prefix_length:header_end]).decode("utf-8"))
+    )
+    _check_header(header, check_peh_model_version)
+    return header, header_end
+
+
+def verify_snapshot_content(
+    header: SnapshotHeader, content: bytes | memoryview
+) -> None:
+    digest = f"sha256:{hashlib.sha256(content).hexdigest()}"
+    if digest != header.content_hash:
+        raise ValueError(
+            "Snapshot content hash mismatch: the snapshot is corrupt or "
+            "truncated."
+        )
+
+
+def load_snapshot(
+    file_obj: IO[bytes],
+    container: CacheContainer | None = None,
+    verify: bool = True,
+    check_peh_model_version: bool = True,
+) -> CacheContainer:
+    """
+    Load a binary snapshot into container (a new default container when
+    omitted) and return the container.
+    """
+    data = memoryview(file_obj.read())
+    header, body_start = parse_snapshot_header(data, check_peh_model_version)
+    index_start = body_start + header.body_length
+    content = data[body_start : index_start + header.index_length]
+    if len(content) != header.body_length + header.index_length:
+        raise ValueError("Snapshot is truncated.")
+    if verify:
+        verify_snapshot_content(header, content)
+
+    index = SnapshotIndex.from_bytes(data[index_start:])
+    if container is None:
+        container = CacheContainerFactory.new()
+
+    nested_by_record: dict[int, set[str]] = {}
+    for entry in index.entities:
+        if not entry.is_record_root:
+            nested_by_record.setdefault(entry.record, set()).add(
+                entry.entity_id
+            )
+
+    for record, (offset, length) in enumerate(index.records):
+        start = body_start + offset
+        entity = pickle.loads(data[start : start + length])
+        container.add(entity)
+        nested_ids = nested_by_record.get(record)
+        if not nested_ids:
+            continue
+        for nested in load_entities_from_tree(entity):
+            if nested is not entity and nested.id in nested_ids:
+                container.add(nested)
+    return container
+
+
+class SnapshotContainer(CacheContainer[mmap.mmap]):
+    """
+    Read-only cache container over a memory-mapped snapshot file.
+
+    Only the snapshot index is parsed on open. Records are unpickled on
+    first access and kept per process, while the mapped file is shared by
+    every process that opens it. Entities added afterwards go to an
+    in-memory overlay; entities popped from the snapshot are hidden.
+
+    Pickling the container (e.g. to send it to a spawned worker) only
+    transfers the path and the overlay: the worker maps the file again.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        verify: bool = True,
+        check_peh_model_version: bool = True,
+    ):
+        self.path = str(path)
+        self.check_peh_model_version = check_peh_model_version
+        with open(self.path, "rb") as f:
+            self._storage = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open(verify)
+        except BaseException:
+            self._storage.close()
+            raise
+        self._overlay = MappingContainer()
+
+    def _open(self, verify: bool) -> None:
+        with memoryview(self._storage) as data:
+            header, body_start = parse_snapshot_header(
+                data, self.check_peh_model_version
+            )
+            index_start = body_start + header.body_length
+            index_end = index_start + header.index_length
+            if len(data) < index_end:
+                raise ValueError("Snapshot is truncated.")
+            # release every slice explicitly, the map cannot be closed
+            # while views on it are alive
+            if verify:
+                with data[body_start:index_end] as content:
+                    verify_snapshot_content(header, content)
+            with data[index_start:index_end] as index_data:
+                index = SnapshotIndex.from_bytes(index_data)
+        self.header = header
+        self._body_start = body_start
+        self._records = index.records
+        # entity id -> (entity type, record number)
+        self._entries: Dict[str, tuple[str, int]] = {}
+        self._snapshot_types: Dict[str, list[str]] = {}
+        for entry in index.entities:
+            entity_id = sys.intern(entry.entity_id)
+            self._entries[entity_id] = (entry.entity_type, entry.record)
+            self._snapshot_types.setdefault(entry.entity_type, []).append(
+                entity_id
+            )
+        self._decoded: Dict[str, T_NamedThingLike] = {}
+        self._removed: set[str] = set()
+
+    @property
+    def _class_index(self) -> Dict[str, Any]:
+        ret: Dict[str, Any] = dict.fromkeys(self._snapshot_types)
+        ret.update(dict.fromkeys(self._overlay._class_index))
+        return ret
+
+    def _in_snapshot(self, entity_id: str) -> bool:
+        return entity_id in self._entries and entity_id not in self._removed
+
+    def _load_record(self, record: int) -> None:
+        offset, length = self._records[record]
+        start = self._body_start + offset
+        with memoryview(self._storage) as data:
+            with data[start : start + length] as record_data:
+                entity = pickle.loads(record_data)
+        for nested in load_entities_from_tree(entity):
+            nested_id = getattr(nested, "id", None)
+            entry = self._entries.get(nested_id)
+            if entry is not None and entry[1] == record:
+                self._decoded.setdefault(nested_id, nested)
+
+    def _get_snapshot_entity(self, entity_id: str) -> T_NamedThingLike:
+        entity = self._decoded.get(entity_id)
+        if entity is None:
+            self._load_record(self._entries[entity_id][1])
+            entity = self._decoded[entity_id]
+        return entity
+
+    def add(self, entity: T_NamedThingLike) -> None:
+        if self._in_snapshot(entity.id):
+            return
+        self._overlay.add(entity)
+
+    def get(
+        self, entity_id: str, entity_type: str | None = None
+    ) -> Optional[T_NamedThingLike]:
+        if self._in_snapshot(entity_id):
+            return self._get_snapshot_entity(entity_id)
+        return self._overlay.get(entity_id, entity_type)
+
+    def get_all(
+        self, entity_type: str | None = None
+    ) -> Generator[T_NamedThingLike, None, None]:
+        if entity_type is None:
+            entity_ids = self._entries
+        else:
+            entity_ids = self._snapshot_types.get(entity_type, ())
+        for entity_id in entity_ids:
+            if entity_id not in self._removed:
+                yield self._get_snapshot_entity(entity_id)
+        yield from self._overlay.get_all(entity_type)
+
+    def exists(self, entity_id: str, entity_type: str | None = None) -> bool:
+        return self._in_snapshot(entity_id) or self._overlay.exists(
+            entity_id, entity_type
+        )
+
+    def pop(
+        self, entity_id: str, entity_type: str
+    ) -> Optional[T_NamedThingLike]:
+        if self._in_snapshot(entity_id):
+            entity = self._get_snapshot_entity(entity_id)
+            self._removed.add(entity_id)
+            self._decoded.pop(entity_id, None)
+            return entity
+        return self._overlay.pop(entity_id, entity_type)
+
+    def clear(self) -> None:
+        self._removed.update(self._entries)
+        self._decoded.clear()
+        self._overlay.clear()
+
+    def close(self) -> None:
+        """Unmap the snapshot file. Decoded entities stay usable."""
+        self._storage.close()
+
+    def __enter__(self) -> "SnapshotContainer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getstate__(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "check_peh_model_version": self.check_peh_model_version,
+            "removed": self._removed,
+            "overlay": list(self._overlay.get_all()),
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        # the snapshot was verified by the process that opened it first
+        self.__init__(
+            state["path"],
+            verify=False,
+            check_peh_model_version=state["check_peh_model_version"],
+        )
+        self._removed.update(state["removed"])
+        for entity in state["overlay"]:
+            self._overlay.add(entity)
+
+    def __len__(self) -> int:
+        return len(self._entries) - len(self._removed) + len(self._overlay)
+
+    def __repr__(self):
+        return f"SnapshotContainer({self.path!r})"
@@ -23,6 +23,9 @@ def load_entities_from_tree(
 ):
     if isinstance(root, NamedThing):
         yield root
+    if isinstance(root, TypedLazyProxy):
+        yield root
+        return
     if isinstance(root, YAMLRoot):
         # if isinstance(root, NamedThing) or isinstance(root, EntityList): # TODO decide which one we need
         for property_name in list(root._keys()):
@@ -29,6 +29,9 @@ from pypeh.core.models.internal_data_layout import (
 from pypeh.core.models.typing import T_DataType
 from pypeh.core.models import graph, validation_dto
 from pypeh.core.utils.function_utils import _extract_callable
+from pypeh.core.utils.execution import over_memory_budget
+from pypeh.core.utils.profiling import current_span, span, traced
+from pypeh.core.utils.query_plans import plan_labels
 
 if TYPE_CHECKING:
     from typing import Sequence, Any
@@ -80,6 +83,20 @@ class JoinEdge:
         )
 
 
+@dataclass
+class JoinEdgeDiagnostics:
+    """Row counts of a single executed join edge, None when unknown."""
+
+    edge: JoinEdge
+    left_rows: int | None = None
+    right_rows: int | None = None
+    # right rows left after the semi-join pre-filter, None if not applied
+    prefiltered_right_rows: int | None = None
+    output_rows: int | None = None
+    build_side: str = "auto"
+    validate: str = "m:m"
+
+
 @dataclass
 class JoinPlan:
     base_dataset_label: str
@@ -88,6 +105,18 @@ class JoinPlan:
         default_factory=dict
     )
     how: JoinHow = "left"
+    # right datasets whose join keys are declared unique (e.g. their primary
+    # key), these are joined many-to-one without checking the row count
+    unique_key_datasets: set[str] = field(default_factory=set)
+    # validate that the join keys of every right dataset are unique
+    enforce_unique_keys: bool = False
+    # pre-filter right datasets to the join keys of the left side when the
+    # left side has fewer rows
+    semi_join: bool = True
+    # filled in by `execute_join_plan`, one entry per executed edge
+    diagnostics: list[JoinEdgeDiagnostics] = field(
+        default_factory=list, compare=False
+    )
 
     @classmethod
     def from_join_specs(
@@ -97,18 +126,54 @@ class JoinPlan:
         join_specs: list[JoinSpec],
         required_fields_by_dataset: dict[str, set[str]] | None = None,
         how: JoinHow = "left",
+        unique_key_datasets: set[str] | None = None,
+        enforce_unique_keys: bool = False,
     ) -> "JoinPlan":
-        edges = [
-            JoinEdge.from_join_spec(js).orient_to_base(base_dataset_label)
-            for js in join_specs
-        ]
+        """
+        Build a plan from JoinSpecs in execution order. Each edge is oriented
+        so its left dataset is the base dataset or a dataset joined by an
+        earlier edge, which allows multi-hop plans from `plan_join_tree`.
+        """
+        edges = []
+        joined = {base_dataset_label}
+        for js in join_specs:
+            edge = JoinEdge.from_join_spec(js)
+            if edge.right_dataset == base_dataset_label:
+                edge = edge.orient_to_base(base_dataset_label)
+            elif edge.left_dataset not in joined:
+                if edge.right_dataset not in joined:
+                    raise ValueError(
+                        f"JoinEdge {edge} does not reference a dataset that "
+                        f"is joined before it onto base dataset "
+                        f"'{base_dataset_label}'."
+                    )
+                edge = edge.orient_to_base(edge.right_dataset)
+            joined.add(edge.right_dataset)
+            edges.append(edge)
         return cls(
             base_dataset_label=base_dataset_label,
             edges=edges,
             required_fields_by_dataset=required_fields_by_dataset or {},
             how=how,
+            unique_key_datasets=unique_key_datasets or set(),
+            enforce_unique_keys=enforce_unique_keys,
         )
 
+    def declare_unique_keys(self, dataset_series: DatasetSeries) -> None:
+        """
+        Declare the right dataset of every edge that joins on (a superset of)
+        its primary key as having unique join keys.
+        """
+        for edge in self.edges:
+            dataset = dataset_series.parts.get(edge.right_dataset)
+            if dataset is None:
+                continue
+            primary_keys = dataset.schema.primary_keys
+            if len(primary_keys) > 0 and primary_keys.issubset(
+                edge.right_elements
+            ):
+                self.unique_key_datasets.add(edge.right_dataset)
+
 
 class DataOpsInterface(Generic[T_DataType]):
     """
@@ -144,6 +209,40 @@ class DataOpsInterface(Generic[T_DataType]):
             "Method DataOpsInterface.execute_join_plan requires adapter-specific implementation."
         )
 
+    def estimate_row_count(self, data: T_DataType) -> int | None:
+        """
+        Number of rows in data when it is known without computation, used
+        to order joins. Returns None when unknown.
+        """
+        return None
+
+    def estimate_byte_size(self, data: T_DataType) -> int | None:
+        """
+        In-memory size of data in bytes when it is known without
+        computation, used to check the memory budget. Returns None when
+        unknown.
+        """
+        return None
+
+    def _estimate_working_set(self, datasets: list) -> int | None:
+        sizes = [
+            self.estimate_byte_size(data)
+            for data in datasets
+            if data is not None
+        ]
+        known = [size for size in sizes if size is not None]
+        if len(known) == 0:
+            return None
+        return sum(known)
+
+    def spill(self, data: T_DataType, dataset_label: str) -> T_DataType:
+        """
+        Write data to the spill directory of the enclosing
+        `over_memory_budget` block and return it re-scanned lazily.
+        Adapters that cannot spill return data unchanged.
+        """
+        return data
+
     @abstractmethod
     def select_field(self, dataset, field_label: str):
         raise NotImplementedError(
@@ -158,8 +257,17 @@ class DataOpsInterface(Generic[T_DataType]):
 
     @abstractmethod
     def get_element_values(
-        self, data: T_DataType, element_label: str, as_list=True
-    ) -> set[str] | list[str]:
+        self,
+        data: T_DataType,
+        element_label: str,
+        as_list=True,
+        as_series=False,
+    ) -> set[str] | list[str] | Any:
+        """
+        Values of element_label in data. With as_series the column is
+        returned in the adapter's native columnar type instead of being
+        converted to Python objects.
+        """
         raise NotImplementedError(
             "Abstract method on class DataOpsInterface was called without supporting implementation."
         )
@@ -185,9 +293,16 @@ class DataOpsInterface(Generic[T_DataType]):
         self,
         data: T_DataType,
         element_group: list[str],
-        id_group: list[tuple[Any]] | None = None,
+        id_group: list[tuple[Any]] | Any | None = None,
         identifying_elements: list[str] | None = None,
-    ) -> T_DataType: ...
+    ) -> T_DataType:
+        """
+        Select element_group from data. When id_group is given only the
+        rows whose identifying_elements match an id in the group are kept;
+        adapters may accept the id group in their native (columnar) format
+        besides a list of tuples.
+        """
+        ...
 
     def relabel(
         self, data: T_DataType, element_mapping: dict[str, str]
@@ -226,12 +341,8 @@ class DataOpsInterface(Generic[T_DataType]):
         self, observation: peh.Observation, cache_view: CacheContainerView
     ) -> dict[str, peh.ObservablePropertySpecification]:
         ret = {}
-        observation_design_id = observation.observation_design
-        assert isinstance(observation_design_id, str)
-        observation_design = cache_view.get(
-            observation_design_id, "ObservationDesign"
-        )
-        assert observation_design is not None
+        observation_design = cache_view.get_observation_design(observation)
+        assert isinstance(observation_design, peh.ObservationDesign)
         observable_property_specs = (
             observation_design.observable_property_specifications
         )
@@ -294,31 +405,28 @@ class DataOpsInterface(Generic[T_DataType]):
             )
 
     @staticmethod
-    def _collect_observable_property_context(
+    def _collect_observable_property_contexts(
         dataset_series: DatasetSeries[T_DataType],
-        observation_id: str,
-        source_dataset_labels: list[str],
-    ) -> dict[str, tuple[str, str]]:
-        observable_property_context: dict[str, tuple[str, str]] = {}
+    ) -> dict[str, dict[str, tuple[str, str]]]:
+        """
+        Group the context index by observation in a single pass, keeping
+        only references to the datasets the observation is indexed in.
+        """
+        ret: dict[str, dict[str, tuple[str, str]]] = defaultdict(dict)
         for (
-            context_observation_id,
+            observation_id,
             observable_property_id,
         ), contextual_ref in dataset_series._context_index.items():
-            if context_observation_id != observation_id:
-                continue
             source_label, element_label = contextual_ref
-            if source_label not in source_dataset_labels:
+            if source_label not in dataset_series._obs_index.get(
+                observation_id, ()
+            ):
                 continue
-            observable_property_context[observable_property_id] = (
+            ret[observation_id][observable_property_id] = (
                 source_label,
                 element_label,
             )
-        if len(observable_property_context) == 0:
-            raise ValueError(
-                f"Could not determine contextual fields for observation "
-                f"'{observation_id}'."
-            )
-        return observable_property_context
+        return ret
 
     @staticmethod
     def _collect_required_fields_by_dataset(
@@ -348,44 +456,71 @@ class DataOpsInterface(Generic[T_DataType]):
             ),
         )
 
-    @staticmethod
+    def _estimate_row_counts(
+        self,
+        dataset_series: DatasetSeries[T_DataType],
+    ) -> dict[str, int]:
+        ret = {}
+        for dataset_label, dataset in dataset_series.parts.items():
+            if dataset.data is None:
+                continue
+            row_count = self.estimate_row_count(dataset.data)
+            if row_count is not None:
+                ret[dataset_label] = row_count
+        return ret
+
     def _resolve_join_specs(
+        self,
         dataset_series: DatasetSeries[T_DataType],
         observation_id: str,
         source_dataset_labels: list[str],
         base_dataset_label: str,
         required_fields_by_dataset: dict[str, set[str]],
-    ) -> tuple[list[JoinSpec], dict[tuple[str, str], tuple[str, str]]]:
-        raw_join_specs: list[JoinSpec] = []
-        right_to_left_join_key: dict[tuple[str, str], tuple[str, str]] = {}
-
-        for source_label in source_dataset_labels:
-            if source_label == base_dataset_label:
-                continue
-            join_spec = dataset_series.resolve_join(
-                base_dataset_label, source_label
-            )
-            if join_spec is None:
-                raise ValueError(
-                    f"Could not resolve join path between datasets "
-                    f"'{base_dataset_label}' and '{source_label}' for "
-                    f"observation '{observation_id}'."
-                )
-            raw_join_specs.append(join_spec)
-            required_fields_by_dataset[join_spec.left_dataset].update(
-                join_spec.left_elements
-            )
-            required_fields_by_dataset[join_spec.right_dataset].update(
-                join_spec.right_elements
+    ) -> tuple[
+        list[JoinSpec], dict[tuple[str, str], tuple[str, str]], list[str]
+    ]:
+        """
+        Returns the JoinSpecs in execution order, the join key each right
+        join key is merged into, and the labels of all datasets taking part
+        in the join: the source datasets followed by any intermediate
+        datasets the join path passes through.
+        """
+        try:
+            join_tree = dataset_series.plan_join_tree(
+                base_dataset_label,
+                source_dataset_labels,
+                required_fields_by_dataset=required_fields_by_dataset,
+                cardinalities=self._estimate_row_counts(dataset_series),
             )
+        except ValueError as e:
+            raise ValueError(
+                f"Could not resolve join path for observation "
+                f"'{observation_id}': {e}"
+            ) from e
+
+        right_to_left_join_key: dict[tuple[str, str], tuple[str, str]] = {}
+        for join_spec in join_tree.join_specs:
             for left_element, right_element in zip(
                 join_spec.left_elements, join_spec.right_elements
             ):
                 right_to_left_join_key[
                     (join_spec.right_dataset, right_element)
                 ] = (join_spec.left_dataset, left_element)
+        for dataset_label, fields in (
+            join_tree.required_fields_by_dataset.items()
+        ):
+            required_fields_by_dataset[dataset_label].update(fields)
 
-        return raw_join_specs, right_to_left_join_key
+        join_dataset_labels = list(source_dataset_labels)
+        for dataset_label in join_tree.dataset_labels:
+            if dataset_label not in join_dataset_labels:
+                join_dataset_labels.append(dataset_label)
+
+        return (
+            join_tree.join_specs,
+            right_to_left_join_key,
+            join_dataset_labels,
+        )
 
     def _build_field_label_mapping(
         self,
@@ -449,6 +584,7 @@ class DataOpsInterface(Generic[T_DataType]):
 
     @staticmethod
     def _build_adjusted_join_plan(
+        dataset_series: DatasetSeries,
         base_dataset_label: str,
         source_dataset_labels: list[str],
         raw_join_specs: list[JoinSpec],
@@ -478,11 +614,18 @@ class DataOpsInterface(Generic[T_DataType]):
                     source_label, set()
                 )
             )
+        # key uniqueness follows from the schema, so it is declared on the
+        # plan with the original element labels
+        raw_join_plan = JoinPlan.from_join_specs(
+            base_dataset_label=base_dataset_label, join_specs=raw_join_specs
+        )
+        raw_join_plan.declare_unique_keys(dataset_series)
         return JoinPlan.from_join_specs(
             base_dataset_label=base_dataset_label,
             join_specs=adjusted_join_specs,
             required_fields_by_dataset=adjusted_required_fields,
             how="left",
+            unique_key_datasets=raw_join_plan.unique_key_datasets,
         )
 
     def _resolve_output_fields_by_observable_property(
@@ -497,13 +640,10 @@ class DataOpsInterface(Generic[T_DataType]):
             source_label,
             field_label,
         ) in observable_property_context.items():
-            join_key_pair = right_to_left_join_key.get(
-                (source_label, field_label), None
-            )
-            if join_key_pair is not None:
-                mapped_source = join_key_pair
-            else:
-                mapped_source = (source_label, field_label)
+            # follow merged join keys back to the column that holds them
+            mapped_source = (source_label, field_label)
+            while mapped_source in right_to_left_join_key:
+                mapped_source = right_to_left_join_key[mapped_source]
             final_fields_by_observable_property[observable_property_id] = (
                 field_label_mapping[mapped_source]
             )
@@ -570,17 +710,170 @@ class DataOpsInterface(Generic[T_DataType]):
 
         output_dataset.data = final_data
 
+    def _split_observation_group(
+        self,
+        dataset_series: DatasetSeries[T_DataType],
+        source_dataset_labels: list[str],
+        base_dataset_label: str,
+        observations: list[tuple[str, dict[str, tuple[str, str]]]],
+        *,
+        lazy: bool = False,
+    ) -> dict[str, tuple[list[str], dict[str, str], T_DataType]]:
+        """
+        Join the source datasets once for all observations in the group and
+        project every observation from the result. Returns the source
+        datasets, output field per observable property and data for each
+        observation.
+        """
+        group_observation_id = observations[0][0]
+        required_fields_by_dataset: dict[str, set[str]] = defaultdict(set)
+        for _, observable_property_context in observations:
+            observation_fields_by_dataset = (
+                self._collect_required_fields_by_dataset(
+                    observable_property_context
+                )
+            )
+            for dataset_label, fields in observation_fields_by_dataset.items():
+                required_fields_by_dataset[dataset_label].update(fields)
+
+        raw_join_specs, right_to_left_join_key, join_dataset_labels = (
+            self._resolve_join_specs(
+                dataset_series,
+                group_observation_id,
+                source_dataset_labels,
+                base_dataset_label,
+                required_fields_by_dataset,
+            )
+        )
+        field_label_mapping = self._build_field_label_mapping(
+            join_dataset_labels, required_fields_by_dataset
+        )
+        datasets_for_join = self._prepare_datasets_for_join(
+            dataset_series,
+            group_observation_id,
+            join_dataset_labels,
+            required_fields_by_dataset,
+            field_label_mapping,
+        )
+        if lazy:
+            datasets_for_join = {
+                dataset_label: self.normalize_input(data)
+                for dataset_label, data in datasets_for_join.items()
+            }
+
+        base_data = datasets_for_join[base_dataset_label]
+        if len(raw_join_specs) > 0:
+            join_plan = self._build_adjusted_join_plan(
+                dataset_series,
+                base_dataset_label,
+                join_dataset_labels,
+                raw_join_specs,
+                required_fields_by_dataset,
+                field_label_mapping,
+            )
+            joined_data = self.execute_join_plan(
+                base_data=base_data,
+                datasets=datasets_for_join,
+                join_plan=join_plan,
+            )
+            if lazy:
+                # materialise the shared join once, the observations are
+                # lazy projections of it and collecting them separately
+                # does not re-run the join
+                joined_data = self.normalize_input(
+                    self.normalize_output(joined_data)
+                )
+        else:
+            joined_data = base_data
+
+        join_key_fields: dict[str, set[str]] = defaultdict(set)
+        for join_spec in raw_join_specs:
+            join_key_fields[join_spec.left_dataset].update(
+                join_spec.left_elements
+            )
+            join_key_fields[join_spec.right_dataset].update(
+                join_spec.right_elements
+            )
+
+        ret = {}
+        for observation_id, observable_property_context in observations:
+            # output labels only depend on the fields of the observation
+            # itself, as if it was joined on its own
+            observation_fields_by_dataset = (
+                self._collect_required_fields_by_dataset(
+                    observable_property_context
+                )
+            )
+            for dataset_label, fields in join_key_fields.items():
+                observation_fields_by_dataset[dataset_label].update(fields)
+            observation_field_label_mapping = self._build_field_label_mapping(
+                join_dataset_labels, observation_fields_by_dataset
+            )
+            final_fields_by_observable_property = (
+                self._resolve_output_fields_by_observable_property(
+                    observation_id,
+                    observable_property_context,
+                    right_to_left_join_key,
+                    observation_field_label_mapping,
+                )
+            )
+            joined_fields_by_observable_property = (
+                self._resolve_output_fields_by_observable_property(
+                    observation_id,
+                    observable_property_context,
+                    right_to_left_join_key,
+                    field_label_mapping,
+                )
+            )
+
+            observable_property_ids = sorted(
+                final_fields_by_observable_property
+            )
+            final_data = self.subset(
+                joined_data,
+                element_group=[
+                    joined_fields_by_observable_property[
+                        observable_property_id
+                    ]
+                    for observable_property_id in observable_property_ids
+                ],
+            )
+            relabel_mapping = {
+                joined_fields_by_observable_property[
+                    observable_property_id
+                ]: final_fields_by_observable_property[observable_property_id]
+                for observable_property_id in observable_property_ids
+                if joined_fields_by_observable_property[observable_property_id]
+                != final_fields_by_observable_property[observable_property_id]
+            }
+            if len(relabel_mapping) > 0:
+                final_data = self.relabel(final_data, relabel_mapping)
+            ret[observation_id] = (
+                source_dataset_labels,
+                final_fields_by_observable_property,
+                final_data,
+            )
+        return ret
+
+    @traced()
     def split_by_observation(
         self,
         dataset_series: DatasetSeries[T_DataType],
         *,
         new_label: str | None = None,
+        lazy: bool = False,
     ) -> DatasetSeries[T_DataType]:
         """
         Return a new DatasetSeries where each Dataset maps to exactly one Observation.
 
         This operation can split datasets with multiple observations and join
         multiple datasets that jointly represent one observation.
+
+        Observations with the same source datasets are split from a single
+        join. The datasets hold eager data by default. With `lazy=True` they
+        hold lazy data (see `normalize_input`): each shared join is
+        materialised once and every observation is a lazy projection of it,
+        so collecting the datasets separately does not re-run the join.
         """
         self._ensure_split_indices(dataset_series)
 
@@ -594,6 +887,15 @@ class DataOpsInterface(Generic[T_DataType]):
             metadata=dict(dataset_series.metadata),
         )
 
+        observable_property_contexts = (
+            self._collect_observable_property_contexts(dataset_series)
+        )
+        # observations with the same source datasets and base dataset share
+        # one join
+        groups: dict[
+            tuple[tuple[str, ...], str],
+            list[tuple[str, dict[str, tuple[str, str]]]],
+        ] = defaultdict(list)
         observation_ids = sorted(dataset_series._obs_index.keys())
         for observation_id in observation_ids:
             source_dataset_labels = sorted(
@@ -601,82 +903,57 @@ class DataOpsInterface(Generic[T_DataType]):
             )
             if len(source_dataset_labels) == 0:
                 continue
-
-            observable_property_context = (
-                self._collect_observable_property_context(
-                    dataset_series,
-                    observation_id,
-                    source_dataset_labels,
-                )
+            observable_property_context = observable_property_contexts.get(
+                observation_id
             )
-            required_fields_by_dataset = (
-                self._collect_required_fields_by_dataset(
-                    observable_property_context
+            if not observable_property_context:
+                raise ValueError(
+                    f"Could not determine contextual fields for observation "
+                    f"'{observation_id}'."
                 )
-            )
             base_dataset_label = self._pick_base_dataset_label(
-                source_dataset_labels, required_fields_by_dataset
-            )
-
-            raw_join_specs, right_to_left_join_key = self._resolve_join_specs(
-                dataset_series,
-                observation_id,
                 source_dataset_labels,
-                base_dataset_label,
-                required_fields_by_dataset,
-            )
-            field_label_mapping = self._build_field_label_mapping(
-                source_dataset_labels, required_fields_by_dataset
+                self._collect_required_fields_by_dataset(
+                    observable_property_context
+                ),
             )
-
-            datasets_for_join = self._prepare_datasets_for_join(
-                dataset_series,
-                observation_id,
-                source_dataset_labels,
-                required_fields_by_dataset,
-                field_label_mapping,
+            groups[(tuple(source_dataset_labels), base_dataset_label)].append(
+                (observation_id, observable_property_context)
             )
 
-            base_data = datasets_for_join[base_dataset_label]
-            if len(raw_join_specs) > 0:
-                join_plan = self._build_adjusted_join_plan(
+        split_data: dict[
+            str, tuple[list[str], dict[str, str], T_DataType]
+        ] = {}
+        for (
+            source_dataset_labels,
+            base_dataset_label,
+        ), observations in groups.items():
+            split_data.update(
+                self._split_observation_group(
+                    dataset_series,
+                    list(source_dataset_labels),
                     base_dataset_label,
-                    source_dataset_labels,
-                    raw_join_specs,
-                    required_fields_by_dataset,
-                    field_label_mapping,
-                )
-                joined_data = self.execute_join_plan(
-                    base_data=base_data,
-                    datasets=datasets_for_join,
-                    join_plan=join_plan,
-                )
-            else:
-                joined_data = base_data
-
-            final_fields_by_observable_property = (
-                self._resolve_output_fields_by_observable_property(
-                    observation_id,
-                    observable_property_context,
-                    right_to_left_join_key,
-                    field_label_mapping,
+                    observations,
+                    lazy=lazy,
                 )
             )
 
-            final_fields = [
-                final_fields_by_observable_property[observable_property_id]
-                for observable_property_id in sorted(
-                    final_fields_by_observable_property
-                )
-            ]
-            final_data = self.subset(joined_data, element_group=final_fields)
-
+        for observation_id in observation_ids:
+            if observation_id not in split_data:
+                continue
+            (
+                source_dataset_labels,
+                final_fields_by_observable_property,
+                final_data,
+            ) = split_data[observation_id]
             self._build_output_dataset_for_observation(
                 target_series=ret,
                 source_series=dataset_series,
                 observation_id=observation_id,
                 source_dataset_labels=source_dataset_labels,
-                observable_property_context=observable_property_context,
+                observable_property_context=observable_property_contexts[
+                    observation_id
+                ],
                 final_fields_by_observable_property=final_fields_by_observable_property,
                 final_data=final_data,
             )
@@ -951,9 +1228,10 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
                         else:
                             dependent_dataset = dataset_series[dataset_label]
                         assert dependent_dataset is not None
-                        # fix this at the Interface level
+                        # the validation config carries Python values, the
+                        # adapter dedupes the column before converting it
                         column_arg_values = self.get_element_values(
-                            dependent_dataset.data, field_label, as_list=True
+                            dependent_dataset.data, field_label, as_list=False
                         )
                         arg_values.extend(column_arg_values)
                     dataset_validation.expression.arg_values = arg_values
@@ -981,6 +1259,7 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
 
         return dependent_contextual_field_references
 
+    @traced()
     def build_validation_config(
         self,
         dataset: Dataset,
@@ -988,6 +1267,7 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
         cache_view: CacheContainerView | None = None,
         allow_incomplete: bool = False,
     ) -> validation_dto.ValidationConfig:
+        current_span().set_attribute("dataset_label", dataset.label)
         column_validations = []
         dataset_validations = []
         if cache_view is None:
@@ -1028,6 +1308,59 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
             dependent_contextual_field_references=dependent_contextual_field_references,
         )
 
+    def _resolve_dependent_join_specs(
+        self,
+        dataset: Dataset[T_DataType],
+        dependent_dataset_series: DatasetSeries[T_DataType],
+        dependent_contextual_field_references: dict[str, set[str]],
+    ) -> tuple[list[JoinSpec], dict[str, set[str]]]:
+        required_fields_by_dataset: dict[str, set[str]] = defaultdict(set)
+        for (
+            dataset_label,
+            dependent_field_labels,
+        ) in dependent_contextual_field_references.items():
+            required_fields_by_dataset[dataset_label].update(
+                dependent_field_labels
+            )
+        dataset_labels = list(dependent_contextual_field_references)
+
+        if dependent_dataset_series.get(dataset.label) is dataset:
+            try:
+                join_tree = dependent_dataset_series.plan_join_tree(
+                    dataset.label,
+                    dataset_labels,
+                    required_fields_by_dataset=required_fields_by_dataset,
+                    cardinalities=self._estimate_row_counts(
+                        dependent_dataset_series
+                    ),
+                )
+            except ValueError as e:
+                me = (
+                    f"Cannot resolve explicit join path from "
+                    f"'{dataset.label}': {e} "
+                    "Add a `foreign_key_link` to the DataLayout elements."
+                )
+                logger.error(me)
+                raise ValueError(me) from e
+            return join_tree.join_specs, join_tree.required_fields_by_dataset
+
+        # the dataset is not part of the series, only direct joins apply
+        join_specs: list[JoinSpec] = []
+        for dataset_label in dataset_labels:
+            other_dataset = dependent_dataset_series[dataset_label]
+            assert other_dataset is not None
+            join_spec = dataset.resolve_join(other_dataset)
+            if join_spec is None:
+                me = (
+                    f"Cannot resolve explicit join path between "
+                    f"'{dataset.label}' and '{dataset_label}'. "
+                    "Add a `foreign_key_link` to the DataLayout elements."
+                )
+                logger.error(me)
+                raise ValueError(me)
+            join_specs.append(join_spec)
+        return join_specs, required_fields_by_dataset
+
     def validate(
         self,
         dataset: Dataset[T_DataType],
@@ -1064,33 +1397,26 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
                     dependent_contextual_field_references is not None
                 ), "dependent_contextual_field_references in `ValidationInterface.validate` should not be None"
                 assert dependent_dataset_series is not None
-                join_specs: list[JoinSpec] = []
-                required_fields_by_dataset: dict[str, set[str]] = defaultdict(
-                    set
+                join_specs, required_fields_by_dataset = (
+                    self._resolve_dependent_join_specs(
+                        dataset,
+                        dependent_dataset_series,
+                        dependent_contextual_field_references,
+                    )
                 )
                 available_data: dict[str, T_DataType] = {}
-                for (
-                    dataset_label,
-                    dependent_field_labels,
-                ) in dependent_contextual_field_references.items():
-                    other_dataset = dependent_dataset_series[dataset_label]
-                    assert other_dataset is not None
-                    other_data = other_dataset.data
-                    assert other_data is not None
-                    available_data[dataset_label] = other_data
-                    join_spec = dataset.resolve_join(other_dataset)
-                    if join_spec is None:
-                        me = (
-                            f"Cannot resolve explicit join path between "
-                            f"'{dataset.label}' and '{dataset_label}'. "
-                            "Add a `foreign_key_link` to the DataLayout elements."
-                        )
-                        logger.error(me)
-                        raise ValueError(me)
-                    join_specs.append(join_spec)
-                    required_fields_by_dataset[dataset_label].update(
-                        dependent_field_labels
-                    )
+                for join_spec in join_specs:
+                    for dataset_label in (
+                        join_spec.left_dataset,
+                        join_spec.right_dataset,
+                    ):
+                        if dataset_label == dataset.label:
+                            continue
+                        other_dataset = dependent_dataset_series[dataset_label]
+                        assert other_dataset is not None
+                        other_data = other_dataset.data
+                        assert other_data is not None
+                        available_data[dataset_label] = other_data
 
                 join_plan = JoinPlan.from_join_specs(
                     base_dataset_label=dataset.label,
@@ -1098,13 +1424,18 @@ class ValidationInterface(DataOpsInterface, Generic[T_DataType]):
                     required_fields_by_dataset=required_fields_by_dataset,
                     how="left",
                 )
+                join_plan.declare_unique_keys(dependent_dataset_series)
                 to_validate = self.execute_join_plan(
                     base_data=to_validate,
                     datasets=available_data,
                     join_plan=join_plan,
                 )
 
-        ret = self._validate(to_validate, validation_config)
+        with span(
+            f"{type(self).__name__}._validate", dataset_label=dataset.label
+        ) as active:
+            active.record_data(to_validate)
+            ret = self._validate(to_validate, validation_config)
 
         return ret
 
@@ -1157,6 +1488,13 @@ class DataEnrichmentInterface(DataOpsInterface, Generic[T_DataType]):
                         required_fields_by_dataset[
                             parent_node.dataset_label
                         ].add(parent_node.field_label)
+                # intermediate datasets of multi-hop joins keep the keys
+                # the next join uses
+                for join_spec in join_specs:
+                    if join_spec.left_dataset != node.dataset_label:
+                        required_fields_by_dataset[
+                            join_spec.left_dataset
+                        ].update(join_spec.left_elements)
                 join_plan = JoinPlan.from_join_specs(
                     base_dataset_label=node.dataset_label,
                     join_specs=join_specs,
@@ -1212,6 +1550,7 @@ class DataEnrichmentInterface(DataOpsInterface, Generic[T_DataType]):
 
         return ret
 
+    @traced()
     def compute_with_dependency_graph(
         self, dependency_graph: graph.Graph, datasets: dict[str, Dataset]
     ):
@@ -1228,12 +1567,21 @@ class DataEnrichmentInterface(DataOpsInterface, Generic[T_DataType]):
             label: self.normalize_input(dataset.data)
             for label, dataset in datasets.items()
         }
-        dependency_graph.execution_plan.run(raw_datasets, base_fields)
-
-        for dataset_label in datasets:
-            datasets[dataset_label].data = self.normalize_output(
-                raw_datasets[dataset_label]
+        working_set = self._estimate_working_set(
+            [dataset.data for dataset in datasets.values()]
+        )
+        with over_memory_budget(working_set) as spill:
+            dependency_graph.execution_plan.run(
+                raw_datasets,
+                base_fields,
+                checkpoint=self.spill if spill else None,
             )
+            for dataset_label in datasets:
+                with plan_labels(dataset_label=dataset_label):
+                    datasets[dataset_label].data = self.normalize_output(
+                        raw_datasets[dataset_label]
+                    )
+        current_span().record_data(datasets)
 
     def build_dependency_graph(
         self,
@@ -1245,13 +1593,7 @@ class DataEnrichmentInterface(DataOpsInterface, Generic[T_DataType]):
         dependency_graph = graph.Graph()
         # the source_observations also need to be added to the dependency graph!!!!!
         for observation in observations:
-            assert observation.observation_design is not None
-            assert isinstance(
-                observation.observation_design, peh.ObservationDesignId
-            )
-            observation_design = cache_view.get(
-                observation.observation_design, "ObservationDesign"
-            )
+            observation_design = cache_view.get_observation_design(observation)
             assert isinstance(observation_design, peh.ObservationDesign)
             assert (
                 observation_design.observable_property_specifications
@@ -1378,6 +1720,16 @@ class DataEnrichmentInterface(DataOpsInterface, Generic[T_DataType]):
                                     ),
                                     None,
                                 )
+                            if (
+                                source_dataset_label != target_dataset_label
+                                and join_spec is None
+                                and isinstance(context_index, DatasetSeries)
+                            ):
+                                # no direct join, go through intermediate
+                                # datasets
+                                join_spec = context_index.resolve_join_path(
+                                    target_dataset_label, source_dataset_label
+                                )
                             if (
                                 source_dataset_label != target_dataset_label
                                 and join_spec is None
@@ -1561,12 +1913,8 @@ class AggregationInterface(DataOpsInterface, Generic[T_DataType]):
             map_fn_list = []
             map_fn_result_label_list = []
             # LOOP OVER ALL OBSERVABLE PROPERTY SPECIFICATIONS
-            target_observation_design_id = (
-                target_observation.observation_design
-            )
-            assert isinstance(target_observation_design_id, str)
-            target_observation_design = cache_view.get(
-                target_observation_design_id, "ObservationDesign"
+            target_observation_design = cache_view.get_observation_design(
+                target_observation
             )
             assert isinstance(target_observation_design, peh.ObservationDesign)
             observable_property_specs = (
@@ -1680,9 +2028,12 @@ class AggregationInterface(DataOpsInterface, Generic[T_DataType]):
             )
             collected_results.append(target_data)
 
-            target_data = self.group_results(
-                collected_results, strata=stratification_labels
-            )
+            working_set = self._estimate_working_set([source_data])
+            with plan_labels(dataset_label=label):
+                with over_memory_budget(working_set):
+                    target_data = self.group_results(
+                        collected_results, strata=stratification_labels
+                    )
             data_labels = self.get_element_labels(target_data)
             target_dataset.add_data(data=target_data, data_labels=data_labels)
 
@@ -1,6 +1,6 @@
 from collections import defaultdict, deque
 from dataclasses import dataclass
-from typing import Callable
+from typing import Any, Callable
 
 from pypeh.core.models.internal_data_layout import JoinSpec
 from pypeh.core.utils.function_utils import _extract_callable
@@ -28,10 +28,16 @@ class Delayed:
         self,
         parent: Node,
         map_name: str,
-        join_spec: JoinSpec | None = None,
+        join_spec: JoinSpec | list[JoinSpec] | None = None,
     ):
+        """
+        join_spec is a single JoinSpec, or the JoinSpecs of a multi-hop
+        join path in execution order.
+        """
         self.arg_sources[map_name] = parent
-        if join_spec is not None:
+        if isinstance(join_spec, list):
+            self.join_specs.extend(join_spec)
+        elif join_spec is not None:
             self.join_specs.append(join_spec)
 
     @property
@@ -52,12 +58,29 @@ class ExecutionStep:
 class ExecutionPlan:
     steps: list[ExecutionStep]
 
-    def run(self, datasets: dict, base_fields: dict):
-        for step in self.steps:
+    def run(
+        self,
+        datasets: dict,
+        base_fields: dict,
+        checkpoint: Callable[[Any, str], Any] | None = None,
+    ):
+        """
+        checkpoint is called once per dataset, with the result and label of
+        the last step on that dataset, and returns the data the remaining
+        steps continue from.
+        """
+        last_steps = {
+            step.node.dataset_label: index
+            for index, step in enumerate(self.steps)
+        }
+        for index, step in enumerate(self.steps):
+            dataset_label = step.node.dataset_label
             result = step.compute(
                 datasets, node=step.node, base_fields=base_fields
             )
-            datasets[step.node.dataset_label] = result
+            if checkpoint is not None and last_steps[dataset_label] == index:
+                result = checkpoint(result, dataset_label)
+            datasets[dataset_label] = result
 
     def __len__(self):
         return len(self.steps)
@@ -96,7 +119,7 @@ class Graph:
         parent: Node,
         child: Node,
         map_name: str | None = None,
-        join_spec: JoinSpec | None = None,
+        join_spec: JoinSpec | list[JoinSpec] | None = None,
     ) -> None:
         # TODO: improve map name, refers to kwarg represented by the parent
         self._add_node(parent)
@@ -180,7 +203,7 @@ class Graph:
         source: Node,
         target: Node,
         source_mapping_name: str,
-        join_spec: JoinSpec | None = None,
+        join_spec: JoinSpec | list[JoinSpec] | None = None,
     ):
         child = target
         parent = source
@@ -5,13 +5,16 @@ import logging
 import warnings
 
 from collections import defaultdict
+from collections.abc import Mapping
 from dataclasses import dataclass, field
 from peh_model import peh
+from types import MappingProxyType
 from typing import (
     TYPE_CHECKING,
     Callable,
     Generator,
     Generic,
+    Iterator,
     Protocol,
 )
 from ulid import ULID
@@ -24,6 +27,8 @@ from pypeh.core.models.validation_errors import DatasetSchemaError
 if TYPE_CHECKING:
     from typing import Any
 
+    from pypeh.core.models.join_planner import JoinGraph, JoinTree
+
 
 logger = logging.getLogger(__name__)
 
@@ -75,6 +80,23 @@ class DatasetSchema:
         self._elements_by_observable_property: dict[str, set[str]] = (
             self.build_observable_property_index()
         )
+        # bumped by add_observable_property and add_foreign_key_link
+        self._revision: int = 0
+        self._fk_pairs_memo: (
+            tuple[tuple, dict[str, list[tuple[str, str]]]] | None
+        ) = None
+
+    def structure_key(self) -> tuple:
+        """
+        Changes whenever elements or foreign keys are added, used to
+        invalidate indexes derived from the schema.
+        """
+        return (
+            self.identifier,
+            self._revision,
+            len(self.elements),
+            len(self.foreign_keys),
+        )
 
     def get_type_annotations(self) -> dict[str, ObservablePropertyValueType]:
         ret: dict[str, ObservablePropertyValueType] = dict()
@@ -152,6 +174,7 @@ class DatasetSchema:
         )
         if is_primary_key:
             self.primary_keys.add(element_label)
+        self._revision += 1
 
         return new_element
 
@@ -169,12 +192,13 @@ class DatasetSchema:
             ),
         )
         self.foreign_keys[element_label] = foreign_key_object
+        self._revision += 1
 
     # TODO: move method, this is probably not the right location
     def apply_context_to_expression(
         self,
         expression: peh.ValidationExpression,
-        context: dict[str, dict[str, str]],
+        context: Mapping[str, dict[str, str]],
         this_dataset: str,  # temporary fix
     ):
         expression_stack = [expression]
@@ -232,7 +256,7 @@ class DatasetSchema:
 
     def apply_context(
         self,
-        context: dict[str, dict[str, str]],
+        context: Mapping[str, dict[str, str]],
         cache: CacheContainer,
         this_dataset: str,  # temporary fix
     ):
@@ -274,17 +298,17 @@ class DatasetSchema:
     def _collect_fk_pairs(
         schema: DatasetSchema, referenced_dataset_label: str
     ) -> list[tuple[str, str]]:
-        pairs: list[tuple[str, str]] = []
-        for fk in schema.foreign_keys.values():
-            if fk.reference.dataset_label == referenced_dataset_label:
-                pairs.append((fk.element_label, fk.reference.element_label))
-        pairs.sort(key=lambda pair: (pair[0], pair[1]))
-        return pairs
+        by_dataset = DatasetSchema._collect_fk_pairs_by_dataset(schema)
+        return list(by_dataset.get(referenced_dataset_label, ()))
 
     @staticmethod
     def _collect_fk_pairs_by_dataset(
         schema: DatasetSchema,
     ) -> dict[str, list[tuple[str, str]]]:
+        structure_key = schema.structure_key()
+        memo = schema._fk_pairs_memo
+        if memo is not None and memo[0] == structure_key:
+            return memo[1]
         by_dataset: dict[str, list[tuple[str, str]]] = defaultdict(list)
         for fk in schema.foreign_keys.values():
             by_dataset[fk.reference.dataset_label].append(
@@ -292,6 +316,8 @@ class DatasetSchema:
             )
         for pairs in by_dataset.values():
             pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        by_dataset = dict(by_dataset)
+        schema._fk_pairs_memo = (structure_key, by_dataset)
         return by_dataset
 
     def detect_join(
@@ -361,6 +387,48 @@ class DatasetSchema:
         return None
 
 
+class JoinSpecMapping(Mapping):
+    """
+    Read-only mapping of every pair of datasets in a DatasetSeries to their
+    JoinSpec. Pairs are only resolved when they are looked up, and resolved
+    pairs are cached on the DatasetSeries.
+    """
+
+    def __init__(self, dataset_series: DatasetSeries):
+        self._dataset_series = dataset_series
+
+    def _ordered_pair(self, key) -> tuple[str, str] | None:
+        if not isinstance(key, frozenset) or len(key) != 2:
+            return None
+        parts = self._dataset_series.parts
+        if not all(label in parts for label in key):
+            return None
+        # same orientation as itertools.combinations over the parts
+        order = {label: position for position, label in enumerate(parts)}
+        left, right = sorted(key, key=order.__getitem__)
+        return left, right
+
+    def __getitem__(self, key: frozenset) -> JoinSpec | None:
+        pair = self._ordered_pair(key)
+        if pair is None:
+            raise KeyError(key)
+        return self._dataset_series.resolve_join(*pair)
+
+    def __contains__(self, key) -> bool:
+        return self._ordered_pair(key) is not None
+
+    def __iter__(self) -> Iterator[frozenset]:
+        for combo in itertools.combinations(self._dataset_series.parts, 2):
+            yield frozenset(combo)
+
+    def __len__(self) -> int:
+        n = len(self._dataset_series.parts)
+        return n * (n - 1) // 2
+
+    def __repr__(self):
+        return f"JoinSpecMapping({self._dataset_series.label!r})"
+
+
 @dataclass(kw_only=True)
 class Resource:
     """
@@ -537,6 +605,38 @@ class DatasetSeries(Resource, Generic[T_DataType]):
     _context_index: dict[tuple[str, str], tuple[str, str]] = field(
         default_factory=dict
     )  # {(observation_id, observable_property_id): (dataset_label, dataset_element_label}}
+    # bumped whenever datasets are registered or replaced
+    _revision: int = field(default=0, init=False, repr=False, compare=False)
+    # index name -> (structure key, index)
+    _index_memo: dict[str, tuple[tuple, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # (left label, right label) -> (schema structure keys, JoinSpec)
+    _join_memo: dict[tuple[str, str], tuple[tuple, JoinSpec | None]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def structure_key(self) -> tuple:
+        """
+        Changes whenever datasets are registered or one of their schemas
+        changes, used to invalidate the memoised indexes.
+        """
+        return (
+            self._revision,
+            tuple(
+                (label, dataset.schema.structure_key())
+                for label, dataset in self.parts.items()
+            ),
+        )
+
+    def _memoised(self, name: str, build: Callable[[], Any]) -> Any:
+        structure_key = self.structure_key()
+        memo = self._index_memo.get(name)
+        if memo is not None and memo[0] == structure_key:
+            return memo[1]
+        index = build()
+        self._index_memo[name] = (structure_key, index)
+        return index
 
     def _register_observation(
         self,
@@ -762,12 +862,8 @@ class DatasetSeries(Resource, Generic[T_DataType]):
                 # observation_observable_properties
                 observation = cache_view.get(observation_id, "Observation")
                 assert isinstance(observation, peh.Observation)
-                observation_design_id = observation.observation_design
-                assert isinstance(
-                    observation_design_id, peh.ObservationDesignId
-                )
-                observation_design = cache_view.get(
-                    observation_design_id, "ObservationDesign"
+                observation_design = cache_view.get_observation_design(
+                    observation
                 )
                 assert isinstance(observation_design, peh.ObservationDesign)
                 obs_prop_spec_dict = {}
@@ -847,6 +943,7 @@ class DatasetSeries(Resource, Generic[T_DataType]):
     def register_dataset(self, dataset: Dataset):
         dataset.part_of = self
         self.parts[dataset.label] = dataset
+        self._revision += 1
 
     def add_data(
         self,
@@ -991,21 +1088,97 @@ class DatasetSeries(Resource, Generic[T_DataType]):
         assert left is not None
         right = self.get(right_dataset_label)
         assert right is not None
-        return left.resolve_join(right)
-
-    def resolve_all_joins(self) -> dict[frozenset, JoinSpec | None]:
-        ret = {}
-        for combo in itertools.combinations(self.parts, 2):
-            key = frozenset(combo)
-            ret[key] = self.resolve_join(*combo)
+        key = (left_dataset_label, right_dataset_label)
+        structure_key = (
+            left.schema.structure_key(),
+            right.schema.structure_key(),
+        )
+        memo = self._join_memo.get(key)
+        if memo is not None and memo[0] == structure_key:
+            return memo[1]
+        ret = left.resolve_join(right)
+        self._join_memo[key] = (structure_key, ret)
         return ret
 
-    def _get_validation_index(self) -> dict[str, dict[str, str]]:
+    def get_join_graph(self) -> JoinGraph:
+        """Graph of the foreign key links between the datasets."""
+        from pypeh.core.models.join_planner import JoinGraph
+
+        return self._memoised(
+            "join_graph", lambda: JoinGraph.from_dataset_series(self)
+        )
+
+    def plan_join_tree(
+        self,
+        base_dataset_label: str,
+        dataset_labels: list[str],
+        required_fields_by_dataset: dict[str, set[str]] | None = None,
+        cardinalities: dict[str, int] | None = None,
+    ) -> JoinTree:
+        """
+        Plan the joins that connect base_dataset_label with dataset_labels,
+        passing through intermediate datasets where needed. See
+        `pypeh.core.models.join_planner`.
+        """
+        from pypeh.core.models.join_planner import plan_join_tree
+
+        join_graph = self.get_join_graph()
+        # direct joins between the requested datasets that are not a
+        # foreign key link, e.g. two datasets referencing the same dataset
+        inferred = []
+        labels = list(dict.fromkeys([base_dataset_label, *dataset_labels]))
+        for left, right in itertools.combinations(labels, 2):
+            if right in join_graph.neighbours(left):
+                continue
+            join_spec = self.resolve_join(left, right)
+            if join_spec is not None:
+                inferred.append(join_spec)
+        if len(inferred) > 0:
+            join_graph = join_graph.copy()
+            for join_spec in inferred:
+                join_graph.add_edge(join_spec)
+
+        return plan_join_tree(
+            join_graph,
+            base_dataset_label,
+            dataset_labels,
+            required_fields_by_dataset=required_fields_by_dataset,
+            cardinalities=cardinalities,
+        )
+
+    def resolve_join_path(
+        self, left_dataset_label: str, right_dataset_label: str
+    ) -> list[JoinSpec] | None:
+        """
+        JoinSpecs, in execution order, that join right_dataset_label onto
+        left_dataset_label, or None when the datasets are not connected.
+        """
+        try:
+            join_tree = self.plan_join_tree(
+                left_dataset_label, [right_dataset_label]
+            )
+        except ValueError:
+            return None
+        return join_tree.join_specs
+
+    def resolve_all_joins(self) -> JoinSpecMapping:
+        """
+        Mapping of each pair of dataset labels to their JoinSpec. Pairs are
+        resolved on first lookup.
+        """
+        return JoinSpecMapping(self)
+
+    def _get_validation_index(self) -> Mapping[str, dict[str, str]]:
         """
         # TEMPORARY SOLUTION !!!!
         ObservablePropertyId -> dataset_label, field_label
         We currently assume that each observable_property only occurs once in the DatasetSeries
         """
+        return MappingProxyType(
+            self._memoised("validation", self._build_validation_index)
+        )
+
+    def _build_validation_index(self) -> dict[str, dict[str, str]]:
         field_ref_dict = defaultdict(dict)
         for dataset_label in self:
             dataset = self.get(dataset_label)
@@ -1022,10 +1195,20 @@ class DatasetSeries(Resource, Generic[T_DataType]):
                     element_label
                 )
 
-        return field_ref_dict
+        return dict(field_ref_dict)
 
     def get_contextual_field_reference_index(
         self,
+    ) -> Mapping[str, tuple[str, str] | None]:
+        return MappingProxyType(
+            self._memoised(
+                "contextual_field_reference",
+                self._build_contextual_field_reference_index,
+            )
+        )
+
+    def _build_contextual_field_reference_index(
+        self,
     ) -> dict[str, tuple[str, str] | None]:
         field_ref_dict = {}
         for dataset_label in self:
@@ -1105,6 +1288,7 @@ class DatasetSeries(Resource, Generic[T_DataType]):
 
     def __setitem__(self, key: str, value: Dataset) -> None:
         self.parts[key] = value
+        self._revision += 1
 
     def update(self, *args, **kwargs):
         if args:
@@ -1119,6 +1303,7 @@ class DatasetSeries(Resource, Generic[T_DataType]):
                 self.parts[key] = other[key]
         for key in kwargs:
             self.parts[key] = kwargs[key]
+        self._revision += 1
 
     def __iter__(self):
         return iter(self.parts)
@@ -0,0 +1,202 @@
+"""
+Join planning across the datasets of a DatasetSeries.
+
+`JoinGraph` holds a join edge for every pair of datasets that is linked by a
+foreign key. `plan_join_tree` connects a base dataset with a set of required
+datasets through a minimal tree of such edges, so datasets that are only
+linked through an intermediate dataset can still be joined.
+
+The tree is found with the shortest path heuristic for Steiner trees: starting
+from the base dataset, the required dataset closest to the tree is attached
+through its shortest path until all required datasets are connected. Sibling
+joins are ordered by estimated cardinality, smallest first, and every dataset
+only contributes its requested fields plus the keys of its joins.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, Mapping
+
+from pypeh.core.models.internal_data_layout import DatasetSchema, JoinSpec
+
+if TYPE_CHECKING:
+    from pypeh.core.models.internal_data_layout import DatasetSeries
+
+
+def flip_join_spec(join_spec: JoinSpec) -> JoinSpec:
+    return JoinSpec(
+        left_elements=join_spec.right_elements,
+        left_dataset=join_spec.right_dataset,
+        right_elements=join_spec.left_elements,
+        right_dataset=join_spec.left_dataset,
+    )
+
+
+@dataclass
+class JoinTree:
+    base_dataset_label: str
+    # oriented from the dataset already in the tree (left) to the dataset
+    # it attaches (right), in execution order
+    join_specs: list[JoinSpec] = field(default_factory=list)
+    required_fields_by_dataset: dict[str, set[str]] = field(
+        default_factory=dict
+    )
+
+    @property
+    def dataset_labels(self) -> list[str]:
+        return [self.base_dataset_label] + [
+            join_spec.right_dataset for join_spec in self.join_specs
+        ]
+
+
+class JoinGraph:
+    """Undirected graph of the foreign key links between datasets."""
+
+    def __init__(self) -> None:
+        # dataset label -> neighbour label -> JoinSpec oriented away from it
+        self._edges: dict[str, dict[str, JoinSpec]] = defaultdict(dict)
+
+    @classmethod
+    def from_dataset_series(cls, dataset_series: DatasetSeries) -> JoinGraph:
+        ret = cls()
+        for dataset_label, dataset in dataset_series.parts.items():
+            ret._edges.setdefault(dataset_label, {})
+            fk_pairs = DatasetSchema._collect_fk_pairs_by_dataset(
+                dataset.schema
+            )
+            for referenced_label in fk_pairs:
+                if referenced_label == dataset_label:
+                    continue
+                if referenced_label not in dataset_series.parts:
+                    continue
+                join_spec = dataset_series.resolve_join(
+                    dataset_label, referenced_label
+                )
+                if join_spec is not None:
+                    ret.add_edge(join_spec)
+        return ret
+
+    def add_edge(self, join_spec: JoinSpec) -> None:
+        left, right = join_spec.left_dataset, join_spec.right_dataset
+        # keep the first link found between two datasets
+        if right in self._edges[left]:
+            return
+        self._edges[left][right] = join_spec
+        self._edges[right][left] = flip_join_spec(join_spec)
+
+    def neighbours(self, dataset_label: str) -> Mapping[str, JoinSpec]:
+        return self._edges.get(dataset_label, {})
+
+    def copy(self) -> JoinGraph:
+        ret = JoinGraph()
+        for dataset_label, neighbours in self._edges.items():
+            ret._edges[dataset_label] = dict(neighbours)
+        return ret
+
+
+def _sort_key(
+    dataset_label: str, cardinalities: Mapping[str, int] | None
+) -> tuple:
+    cardinality = None
+    if cardinalities is not None:
+        cardinality = cardinalities.get(dataset_label)
+    # unknown cardinalities sort last
+    return (cardinality is None, cardinality or 0, dataset_label)
+
+
+def _shortest_paths(
+    join_graph: JoinGraph,
+    sources: list[str],
+    cardinalities: Mapping[str, int] | None,
+) -> tuple[dict[str, int], dict[str, JoinSpec]]:
+    """Multi-source BFS from all tree datasets over the join graph."""
+    distance = {source: 0 for source in sources}
+    reached_by: dict[str, JoinSpec] = {}
+    queue = deque(sources)
+    while queue:
+        current = queue.popleft()
+        neighbours = join_graph.neighbours(current)
+        for neighbour in sorted(
+            neighbours, key=lambda label: _sort_key(label, cardinalities)
+        ):
+            if neighbour in distance:
+                continue
+            distance[neighbour] = distance[current] + 1
+            reached_by[neighbour] = neighbours[neighbour]
+            queue.append(neighbour)
+    return distance, reached_by
+
+
+def plan_join_tree(
+    join_graph: JoinGraph,
+    base_dataset_label: str,
+    dataset_labels: Iterable[str],
+    required_fields_by_dataset: Mapping[str, set[str]] | None = None,
+    cardinalities: Mapping[str, int] | None = None,
+) -> JoinTree:
+    """
+    Connect base_dataset_label with every dataset in dataset_labels.
+
+    Raises a ValueError when a dataset cannot be reached from the base
+    dataset through foreign key links.
+    """
+    required = [
+        label
+        for label in dict.fromkeys(dataset_labels)
+        if label != base_dataset_label
+    ]
+    tree: dict[str, JoinSpec | None] = {base_dataset_label: None}
+    remaining = set(required)
+    while remaining:
+        distance, reached_by = _shortest_paths(
+            join_graph, list(tree), cardinalities
+        )
+        reachable = [label for label in remaining if label in distance]
+        if len(reachable) == 0:
+            raise ValueError(
+                f"Could not resolve join path from dataset "
+                f"'{base_dataset_label}' to "
+                f"{', '.join(repr(label) for label in sorted(remaining))}."
+            )
+        target = min(
+            reachable,
+            key=lambda label: (
+                (distance[label],) + _sort_key(label, cardinalities)
+            ),
+        )
+        # walk back to the tree, attaching the intermediate datasets
+        current = target
+        while current not in tree:
+            join_spec = reached_by[current]
+            tree[current] = join_spec
+            remaining.discard(current)
+            current = join_spec.left_dataset
+
+    children: dict[str, list[JoinSpec]] = defaultdict(list)
+    for join_spec in tree.values():
+        if join_spec is not None:
+            children[join_spec.left_dataset].append(join_spec)
+
+    ret = JoinTree(base_dataset_label=base_dataset_label)
+    queue = deque([base_dataset_label])
+    while queue:
+        current = queue.popleft()
+        for join_spec in sorted(
+            children[current],
+            key=lambda js: _sort_key(js.right_dataset, cardinalities),
+        ):
+            ret.join_specs.append(join_spec)
+            queue.append(join_spec.right_dataset)
+
+    # projection pushdown: requested fields plus join keys only
+    fields: dict[str, set[str]] = {label: set() for label in tree}
+    if required_fields_by_dataset is not None:
+        for label in tree:
+            fields[label].update(required_fields_by_dataset.get(label, ()))
+    for join_spec in ret.join_specs:
+        fields[join_spec.left_dataset].update(join_spec.left_elements)
+        fields[join_spec.right_dataset].update(join_spec.right_elements)
+    ret.required_fields_by_dataset = fields
+    return ret
@@ -1,7 +1,11 @@
+import dataclasses
+import functools
 import logging
 import pkgutil
+import typing
 
 from linkml_runtime import SchemaView
+from linkml_runtime.utils.yamlutils import YAMLRoot
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,28 @@ def get_from_entity_list_map(entity_type: str) -> str | None:
     return ENTITYLIST_MAPPING.get(entity_type, None)
 
 
+def _find_yamlroot_type(annotation) -> type | None:
+    for arg in typing.get_args(annotation):
+        if isinstance(arg, type) and issubclass(arg, YAMLRoot):
+            return arg
+        found = _find_yamlroot_type(arg)
+        if found is not None:
+            return found
+    return None
+
+
+@functools.cache
+def get_entity_list_field_types(entity_list_class: type) -> dict[str, type]:
+    """Map each EntityList slot to the linkml class it holds."""
+    type_hints = typing.get_type_hints(entity_list_class)
+    ret = {}
+    for field in dataclasses.fields(entity_list_class):
+        field_type = _find_yamlroot_type(type_hints.get(field.name))
+        if field_type is not None:
+            ret[field.name] = field_type
+    return ret
+
+
 def get_schema_view() -> SchemaView:
     schema_text = pkgutil.get_data("peh_model", "schema/peh.yaml")
     assert schema_text is not None
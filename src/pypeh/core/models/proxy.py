@@ -54,16 +54,23 @@ CLASS_REFERENCES = {
 
 
 class TypedLazyProxy:
+    _PROXY_ATTRIBUTES = frozenset(
+        {"_id", "_expected_type", "_loader", "_target", "_nested_identifiers"}
+    )
+
     def __init__(
         self,
         identifier: str,
         expected_type: Type[peh.NamedThing],
         loader: Callable | None,
+        nested_identifiers: tuple[str, ...] = (),
     ):
         self._id: str = identifier
         self._expected_type = expected_type
         self._loader = loader
         self._target = None
+        # identifiers of entities inlined in the (not yet loaded) target
+        self._nested_identifiers = nested_identifiers
 
     @property
     def id(self):
@@ -85,10 +92,23 @@ class TypedLazyProxy:
 
         return cls(entity, expected_type, loader)
 
+    @property
+    def nested_identifiers(self) -> tuple[str, ...]:
+        return self._nested_identifiers
+
+    @property
+    def has_loader(self) -> bool:
+        return self._loader is not None
+
     def set_loader(self, loader: Callable) -> bool:
         self._loader = loader
         return True
 
+    def resolve(self) -> peh.NamedThing | None:
+        """Load (if needed) and return the proxied entity."""
+        self._ensure_loaded()
+        return self._target
+
     def _ensure_loaded(self):
         if self._target is None:
             if self._loader is not None:
@@ -101,6 +121,11 @@ class TypedLazyProxy:
                     )
 
     def __getattr__(self, name):
+        # Only reached for attributes missing on the proxy itself. Never
+        # forward dunders or the proxy's own state: copy/pickle probe for
+        # those before __init__ state exists.
+        if name.startswith("__") or name in self._PROXY_ATTRIBUTES:
+            raise AttributeError(name)
         if self._loader is not None:
             self._ensure_loaded()
             return getattr(self._target, name)
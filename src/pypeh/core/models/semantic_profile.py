@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+
 from abc import abstractmethod
 from dataclasses import dataclass, field
 from rdflib import URIRef, Literal, Namespace, BNode
@@ -29,6 +31,15 @@ XSD_TYPE_MAP: dict[ObservablePropertyValueType, URIRef] = {
 }
 
 
+def _schema_bnode(*parts: str) -> BNode:
+    """
+    Blank node labelled by a hash of its position in the schema, so repeated
+    serialisations of the same dataset produce identical output.
+    """
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8"))
+    return BNode(f"b{digest.hexdigest()[:32]}")
+
+
 @dataclass(kw_only=True)
 class SemanticDatasetSchema(DatasetSchema):
     @abstractmethod
@@ -64,13 +75,13 @@ class CSVWDatasetSchema(SemanticDatasetSchema):
         s = URIRef(dataset.identifier)
 
         # TableSchema node anchored to the Dataset URI
-        schema_node = BNode()
+        schema_node = _schema_bnode(dataset.identifier, "schema")
         yield (s, CSVW.tableSchema, schema_node)
         yield (schema_node, RDF.type, CSVW.Schema)
 
         # Columns
         for label, element in self.elements.items():
-            col_node = BNode()
+            col_node = _schema_bnode(dataset.identifier, "column", label)
             yield (schema_node, CSVW.column, col_node)
             yield (col_node, RDF.type, CSVW.Column)
             yield (col_node, CSVW.name, Literal(label))
@@ -91,13 +102,15 @@ class CSVWDatasetSchema(SemanticDatasetSchema):
 
         # Primary keys — one triple per key (more SPARQL-friendly
         # than the spec's space-separated single Literal)
-        for key in self.primary_keys:
+        for key in sorted(self.primary_keys):
             yield (schema_node, CSVW.primaryKey, Literal(key))
 
         # Foreign keys
         for fk_label, fk in self.foreign_keys.items():
-            fk_node = BNode()
-            ref_node = BNode()
+            fk_node = _schema_bnode(dataset.identifier, "fk", fk_label)
+            ref_node = _schema_bnode(
+                dataset.identifier, "fk", fk_label, "reference"
+            )
             yield (schema_node, CSVW.foreignKey, fk_node)
             yield (fk_node, CSVW.columnReference, Literal(fk.element_label))
             yield (fk_node, CSVW.reference, ref_node)
@@ -240,7 +253,7 @@ class SemanticDataset(SemanticResource):
             yield (s, DCAT.inSeries, URIRef(self.part_of.identifier))
 
         # peh observation_ids — each URI points to a peh:Observation owl:namedIndividual
-        for obs_uri in self.observation_ids:
+        for obs_uri in sorted(self.observation_ids):
             yield (s, PEH.hasObservation, URIRef(obs_uri))
 
 
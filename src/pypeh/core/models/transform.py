@@ -8,7 +8,36 @@ from typing import TYPE_CHECKING
 logger = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
-    from typing import Dict, Any, Optional, Callable
+    from typing import Dict, Any, Optional, Callable, Mapping, TypeVar
+
+    import polars as pl
+
+    T_Frame = TypeVar("T_Frame", pl.DataFrame, pl.LazyFrame)
+
+
+def _expression_transformer(
+    transformer: Any,
+) -> Optional[Callable[[pl.Expr], pl.Expr]]:
+    """
+    Return the polars expression equivalent to a Python callable transformer,
+    if there is one. Unlike the row wise transform, null values stay null
+    instead of being passed to the transformer, and `str` casts booleans to
+    "true" and "false" where the row wise transform gives "True" and "False".
+    """
+    import polars as pl
+
+    expression_transformers: Dict[Any, Callable[[pl.Expr], pl.Expr]] = {
+        int: lambda expr: expr.cast(pl.Int64),
+        float: lambda expr: expr.cast(pl.Float64),
+        str: lambda expr: expr.cast(pl.String),
+        str.upper: lambda expr: expr.str.to_uppercase(),
+        str.lower: lambda expr: expr.str.to_lowercase(),
+        str.strip: lambda expr: expr.str.strip_chars(),
+    }
+    try:
+        return expression_transformers.get(transformer)
+    except TypeError:  # unhashable callable
+        return None
 
 
 class FieldMapping:
@@ -29,7 +58,8 @@ class FieldMapping:
             source_to_target: Maps source field names to target field names
             target_to_source: Reverse mapping (for writing back to source)
             default_values: Default values for target fields not in source
-            transformers: Functions to transform values (source value -> target value)
+            transformers: Functions to transform values (source value -> target value),
+                or polars expressions for the frame-level transforms
             include_unmapped_fields: Whether to include fields not in mapping
         """
         self.source_to_target = source_to_target or {}
@@ -94,3 +124,132 @@ class FieldMapping:
                 result[field] = default_value
 
         return result
+
+    def transform_frame_to_target(
+        self,
+        frame: T_Frame,
+        return_dtypes: Optional[Mapping[str, Any]] = None,
+    ) -> T_Frame:
+        """
+        Frame-level `transform_to_target`: the mapping is compiled into a
+        single projection over a polars DataFrame or LazyFrame.
+
+        Transformers can be polars expressions, which are used as is, or
+        Python callables. Callables with an equivalent expression (int,
+        float, str and the str case and strip methods) are compiled to
+        that expression, which keeps nulls and formats booleans as polars
+        does, see `_expression_transformer`. All others are applied per
+        batch with `map_batches`. For a LazyFrame these need their output
+        dtype in return_dtypes, keyed by source field.
+        """
+        return self._transform_frame(
+            frame,
+            self.source_to_target,
+            self.transformers,
+            self.include_unmapped_fields,
+            return_dtypes or {},
+        )
+
+    def transform_frame_to_source(self, frame: T_Frame) -> T_Frame:
+        return self._transform_frame(
+            frame,
+            self.target_to_source,
+            {},  # No transformers for reverse direction yet
+            self.include_unmapped_fields,
+            {},
+        )
+
+    def _compile_frame_projection(
+        self,
+        columns: list[str],
+        mapping: Dict[str, str],
+        transformers: Dict[str, Any],
+        include_unmapped: bool,
+        return_dtypes: Mapping[str, Any],
+    ) -> list[pl.Expr]:
+        """
+        Compile the mapping for a frame with the given columns into the
+        expressions of a single select, following `_transform`.
+        """
+        import polars as pl
+
+        # insertion order and overwrites follow the dict built by _transform
+        result: Dict[str, pl.Expr] = {}
+        available = set(columns)
+
+        for source_field, target_field in mapping.items():
+            if source_field not in available:
+                continue
+            expr = pl.col(source_field)
+            transformer = transformers.get(source_field)
+            if isinstance(transformer, pl.Expr):
+                expr = transformer
+            elif _expression_transformer(transformer) is not None:
+                expr = _expression_transformer(transformer)(expr)
+            elif transformer is not None:
+                expr = expr.map_batches(
+                    _batched(transformer),
+                    return_dtype=return_dtypes.get(source_field),
+                )
+            result[target_field] = expr.alias(target_field)
+
+        if include_unmapped:
+            for field in columns:
+                if field not in mapping:
+                    result[field] = pl.col(field)
+
+        # repeated to the frame height, a bare literal gives a single row
+        # when none of the source columns are selected
+        for field, default_value in self.default_values.items():
+            if field not in result:
+                result[field] = pl.repeat(default_value, pl.len()).alias(field)
+
+        return list(result.values())
+
+    def _transform_frame(
+        self,
+        frame: T_Frame,
+        mapping: Dict[str, str],
+        transformers: Dict[str, Any],
+        include_unmapped: bool,
+        return_dtypes: Mapping[str, Any],
+    ) -> T_Frame:
+        import polars as pl
+
+        if isinstance(frame, pl.LazyFrame):
+            columns = frame.collect_schema().names()
+            for source_field, transformer in transformers.items():
+                if (
+                    source_field in mapping
+                    and source_field in columns
+                    and not isinstance(transformer, pl.Expr)
+                    and _expression_transformer(transformer) is None
+                    and source_field not in return_dtypes
+                ):
+                    raise ValueError(
+                        f"Transformer for field {source_field} is a Python "
+                        "callable: its return dtype is required to "
+                        "transform a LazyFrame."
+                    )
+        else:
+            columns = frame.columns
+        return frame.select(
+            self._compile_frame_projection(
+                columns, mapping, transformers, include_unmapped, return_dtypes
+            )
+        )
+
+
+def _batched(transformer: Callable) -> Callable[[pl.Series], pl.Series]:
+    """Apply a per value transformer to a whole Series at once."""
+
+    def _apply(series: pl.Series) -> pl.Series:
+        import polars as pl
+
+        return pl.Series(
+            series.name,
+            [transformer(value) for value in series.to_list()],
+            strict=False,
+        )
+
+    return _apply
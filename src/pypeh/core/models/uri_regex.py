@@ -324,38 +324,53 @@ safe_CURIE = rf"""(?P<safe_CURIE>
 #
 ### Compile the regular expressions for better performance
 
-uri_validator = re.compile(f"^{URI}$", re.VERBOSE)
-
-# uri_ref_validator = re.compile(f"^{URI_reference}$", re.VERBOSE)
-
-uri_relative_ref_validator = re.compile(f"^{relative_ref}$", re.VERBOSE)
-
-abs_uri_validator = re.compile(f"^{absolute_URI}$", re.VERBOSE)
-
-curie_validator = re.compile(f"^{CURIE}$", re.VERBOSE)
-
-safe_curie_validator = re.compile(f"^{safe_CURIE}$", re.VERBOSE)
-
-url_validator = re.compile(
-    r"^(?:http|ftp|https):\/\/"  # Scheme
-    r"(?:\S+(?::\S*)?@)?"  # User and password
-    r"(?:"  # IP address exclusion
-    r"(?!(?:10|127)(?:\.\d{1,3}){3})"
-    r"(?!(?:169\.254|192\.168)(?:\.\d{1,3}){2})"
-    r"(?!172\.(?:1[6-9]|2\d|3[0-1])(?:\.\d{1,3}){2})"
-    r"(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])"
-    r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}"
-    r"(?:\.(?:[0-9]\d?|1\d\d|2[0-4]\d|25[0-4]))"
-    r"|"
-    r"(?:(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,})"
-    r")"
-    r"(?::\d{2,5})?"  # Port
-    r"(?:[^\s]*)?"  # Path
-    r"$"
-)
-
-# Define the regular expressions for CURIE and relative paths
-relative_path_pattern = re.compile(r"^(?:\./|\.\./|[^/]+/)*[^/]*$")
+# The VERBOSE patterns above take a noticeable time to compile, so each
+# validator is compiled on first access through the module `__getattr__`.
+_VALIDATOR_PATTERNS: dict[str, tuple[str, int]] = {
+    "uri_validator": (f"^{URI}$", re.VERBOSE),
+    # "uri_ref_validator": (f"^{URI_reference}$", re.VERBOSE),
+    "uri_relative_ref_validator": (f"^{relative_ref}$", re.VERBOSE),
+    "abs_uri_validator": (f"^{absolute_URI}$", re.VERBOSE),
+    "curie_validator": (f"^{CURIE}$", re.VERBOSE),
+    "safe_curie_validator": (f"^{safe_CURIE}$", re.VERBOSE),
+    "url_validator": (
+        r"^(?:http|ftp|https):\/\/"  # Scheme
+        r"(?:\S+(?::\S*)?@)?"  # User and password
+        r"(?:"  # IP address exclusion
+        r"(?!(?:10|127)(?:\.\d{1,3}){3})"
+        r"(?!(?:169\.254|192\.168)(?:\.\d{1,3}){2})"
+        r"(?!172\.(?:1[6-9]|2\d|3[0-1])(?:\.\d{1,3}){2})"
+        r"(?:[1-9]\d?|1\d\d|2[01]\d|22[0-3])"
+        r"(?:\.(?:1?\d{1,2}|2[0-4]\d|25[0-5])){2}"
+        r"(?:\.(?:[0-9]\d?|1\d\d|2[0-4]\d|25[0-4]))"
+        r"|"
+        r"(?:(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,})"
+        r")"
+        r"(?::\d{2,5})?"  # Port
+        r"(?:[^\s]*)?"  # Path
+        r"$",
+        0,
+    ),
+    # Define the regular expressions for CURIE and relative paths
+    "relative_path_pattern": (r"^(?:\./|\.\./|[^/]+/)*[^/]*$", 0),
+}
+
+
+def __getattr__(name: str) -> re.Pattern:
+    try:
+        pattern, flags = _VALIDATOR_PATTERNS[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    compiled = re.compile(pattern, flags)
+    globals()[name] = compiled
+    return compiled
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_VALIDATOR_PATTERNS))
+
 
 # Pattern for PID strings
 PID_PATTERN = r"^([0-9,A-Z,a-z])+(\.[0-9,A-Z,a-z]+)*\/([!-~])+$"
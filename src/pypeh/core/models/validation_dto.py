@@ -6,7 +6,7 @@ import re
 from collections import defaultdict
 from enum import Enum
 from pydantic import BaseModel, field_validator
-from typing import Generic, Any, Sequence, TYPE_CHECKING
+from typing import Generic, Any, Sequence
 from ulid import ULID
 
 from pypeh.core.models.typing import T_DataType
@@ -14,12 +14,12 @@ from pypeh.core.models.constants import (
     ObservablePropertyValueType,
     ValidationErrorLevel,
 )
-from peh_model import pydanticmodel_v2 as pehs
 from peh_model import peh
 
-
-if TYPE_CHECKING:
-    pass
+# the pydantic peh model (pydanticmodel_v2) is slow to import, it is only
+# imported where ValidationExpressions are constructed. `from_peh` accepts
+# its instances as well, but only the peh model is annotated so the hints
+# resolve at runtime.
 
 logger = logging.getLogger(__name__)
 
@@ -121,7 +121,7 @@ class ValidationExpression(BaseModel):
     @classmethod
     def from_peh(
         cls,
-        expression: peh.ValidationExpression | pehs.ValidationExpression,
+        expression: peh.ValidationExpression,
         type_annotations: dict[str, dict[str, ObservablePropertyValueType]]
         | None = None,
         dataset_label: str | None = None,
@@ -244,7 +244,7 @@ class ValidationDesign(BaseModel):
     @classmethod
     def from_peh(
         cls,
-        validation_design: peh.ValidationDesign | pehs.ValidationDesign,
+        validation_design: peh.ValidationDesign,
         type_annotations: dict[str, dict[str, ObservablePropertyValueType]],
         dataset_label: str | None = None,
     ) -> "ValidationDesign":
@@ -292,6 +292,8 @@ class ValidationDesign(BaseModel):
         dataset_label: str | None = None,
         skip_fields: set[str] | None = None,
     ) -> list["ValidationDesign"]:
+        from peh_model import pydanticmodel_v2 as pehs
+
         name_expression_list = []
         if skip_fields is None:
             skip_fields = set()
@@ -408,6 +410,8 @@ class ValidationDesign(BaseModel):
         type_annotations: dict[str, dict[str, ObservablePropertyValueType]],
         dataset_label: str | None = None,
     ) -> list["ValidationDesign"]:
+        from peh_model import pydanticmodel_v2 as pehs
+
         name_expression_list = []
 
         if min_value is not None:
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import logging
+import threading
+import time
 
+from collections import deque
 from contextlib import AbstractContextManager, contextmanager
 from typing import TYPE_CHECKING, Iterator
 
@@ -20,10 +23,110 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_POOL_SIZE = 4
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+
+class ConnectionPool:
+    """
+    Idle adapters for one connection setting.
+
+    Adapters are checked out exclusively, so a pooled adapter is never shared
+    between two callers. Adapters whose caller raised are discarded rather
+    than released. On checkout, adapters that were idle for longer than
+    idle_timeout or that fail `HostAdapter.is_alive` are closed and dropped.
+    At most pool_size idle adapters are kept; surplus adapters are closed on
+    release.
+    """
+
+    def __init__(
+        self,
+        settings: pydantic_settings.BaseSettings,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.settings = settings
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._idle: deque[tuple[HostAdapter, float]] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    def _is_expired(self, released_at: float, now: float) -> bool:
+        if self.idle_timeout is None:
+            return False
+        return now - released_at > self.idle_timeout
+
+    @staticmethod
+    def _close(adapter: HostAdapter) -> None:
+        try:
+            adapter.close()
+        except Exception:
+            logger.exception("Failed to close pooled connection")
+
+    def acquire(self) -> HostAdapter:
+        now = time.monotonic()
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                # most recently released first: it is the warmest
+                adapter, released_at = self._idle.pop()
+            if self._is_expired(released_at, now) or not adapter.is_alive():
+                self._close(adapter)
+                continue
+            return adapter
+        return ConnectionManager._create_adapter(self.settings).connect()
+
+    def release(self, adapter: HostAdapter) -> None:
+        if adapter.is_alive():
+            with self._lock:
+                if len(self._idle) < self.pool_size:
+                    self._idle.append((adapter, time.monotonic()))
+                    return
+        self._close(adapter)
+
+    def discard(self, adapter: HostAdapter) -> None:
+        """Close a checked out adapter instead of returning it to the pool."""
+        self._close(adapter)
+
+    def close(self) -> None:
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for adapter, _ in idle:
+            self._close(adapter)
+
+
 class ConnectionManager:
-    def __init__(self, config: settingsmodels.ValidatedImportConfig):
+    def __init__(
+        self,
+        config: settingsmodels.ValidatedImportConfig,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
+    ):
+        """
+        Args:
+            config (ValidatedImportConfig): connection settings and import map.
+            pool_size (int): number of idle connections kept per connection
+                label for reuse. 0 disables pooling: every `get_connection`
+                call then creates and closes its own adapter.
+            idle_timeout (float | None): seconds after which an idle pooled
+                connection is discarded instead of reused. None keeps idle
+                connections until `close_all`.
+
+        Each connection label gets its own pool on first use, which copies
+        pool_size and idle_timeout. Changing the attributes afterwards only
+        applies to pools created later, e.g. after `close_all`.
+        """
         self._config = config
         self._import_map = config.import_map
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._pools: dict[int, ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
 
     def _register_connection_label(
         self, connection_label: str, settings: pydantic_settings.BaseSettings
@@ -76,8 +179,47 @@ class ConnectionManager:
                 f"No settings found for connection '{connection_label or namespace}'"
             )
 
-        adapter = self._create_adapter(settings, **kwargs).connect()
+        # adapter kwargs make the connection unique, so it cannot be shared
+        if kwargs or self.pool_size <= 0:
+            adapter = self._create_adapter(settings, **kwargs).connect()
+            try:
+                yield adapter
+            finally:
+                adapter.close()
+            return
+
+        pool = self._get_pool(settings)
+        adapter = pool.acquire()
         try:
             yield adapter
-        finally:
-            adapter.close()
+        except BaseException:
+            # the adapter may be left in a broken state, do not reuse it
+            pool.discard(adapter)
+            raise
+        pool.release(adapter)
+
+    def _get_pool(
+        self, settings: pydantic_settings.BaseSettings
+    ) -> ConnectionPool:
+        # settings objects are not hashable; the pool holds a reference to
+        # its settings, so the id cannot be reused while the pool exists
+        with self._pools_lock:
+            pool = self._pools.get(id(settings))
+            if pool is None:
+                pool = ConnectionPool(
+                    settings,
+                    pool_size=self.pool_size,
+                    idle_timeout=self.idle_timeout,
+                )
+                self._pools[id(settings)] = pool
+            return pool
+
+    def close_all(self) -> None:
+        """
+        Close all idle pooled connections.
+        """
+        with self._pools_lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.close()
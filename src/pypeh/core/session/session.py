@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import os
+import functools
 import importlib
 import logging
 import peh_model.peh as peh
 
 from typing import (
     Any,
+    Callable,
     TYPE_CHECKING,
     TypeVar,
     Sequence,
@@ -43,12 +45,30 @@ from pypeh.core.interfaces.dataops import (
     DataEnrichmentInterface,
     ValidationInterface,
 )
+from pypeh.adapters.persistence.dataset_ipc import (
+    dump_dataset_series_to_ipc_filesystem,
+    load_dataset_series_from_ipc_filesystem,
+)
 from pypeh.adapters.persistence.dataset_parquet import (
     dump_dataset_series_to_parquet_filesystem,
     load_dataset_series_from_parquet_filesystem,
 )
-from pypeh.core.session.connections import ConnectionManager
+from pypeh.adapters.persistence.entity_index import EntityIndex
+from pypeh.adapters.persistence.hosts import FileIO
+from pypeh.core.session.connections import (
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    ConnectionManager,
+)
 from pypeh.core.utils.namespaces import NamespaceManager
+from pypeh.core.utils.execution import (
+    ExecutionEngine,
+    ExecutionSettings,
+    execution_settings,
+    parse_byte_size,
+)
+from pypeh.core.utils.profiling import current_span, profile, traced
+from pypeh.core.utils.query_plans import explain
 from pypeh.core.utils.resolve_identifiers import is_url
 
 logger = logging.getLogger(__name__)
@@ -59,10 +79,23 @@ if TYPE_CHECKING:
     from typing import Sequence
 
 T_AdapterType = TypeVar("T_AdapterType")
+T_Callable = TypeVar("T_Callable", bound=Callable[..., Any])
+
+
+def _with_execution_settings(fn: T_Callable) -> T_Callable:
+    """Run a Session method that calls adapters with the Session settings."""
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        with execution_settings(self.execution_settings):
+            return fn(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
 
 
 class Session(Generic[T_AdapterType, T_DataType]):
     _adapter_mapping: dict[str, T_AdapterType] = dict()
+    _TABULAR_SERIES_FORMATS = frozenset({"parquet", "ipc"})
 
     def __init__(
         self,
@@ -73,6 +106,12 @@ class Session(Generic[T_AdapterType, T_DataType]):
         default_connection: str | ConnectionConfig | None = None,
         env_file: str | None = None,
         load_from_default_connection: str | None = None,
+        cache_container: str | None = None,
+        memory_budget: int | str | None = None,
+        spill_directory: str | None = None,
+        engine: ExecutionEngine = "auto",
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float | None = DEFAULT_IDLE_TIMEOUT,
     ):
         """
         Initializes a new pypeh Session.
@@ -88,12 +127,35 @@ class Session(Generic[T_AdapterType, T_DataType]):
                     - A ConnectionConfig instance to directly generate BaseSettings.
             load_from_default_connection: (str | None = None):
                 Optional. Source to load from default connection on init.
+            cache_container: (str | None = None):
+                Optional. Name of the CacheContainer type to use, e.g. "mapping"
+                or "indexed". Defaults to the factory default container.
+            memory_budget: (int | str | None = None):
+                Optional. Working set size in bytes, or e.g. "8GB", above which
+                enrich and aggregate spill intermediate datasets to disk and
+                use streaming collection.
+            spill_directory: (str | None = None):
+                Optional. Directory for the spill files, defaults to the
+                system temporary directory.
+            engine: (str = "auto"):
+                Optional. How the data operations of the session collect
+                their results: "in-memory", "streaming", or "auto" to stream
+                only when the memory_budget is exceeded.
+            pool_size: (int = 4):
+                Optional. Number of idle connections kept per connection
+                label for reuse, 0 disables pooling.
+            idle_timeout: (float | None = 300.0):
+                Optional. Seconds after which an idle pooled connection is
+                discarded, None keeps idle connections until the session is
+                closed.
         """
         connection_map, default_connection = self._normalize_configs(
             connection_config, default_connection
         )
         self.connection_manager: ConnectionManager = ConnectionManager(
-            ValidatedImportConfig()
+            ValidatedImportConfig(),
+            pool_size=pool_size,
+            idle_timeout=idle_timeout,
         )
         validated_default_connection: BaseSettings | None = (
             self._init_default_connection(default_connection, env_file)
@@ -102,16 +164,33 @@ class Session(Generic[T_AdapterType, T_DataType]):
             import_config = ImportConfig(
                 connection_map=connection_map
             ).to_validated_import_config(_env_file=env_file)
-            self.connection_manager = ConnectionManager(import_config)
+            self.connection_manager = ConnectionManager(
+                import_config, pool_size=pool_size, idle_timeout=idle_timeout
+            )
 
         if validated_default_connection is not None:
             self.connection_manager._register_connection_label(
                 DEFAULT_CONNECTION_LABEL, validated_default_connection
             )
-        self.cache: CacheContainer = CacheContainerFactory.new()
+        self.cache: CacheContainer = CacheContainerFactory.new(
+            cache_container
+        )
+        # connection_label -> identifier index, built on first use
+        self._entity_indexes: dict[str, EntityIndex] = {}
+        # keep entity indexes as sidecar files on their connections
+        self.persist_entity_indexes: bool = False
         if load_from_default_connection is not None:
             _ = self.load_persisted_cache(source=load_from_default_connection)
         self.namespace_manager: NamespaceManager | None = None
+        self.execution_settings = ExecutionSettings(
+            memory_budget=(
+                None
+                if memory_budget is None
+                else parse_byte_size(memory_budget)
+            ),
+            spill_directory=spill_directory,
+            engine=engine,
+        )
 
     def _normalize_configs(
         self,
@@ -246,12 +325,23 @@ class Session(Generic[T_AdapterType, T_DataType]):
 
         return True
 
+    @traced()
     def load_persisted_cache(
-        self, source: str | None = None, connection_label: str | None = None
+        self,
+        source: str | None = None,
+        connection_label: str | None = None,
+        max_workers: int | None = None,
+        trusted: bool = False,
     ):
         """Load all resources from either the default cache persistence location or from the provided
         connection into cache. The provided connection_label takes precedence over the default.
         Currently all resources should still be represented as yaml files.
+
+        Entities are unpacked into the cache file by file as they are loaded.
+        Set `max_workers` to parse the yaml files of a directory in parallel
+        worker processes. Set `trusted=True` for sources that are known to be
+        valid: entities are then cached as lazy proxies and only validated
+        into linkml dataclasses when first retrieved from the cache.
         """
         # get host/connection
         # TODO: fix host calls with unified ConnectionManager
@@ -268,11 +358,21 @@ class Session(Generic[T_AdapterType, T_DataType]):
         with self.connection_manager.get_connection(
             connection_label=connection_label
         ) as connection:
-            roots = connection.load(source, format="yaml")
+            load_options = {"trusted": True} if trusted else {}
+            iter_load = getattr(connection, "iter_load", None)
+            if iter_load is None:
+                roots = connection.load(source, format="yaml", **load_options)
+                ret = self._source_to_cache(roots)
+                assert ret
+                return
 
-        ret = self._source_to_cache(roots)
-        assert ret
+            for root in iter_load(
+                source, format="yaml", max_workers=max_workers, **load_options
+            ):
+                ret = self.cache.unpack_entity_list(root)
+                assert ret
 
+    @traced()
     def dump_cache(
         self,
         output_path: str,
@@ -285,6 +385,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
             "turtle",
             "trig",
             "yaml",
+            "snapshot",
         }  # TEMPORARY FIX
         assert (
             file_format in supported_dump_formats
@@ -308,7 +409,10 @@ class Session(Generic[T_AdapterType, T_DataType]):
             )
             connection_label = DEFAULT_CONNECTION_LABEL
 
-        root = to_serialize.pack_entity_list()
+        if file_format == "snapshot":
+            root = to_serialize
+        else:
+            root = to_serialize.pack_entity_list()
         with self.connection_manager.get_connection(
             connection_label=connection_label
         ) as connection:
@@ -316,6 +420,64 @@ class Session(Generic[T_AdapterType, T_DataType]):
                 root, destination=output_path, format=file_format
             )
 
+    @traced()
+    def load_cache_snapshot(
+        self,
+        source: str,
+        connection_label: str | None = None,
+        verify: bool = True,
+    ) -> None:
+        """
+        Load a binary cache snapshot written by
+        `dump_cache(..., file_format="snapshot")` into the session cache.
+        Snapshots are pickles, only load them from trusted locations.
+        """
+        if connection_label is None:
+            connection_label = DEFAULT_CONNECTION_LABEL
+        with self.connection_manager.get_connection(
+            connection_label=connection_label
+        ) as connection:
+            connection.load(
+                source,
+                format="snapshot",
+                container=self.cache,
+                verify=verify,
+            )
+
+    @traced()
+    def open_cache_snapshot(
+        self,
+        source: str,
+        connection_label: str | None = None,
+        verify: bool = True,
+    ) -> None:
+        """
+        Use a memory-mapped cache snapshot as the session cache.
+
+        Entities are unpickled on first access, and every process that opens
+        the same snapshot shares one copy of the file. Entities already in the
+        cache are kept in the in-memory overlay of the new container. The
+        snapshot must be a file on a local connection.
+        """
+        from pypeh.core.cache.snapshot import SnapshotContainer
+
+        if connection_label is None:
+            connection_label = DEFAULT_CONNECTION_LABEL
+        with self.connection_manager.get_connection(
+            connection_label=connection_label
+        ) as connection:
+            if getattr(connection, "protocol", None) != "file":
+                raise ValueError(
+                    "Shared cache snapshots require a local file connection."
+                )
+            path = self._connection_path(connection, source)
+        container = SnapshotContainer(path, verify=verify)
+        for entity in self.cache.get_all():
+            container.add(entity)
+        self.cache = container
+
+    @traced()
+    @_with_execution_settings
     def import_tabular_dataset_series(
         self,
         source: str,
@@ -327,6 +489,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
         schema_error_policy: Literal["raise", "report"] = "raise",
         namespace_key: str | None = None,
     ) -> DatasetSeries[DataFrame] | ValidationErrorReportCollection:
+        current_span().set_attribute("source", source)
         cache_view = CacheContainerView(self.cache)
         assert isinstance(data_import_config, peh.DataImportConfig)
         id_factory = None
@@ -409,6 +572,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
 
         return dataset_series
 
+    @traced()
     def load_tabular_dataset_series(
         self,
         source: str,
@@ -446,27 +610,36 @@ class Session(Generic[T_AdapterType, T_DataType]):
         file_system = getattr(connection, "file_system", None)
         if file_system is None:
             raise NotImplementedError(
-                "DatasetSeries parquet persistence requires a filesystem-backed "
+                "DatasetSeries file persistence requires a filesystem-backed "
                 "connection."
             )
         return file_system
 
+    @traced()
+    @_with_execution_settings
     def dump_tabular_dataset_series(
         self,
         dataset_series: DatasetSeries[DataFrame],
         output_path: str,
-        file_format: Literal["parquet"] = "parquet",
+        file_format: Literal["parquet", "ipc"] = "parquet",
         connection_label: str | None = None,
     ) -> list[str]:
         """
-        Dump a DatasetSeries as one pypeh semantic parquet file per Dataset.
+        Dump a DatasetSeries as one pypeh semantic file per Dataset.
+
+        `file_format="parquet"` writes compressed parquet files for exchange
+        and archival. `file_format="ipc"` writes uncompressed Arrow IPC files
+        that can be memory mapped on read, which suits intermediate results
+        shared between pipeline stages on the same host.
         """
-        if file_format != "parquet":
+        if file_format not in self._TABULAR_SERIES_FORMATS:
             raise NotImplementedError(
                 "Session.dump_tabular_dataset_series currently only supports "
-                f"file_format='parquet'. Got {file_format!r}."
+                "file_format='parquet' or file_format='ipc'. "
+                f"Got {file_format!r}."
             )
 
+        current_span().record_data(dataset_series)
         if connection_label is None:
             connection_label = DEFAULT_CONNECTION_LABEL
 
@@ -475,32 +648,44 @@ class Session(Generic[T_AdapterType, T_DataType]):
         ) as connection:
             destination = self._connection_path(connection, output_path)
             file_system = self._connection_file_system(connection)
+            if file_format == "ipc":
+                return dump_dataset_series_to_ipc_filesystem(
+                    dataset_series,
+                    file_system,
+                    destination,
+                )
             return dump_dataset_series_to_parquet_filesystem(
                 dataset_series,
                 file_system,
                 destination,
             )
 
+    @traced()
+    @_with_execution_settings
     def read_tabular_dataset_series(
         self,
         source_paths: Sequence[str],
-        file_format: Literal["parquet"] = "parquet",
+        file_format: Literal["parquet", "ipc"] = "parquet",
         connection_label: str | None = None,
         validate_foreign_keys: bool = True,
     ) -> DatasetSeries[DataFrame]:
         """
         Read a persisted DatasetSeries from files previously written by pypeh.
+
+        Arrow IPC files on a local connection are memory mapped, so the
+        returned frames are backed by the mapped files rather than by copies.
         """
-        if file_format != "parquet":
+        if file_format not in self._TABULAR_SERIES_FORMATS:
             raise NotImplementedError(
                 "Session.read_tabular_dataset_series currently only supports "
-                f"file_format='parquet'. Got {file_format!r}."
+                "file_format='parquet' or file_format='ipc'. "
+                f"Got {file_format!r}."
             )
 
         if isinstance(source_paths, str):
             raise TypeError(
                 "Session.read_tabular_dataset_series expects source_paths to "
-                "be a sequence of parquet file paths, not a single path."
+                f"be a sequence of {file_format} file paths, not a single path."
             )
 
         if connection_label is None:
@@ -514,6 +699,12 @@ class Session(Generic[T_AdapterType, T_DataType]):
                 for source_path in source_paths
             ]
             file_system = self._connection_file_system(connection)
+            if file_format == "ipc":
+                return load_dataset_series_from_ipc_filesystem(
+                    file_system,
+                    normalized_source_paths,
+                    validate_foreign_keys=validate_foreign_keys,
+                )
             return load_dataset_series_from_parquet_filesystem(
                 file_system,
                 normalized_source_paths,
@@ -532,14 +723,151 @@ class Session(Generic[T_AdapterType, T_DataType]):
 
         return ret
 
+    def lazy_resource(
+        self, resource_identifier: str, resource_type: str
+    ) -> TypedLazyProxy:
+        """
+        Return a proxy that loads the resource through `load_resource` on
+        first attribute access.
+        """
+        return TypedLazyProxy(
+            resource_identifier,
+            getattr(peh, resource_type),
+            loader=functools.partial(
+                self.load_resource, resource_identifier, resource_type
+            ),
+        )
+
+    @traced()
     def resolve_typed_lazy_proxy(
         self, proxy: TypedLazyProxy
     ) -> peh.NamedThing:
-        raise NotImplementedError(
-            "Session.resolve_typed_lazy_proxy is not implemented yet. "
-            f"proxy={proxy!r}."
+        """
+        Load the entity behind proxy. Proxies without a loader are resolved
+        through `load_resource`, which locates the connection for the
+        identifier's namespace in the ImportMap.
+        """
+        if not proxy.has_loader:
+            proxy.set_loader(
+                functools.partial(
+                    self.load_resource,
+                    proxy.id,
+                    proxy.expected_type.__name__,
+                )
+            )
+        ret = proxy.resolve()
+        if ret is None:
+            raise LookupError(
+                f"Could not resolve {proxy.expected_type.__name__} "
+                f"{proxy.id!r} from any configured connection."
+            )
+        return ret
+
+    def _connection_label_for(self, resource_identifier: str) -> str:
+        import_map = self.connection_manager._import_map
+        connection_label = None
+        if import_map is not None:
+            connection_label = import_map.get(resource_identifier)
+        if connection_label is None:
+            raise ValueError(
+                "No connection_label given and no connection configured for "
+                f"the namespace of {resource_identifier!r}. Add the "
+                "namespace to a ConnectionConfig."
+            )
+        return connection_label
+
+    @traced()
+    def get_entity_index(
+        self,
+        connection_label: str,
+        rebuild: bool = False,
+        persist: bool | None = None,
+    ) -> EntityIndex:
+        """
+        Return the identifier -> file index of a filesystem connection.
+        The index is built once per connection and reused afterwards.
+
+        With persist (default: `persist_entity_indexes`), the index is read
+        from and written back to a sidecar file at the connection root, so
+        later sessions only re-parse files that changed.
+        """
+        with self.connection_manager.get_connection(
+            connection_label=connection_label
+        ) as connection:
+            return self._entity_index_for(
+                connection_label, connection, rebuild=rebuild, persist=persist
+            )
+
+    def _entity_index_for(
+        self,
+        connection_label: str,
+        connection,
+        rebuild: bool = False,
+        persist: bool | None = None,
+    ) -> EntityIndex:
+        index = self._entity_indexes.get(connection_label)
+        if index is not None and not rebuild:
+            return index
+        if not hasattr(connection, "iter_files"):
+            raise TypeError(
+                "Entity indexes require a filesystem-backed connection."
+            )
+        if persist is None:
+            persist = self.persist_entity_indexes
+
+        index = None
+        if persist and not rebuild:
+            index = EntityIndex.load(connection)
+        if index is None:
+            index = EntityIndex()
+        if index.refresh(connection) and persist:
+            index.save(connection)
+        self._entity_indexes[connection_label] = index
+        return index
+
+    def _load_indexed_resource(
+        self,
+        connection_label: str,
+        connection,
+        resource_identifier: str,
+        resource_type: str,
+    ) -> bool:
+        index = self._entity_index_for(connection_label, connection)
+        location = index.locate(
+            resource_identifier, resource_type
+        ) or index.locate(resource_identifier)
+        if location is None and index.refresh(connection):
+            # the repository changed since the index was built
+            if self.persist_entity_indexes:
+                index.save(connection)
+            location = index.locate(
+                resource_identifier, resource_type
+            ) or index.locate(resource_identifier)
+        if location is None:
+            logger.debug(
+                f"No file in {connection_label} defines {resource_identifier}"
+            )
+            return False
+
+        item = index.read_entity(
+            connection.file_system, resource_identifier, location.entity_type
         )
+        if item is not None and location.entity_type is not None:
+            logger.debug(f"Parsed {resource_identifier} from {location.path}")
+            entity = getattr(peh, location.entity_type)(**item)
+            return self.cache.unpack_entity_list(entity)
+
+        # nested entity, or a node that cannot be parsed on its own
+        location = index.locate(resource_identifier)
+        if location is None:
+            return False
+        logger.debug(f"Loading {resource_identifier} from {location.path}")
+        roots = FileIO(file_system=connection.file_system).load(
+            location.path, format="yaml", trusted=True
+        )
+        return self._source_to_cache(roots)
 
+    @traced()
     def load_resource(
         self,
         resource_identifier: str,
@@ -547,50 +875,52 @@ class Session(Generic[T_AdapterType, T_DataType]):
         resource_path: str | None = None,
         connection_label: str | None = None,
     ) -> T_NamedThingLike | None:
-        """Load resource into cache. First checks the cache,
-        then configured persisted cache, and finally the `ImportConfig`"""
+        """Load resource into cache. First checks the cache, then the given
+        connection, or the connection the `ImportConfig` maps the resource
+        namespace to.
+
+        Without resource_path, the resource is located through the
+        connection's entity index (see `get_entity_index`) and only its own
+        YAML node is parsed, or the file that defines it for entities
+        inlined in another entity. Returns None when no file defines it."""
         # cache
         ret = self.get_resource(resource_identifier, resource_type)
         if ret is not None:
             return ret
 
-        if connection_label is not None:
-            with self.connection_manager.get_connection(
-                connection_label=connection_label
-            ) as connection:
-                # assuming connection points to a file-based system
-                # loading entire directory
-                logger.debug(
-                    f"Loading .yaml files recursively from {connection_label} root directory"
-                )
-                if resource_path is None:
-                    resource_path = ""
-                    roots = connection.load(resource_path, format="yaml")
-                else:
-                    roots = connection.load(resource_path)
+        if connection_label is None:
+            connection_label = self._connection_label_for(resource_identifier)
+
+        with self.connection_manager.get_connection(
+            connection_label=connection_label
+        ) as connection:
+            if resource_path is not None:
+                roots = connection.load(resource_path)
                 ret = self._source_to_cache(roots)
                 assert ret
-
-            # resource should have been loaded into cache
-            ret = self.get_resource(resource_identifier, resource_type)
-            type_to_cast = getattr(peh, resource_type)
-            assert isinstance(ret, type_to_cast)
-        else:
-            # TODO: use linked data approach
-            raise NotImplementedError(
-                "Session.load_resource without connection_label is not "
-                "implemented yet (linked data fallback). "
-                f"resource_identifier={resource_identifier!r}, "
-                f"resource_type={resource_type!r}."
-            )
+            elif not self._load_indexed_resource(
+                connection_label,
+                connection,
+                resource_identifier,
+                resource_type,
+            ):
+                return None
+
+        # resource should have been loaded into cache
+        ret = self.get_resource(resource_identifier, resource_type)
+        type_to_cast = getattr(peh, resource_type)
+        assert isinstance(ret, type_to_cast)
 
         return ret
 
+    @traced()
     def dump_resource(
         self, resource_identifier: str, resource_type: str, version: str | None
     ) -> bool:
         return True
 
+    @traced()
+    @_with_execution_settings
     def validate_tabular_dataset(
         self,
         data: Dataset[DataFrame],
@@ -598,6 +928,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
         allow_incomplete: bool = False,
     ) -> ValidationErrorReport:
         assert data.data is not None, f"No data associated with {data.label}"
+        current_span().record_data(data)
         cache_view = CacheContainerView(self.cache)
         validation_adapter = self.get_adapter("validation")
         assert isinstance(validation_adapter, ValidationInterface)
@@ -608,11 +939,14 @@ class Session(Generic[T_AdapterType, T_DataType]):
             allow_incomplete=allow_incomplete,
         )
 
+    @traced()
+    @_with_execution_settings
     def validate_tabular_dataset_series(
         self,
         dataset_series: DatasetSeries[DataFrame],
         allow_incomplete: bool = False,
     ) -> ValidationErrorReportCollection:
+        current_span().record_data(dataset_series)
         validation_result_dict = ValidationErrorReportCollection()
         for dataset_label in dataset_series:
             dataset = dataset_series[dataset_label]
@@ -636,6 +970,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
 
         return validation_result_dict
 
+    @traced()
     def build_validation_config(
         self,
         data_layout: peh.DataLayout,
@@ -682,7 +1017,9 @@ class Session(Generic[T_AdapterType, T_DataType]):
                 observation_id, "DerivedObservation"
             )
             if isinstance(target_observation, peh.DerivedObservation):
-                source_observation_id = target_observation.was_derived_from
+                source_observation_id = self.cache.get_derived_from_id(
+                    observation_id
+                )
                 assert isinstance(source_observation_id, str)
                 source_observation = self.cache.get(
                     source_observation_id, "Observation"
@@ -691,6 +1028,8 @@ class Session(Generic[T_AdapterType, T_DataType]):
 
                 yield (target_observation, source_observation)
 
+    @traced()
+    @_with_execution_settings
     def enrich(
         self,
         source_dataset_series: DatasetSeries,
@@ -714,6 +1053,8 @@ class Session(Generic[T_AdapterType, T_DataType]):
             cache_view=CacheContainerView(self.cache),
         )
 
+    @traced()
+    @_with_execution_settings
     def aggregate(
         self,
         source_dataset_series: DatasetSeries,
@@ -740,6 +1081,7 @@ class Session(Generic[T_AdapterType, T_DataType]):
     def bind_namespace_manager(self, namespace_manager: NamespaceManager):
         self.namespace_manager = namespace_manager
 
+    @traced()
     def mint_and_cache(
         self,
         resource_cls: type[T_NamedThingLike],
@@ -761,3 +1103,37 @@ class Session(Generic[T_AdapterType, T_DataType]):
         assert isinstance(resource, peh.NamedThing)
         self.cache.add(resource)
         return resource
+
+    def close(self) -> None:
+        """
+        Close the connections the session keeps pooled for reuse.
+        """
+        self.connection_manager.close_all()
+
+    @staticmethod
+    def profile():
+        """
+        Collect timing spans of the Session methods and the data operations
+        run inside the block in a ProfileReport:
+
+            with session.profile() as report:
+                session.validate_tabular_dataset_series(dataset_series)
+            print(report.format())
+        """
+        return profile()
+
+    @staticmethod
+    def explain(profile: bool = False, log_level: int = logging.INFO):
+        """
+        Capture the optimized query plans of the frames that enrich and
+        aggregate collect inside the block, per dataset and per stratum.
+        The plans are logged and kept in an ExplainReport:
+
+            with session.explain() as report:
+                session.enrich(dataset_series, observations, derived_from)
+            print(report.format())
+
+        With profile the frames are collected through the Polars profiler
+        and each plan holds the timings per plan node.
+        """
+        return explain(profile=profile, log_level=log_level)
@@ -0,0 +1,144 @@
+"""
+Execution settings of the data operations, set per Session and threaded to
+the adapters through a context variable.
+
+With a memory budget, a data operation whose estimated working set exceeds
+the budget runs `over_memory_budget`: adapters spill intermediate results
+to a temporary directory and re-scan them lazily. The engine setting picks
+how adapters collect lazy results, "in-memory", "streaming" or "auto",
+which streams over the memory budget only.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import tempfile
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal, get_args
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+ExecutionEngine = Literal["in-memory", "streaming", "auto"]
+
+_BYTE_UNITS = {
+    "": 1,
+    "b": 1,
+    "kb": 10**3,
+    "mb": 10**6,
+    "gb": 10**9,
+    "tb": 10**12,
+    "kib": 2**10,
+    "mib": 2**20,
+    "gib": 2**30,
+    "tib": 2**40,
+}
+
+
+def parse_byte_size(size: int | str) -> int:
+    """Number of bytes in e.g. 1024, "512MB" or "8 GiB"."""
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", size)
+    if match is None or match.group(2).lower() not in _BYTE_UNITS:
+        raise ValueError(f"Invalid byte size: {size!r}")
+    number, unit = match.groups()
+    return int(float(number) * _BYTE_UNITS[unit.lower()])
+
+
+@dataclass(frozen=True)
+class ExecutionSettings:
+    """
+    memory_budget is the estimated working set size in bytes above which
+    data operations spill to disk, None for no budget. Spill files are
+    written to temporary directories under spill_directory, or under the
+    system temporary directory when it is None. engine is the collection
+    engine, see `collect_engine`.
+    """
+
+    memory_budget: int | None = None
+    spill_directory: str | None = None
+    engine: ExecutionEngine = "auto"
+
+    def __post_init__(self):
+        if self.engine not in get_args(ExecutionEngine):
+            raise ValueError(
+                f"Unknown execution engine {self.engine!r}, expected one "
+                f"of {get_args(ExecutionEngine)}."
+            )
+
+    def exceeds_memory_budget(self, working_set_bytes: int | None) -> bool:
+        if self.memory_budget is None or working_set_bytes is None:
+            return False
+        return working_set_bytes > self.memory_budget
+
+
+_settings: ContextVar[ExecutionSettings] = ContextVar(
+    "pypeh_execution_settings", default=ExecutionSettings()
+)
+_spill_directory: ContextVar[str | None] = ContextVar(
+    "pypeh_spill_directory", default=None
+)
+
+
+def current_execution_settings() -> ExecutionSettings:
+    return _settings.get()
+
+
+def current_spill_directory() -> str | None:
+    """The spill directory of the enclosing over-budget block, if any."""
+    return _spill_directory.get()
+
+
+def collect_engine() -> Literal["in-memory", "streaming"]:
+    """
+    The engine to collect lazy results with. With the "auto" engine data
+    operations stream when they run over the memory budget.
+    """
+    engine = current_execution_settings().engine
+    if engine == "auto":
+        if current_spill_directory() is not None:
+            return "streaming"
+        return "in-memory"
+    return engine
+
+
+@contextmanager
+def execution_settings(settings: ExecutionSettings) -> Iterator[None]:
+    token = _settings.set(settings)
+    try:
+        yield
+    finally:
+        _settings.reset(token)
+
+
+@contextmanager
+def over_memory_budget(working_set_bytes: int | None) -> Iterator[bool]:
+    """
+    Check the estimated working set of a data operation against the memory
+    budget. Yields whether it is exceeded, in which case the block runs
+    with a temporary spill directory that is removed on exit.
+    """
+    settings = current_execution_settings()
+    if not settings.exceeds_memory_budget(working_set_bytes):
+        yield False
+        return
+
+    logger.info(
+        f"Estimated working set of {working_set_bytes} bytes exceeds the "
+        f"memory budget of {settings.memory_budget} bytes, spilling to disk"
+    )
+    with tempfile.TemporaryDirectory(
+        prefix="pypeh-spill-", dir=settings.spill_directory
+    ) as directory:
+        token = _spill_directory.set(directory)
+        try:
+            yield True
+        finally:
+            _spill_directory.reset(token)
@@ -1,14 +1,123 @@
 from __future__ import annotations
 
 import logging
+import os
 import re
+import threading
+import time
 
 from dataclasses import is_dataclass
-from typing import Dict, Callable, Type
+from typing import TYPE_CHECKING, Dict, Callable, Type
 from ulid import ULID
 
+if TYPE_CHECKING:
+    import polars as pl
+
 logger = logging.getLogger(__name__)
 
+ULID_LENGTH = 26
+# number of ids an id factory mints at once
+DEFAULT_ID_POOL_SIZE = 1024
+
+_CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# two base32 characters per 10 bit value
+_CROCKFORD_PAIRS = [
+    a + b for a in _CROCKFORD_ALPHABET for b in _CROCKFORD_ALPHABET
+]
+# the low bits of the ULID randomness used as a counter within a block
+_COUNTER_BITS = 40
+_COUNTER_MASK = (1 << _COUNTER_BITS) - 1
+
+
+def _encode_crockford(value: int, length: int) -> str:
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, 32)
+        chars.append(_CROCKFORD_ALPHABET[remainder])
+    return "".join(reversed(chars))
+
+
+class UlidBlockGenerator:
+    """
+    Generates monotonic ULIDs in blocks. All ULIDs in a block share their
+    timestamp and the high 40 random bits; the low 40 bits count up from a
+    random start, so a block is encoded with a few table lookups per id.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timestamp_ms = -1
+        self._high = 0
+        self._next = 0
+
+    def reserve(self, n: int) -> tuple[str, int]:
+        """
+        Reserve n consecutive ULIDs. Returns the first 18 characters they
+        share and the counter value of the first one.
+        """
+        if n < 0 or n > 1 << (_COUNTER_BITS - 1):
+            raise ValueError(f"Cannot reserve a block of {n} ULIDs")
+        with self._lock:
+            timestamp_ms = time.time_ns() // 1_000_000
+            if (
+                timestamp_ms <= self._timestamp_ms
+                and self._next + n <= _COUNTER_MASK
+            ):
+                # same millisecond: continue the counter to stay monotonic
+                timestamp_ms = self._timestamp_ms
+            else:
+                timestamp_ms = max(timestamp_ms, self._timestamp_ms + 1)
+                randomness = int.from_bytes(os.urandom(10), "big")
+                self._high = randomness >> _COUNTER_BITS
+                self._next = (randomness & _COUNTER_MASK) % (
+                    _COUNTER_MASK - n + 1
+                )
+            start = self._next
+            self._next += n
+            self._timestamp_ms = timestamp_ms
+            high = self._high
+        return _encode_crockford(timestamp_ms, 10) + _encode_crockford(
+            high, 8
+        ), start
+
+
+_ULID_GENERATOR = UlidBlockGenerator()
+
+
+def generate_ulids(n: int, prefix: str = "") -> list[str]:
+    """Return n monotonic ULIDs, each prepended with prefix."""
+    ulid_prefix, start = _ULID_GENERATOR.reserve(n)
+    prefix = f"{prefix}{ulid_prefix}"
+    pairs = _CROCKFORD_PAIRS
+    return [
+        f"{prefix}{pairs[(value >> 30) & 1023]}{pairs[(value >> 20) & 1023]}"
+        f"{pairs[(value >> 10) & 1023]}{pairs[value & 1023]}"
+        for value in range(start, start + n)
+    ]
+
+
+def generate_ulid_column(
+    n: int, prefix: str = "", name: str = "id"
+) -> pl.Series:
+    """
+    Return a polars String Series of n monotonic ULIDs, each prepended with
+    prefix. The ids are encoded with polars expressions instead of Python
+    string formatting.
+    """
+    import polars as pl
+
+    ulid_prefix, start = _ULID_GENERATOR.reserve(n)
+    counter = pl.int_range(start, start + n, dtype=pl.Int64)
+    pairs = [
+        ((counter // (1 << shift)) % 1024).replace_strict(
+            range(1024), _CROCKFORD_PAIRS, return_dtype=pl.String
+        )
+        for shift in (30, 20, 10, 0)
+    ]
+    return pl.select(
+        pl.concat_str([pl.lit(f"{prefix}{ulid_prefix}"), *pairs]).alias(name)
+    ).to_series()
+
 
 class PrefixMap:
     def __init__(self, prefixes: Dict[str, str]):
@@ -108,8 +217,13 @@ class ImportMap:
         return iter(self.keys())
 
     def _split_namespace(self, uri):
-        # Split only on "/" and "#"
-        return [p for p in uri.replace("#", "/").split("/") if p]
+        # Split only on "/" and "#"; a CURIE prefix ("peh:") is a part too
+        parts = []
+        if "://" not in uri and ":" in uri:
+            prefix, uri = uri.split(":", 1)
+            parts.append(f"{prefix}:")
+        parts.extend(p for p in uri.replace("#", "/").split("/") if p)
+        return parts
 
 
 class NamespaceManager:
@@ -125,6 +239,11 @@ class NamespaceManager:
         self.resource_type_strategy: Callable[[Type], str] = (
             default_resource_type
         )
+        # (resource_class, namespace_key) -> (resource_type_strategy, base)
+        self._base_cache: dict[
+            tuple[Type | None, str | None],
+            tuple[Callable[[Type], str], str | None],
+        ] = {}
 
     @property
     def default_base_uri(self):
@@ -144,6 +263,7 @@ class NamespaceManager:
 
     def bind(self, namespace_key: str, base_uri: str):
         self.namespaces[namespace_key] = base_uri.rstrip("/") + "/"
+        self._base_cache.clear()
 
     def register_class(self, cls: Type, namespace: str):
         if not is_dataclass(cls):
@@ -153,19 +273,40 @@ class NamespaceManager:
                 f"Namespace {namespace} not bound to NamespaceManager"
             )
         self.dataclass_namespace_map[cls] = namespace
+        self._base_cache.clear()
 
     @classmethod
-    def generate_ulid(cls, length: int = 26):
+    def generate_ulid(cls, length: int = ULID_LENGTH):
         def _generate_ulid() -> str:
             ret = str(ULID())
             return ret[:length]
 
+        # full length ULID strategies are minted in bulk by `mint_many`,
+        # `mint_column` and the id factories
+        _generate_ulid.ulid_length = length  # type: ignore[attr-defined]
         return _generate_ulid
 
+    @staticmethod
+    def _is_bulk_ulid_strategy(suffix_strategy: Callable[[], str]) -> bool:
+        return getattr(suffix_strategy, "ulid_length", None) == ULID_LENGTH
+
     def _resolve_base(
         self,
         resource_class: Type | None = None,
         namespace_key: str | None = None,
+    ) -> str | None:
+        key = (resource_class, namespace_key)
+        cached = self._base_cache.get(key)
+        if cached is not None and cached[0] is self.resource_type_strategy:
+            return cached[1]
+        base = self._resolve_base_uncached(resource_class, namespace_key)
+        self._base_cache[key] = (self.resource_type_strategy, base)
+        return base
+
+    def _resolve_base_uncached(
+        self,
+        resource_class: Type | None = None,
+        namespace_key: str | None = None,
     ) -> str | None:
         # Explicit namespace overrides everything
         if namespace_key is not None:
@@ -206,6 +347,50 @@ class NamespaceManager:
         suffix = self.suffix_strategy()
         return f"{base}{suffix}"
 
+    def mint_many(
+        self,
+        resource_class: Type,
+        n: int,
+        namespace_key: str | None = None,
+    ) -> list[str]:
+        """Mint n identifiers at once, see `mint`."""
+        base = self._resolve_base(resource_class, namespace_key)
+        if base is None:
+            raise ValueError("Could not resolve base URI")
+        return self._mint_suffixed(base, n, self.suffix_strategy)
+
+    def mint_column(
+        self,
+        n: int,
+        resource_class: Type | None = None,
+        namespace_key: str | None = None,
+        name: str = "id",
+    ) -> pl.Series:
+        """
+        Mint n identifiers as a polars String Series, for instance to add an
+        id column to a DataFrame. Requires polars.
+        """
+        base = self._resolve_base(resource_class, namespace_key)
+        if base is None:
+            raise ValueError("Could not resolve base URI")
+        if self._is_bulk_ulid_strategy(self.suffix_strategy):
+            return generate_ulid_column(n, prefix=base, name=name)
+
+        import polars as pl
+
+        return pl.Series(
+            name,
+            self._mint_suffixed(base, n, self.suffix_strategy),
+            dtype=pl.String,
+        )
+
+    def _mint_suffixed(
+        self, base: str, n: int, suffix_strategy: Callable[[], str]
+    ) -> list[str]:
+        if self._is_bulk_ulid_strategy(suffix_strategy):
+            return generate_ulids(n, prefix=base)
+        return [f"{base}{suffix_strategy()}" for _ in range(n)]
+
     def mint_and_set(
         self,
         obj,
@@ -225,7 +410,12 @@ class NamespaceManager:
         self,
         namespace_key: str | None = None,
         suffix_strategy: Callable[[], str] | None = None,
+        pool_size: int = DEFAULT_ID_POOL_SIZE,
     ) -> Callable[[], str] | None:
+        """
+        Return a callable minting one identifier per call. ULID identifiers
+        are minted pool_size at a time and handed out in order.
+        """
         base = self._resolve_base(
             resource_class=None, namespace_key=namespace_key
         )
@@ -234,6 +424,16 @@ class NamespaceManager:
         if suffix_strategy is None:
             suffix_strategy = self.suffix_strategy
 
+        if self._is_bulk_ulid_strategy(suffix_strategy) and pool_size > 1:
+            pool: list[str] = []
+
+            def _pooled_factory():
+                if len(pool) == 0:
+                    pool.extend(reversed(generate_ulids(pool_size, base)))
+                return pool.pop()
+
+            return _pooled_factory
+
         def _factory():
             suffix = suffix_strategy()
             return f"{base}{suffix}"
@@ -0,0 +1,349 @@
+"""
+Timing spans around the Session methods and the data operation hot spots.
+
+Spans are only recorded while at least one SpanHook is registered, without
+hooks `span` yields a no-op span and `traced` calls straight through. Use
+`profile` to collect a summary report for a block of code:
+
+    with profile() as report:
+        session.validate_tabular_dataset_series(dataset_series)
+    print(report.format())
+
+`OpenTelemetryHook` forwards the spans to an OpenTelemetry tracer, it
+requires the optional `opentelemetry-api` package.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+T_Callable = TypeVar("T_Callable", bound=Callable[..., Any])
+
+
+class Span:
+    """
+    A timed section of a run. Attributes describe the data the section
+    worked on, e.g. `rows`, `bytes` (estimated in-memory size),
+    `file_bytes` and `dataset_labels`.
+    """
+
+    __slots__ = ("name", "attributes", "parent", "start", "end")
+
+    recording = True
+
+    def __init__(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        parent: Span | None = None,
+    ):
+        self.name = name
+        self.attributes: dict[str, Any] = dict(attributes or {})
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.end: float | None = None
+
+    @property
+    def duration(self) -> float | None:
+        if self.end is None:
+            return None
+        return self.end - self.start
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_to_attribute(self, key: str, value: int | float) -> None:
+        self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def record_data(self, data: Any) -> None:
+        """
+        Add row counts, sizes and dataset labels of a frame, a Dataset, a
+        DatasetSeries or a mapping of those to the span attributes. Lazy
+        frames and other objects are ignored, recording never computes.
+        """
+        for label, frame in _iter_frames(data):
+            if label is not None:
+                labels = self.attributes.setdefault("dataset_labels", [])
+                if label not in labels:
+                    labels.append(label)
+            rows = getattr(frame, "height", None)
+            if rows is None:
+                continue
+            self.add_to_attribute("rows", rows)
+            estimated_size = getattr(frame, "estimated_size", None)
+            if estimated_size is not None:
+                self.add_to_attribute("bytes", estimated_size())
+
+    def __repr__(self) -> str:
+        return (
+            f"Span(name={self.name!r}, duration={self.duration!r}, "
+            f"attributes={self.attributes!r})"
+        )
+
+
+class _NoopSpan(Span):
+    __slots__ = ()
+
+    recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_to_attribute(self, key: str, value: int | float) -> None:
+        pass
+
+    def record_data(self, data: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan("noop")
+
+
+def _iter_frames(data: Any, label: str | None = None):
+    parts = getattr(data, "parts", None)
+    if isinstance(parts, dict):
+        # DatasetSeries
+        for dataset_label, dataset in parts.items():
+            yield from _iter_frames(dataset, dataset_label)
+    elif hasattr(data, "schema") and hasattr(data, "part_of"):
+        # Dataset
+        if data.data is not None:
+            yield data.label, data.data
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            yield from _iter_frames(value, key if label is None else label)
+    elif hasattr(data, "height"):
+        yield label, data
+
+
+class SpanHook:
+    """
+    Receives every span that starts and ends while the hook is registered.
+    Subclasses override the callbacks they need.
+    """
+
+    def on_start(self, span: Span) -> None:
+        pass
+
+    def on_end(self, span: Span) -> None:
+        pass
+
+
+_hooks: list[SpanHook] = []
+_hooks_lock = threading.Lock()
+_current_span: ContextVar[Span | None] = ContextVar(
+    "pypeh_current_span", default=None
+)
+
+
+def add_span_hook(hook: SpanHook) -> None:
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_span_hook(hook: SpanHook) -> None:
+    with _hooks_lock:
+        _hooks.remove(hook)
+
+
+def is_enabled() -> bool:
+    return len(_hooks) > 0
+
+
+def current_span() -> Span:
+    """The innermost active span, or the no-op span."""
+    active = _current_span.get()
+    return NOOP_SPAN if active is None else active
+
+
+@contextmanager
+def span(
+    name: str, parent: Span | None = None, **attributes: Any
+) -> Iterator[Span]:
+    """
+    Time the block in a span, nested in the innermost active span. Code that
+    runs on other threads, where no span is active, passes its parent.
+    """
+    if not _hooks:
+        yield NOOP_SPAN
+        return
+
+    hooks = tuple(_hooks)
+    if parent is None or parent is NOOP_SPAN:
+        parent = _current_span.get()
+    new_span = Span(name, attributes, parent=parent)
+    token = _current_span.set(new_span)
+    for hook in hooks:
+        hook.on_start(new_span)
+    try:
+        yield new_span
+    except BaseException as exc:
+        new_span.set_attribute("error", type(exc).__name__)
+        raise
+    finally:
+        new_span.end = time.perf_counter()
+        _current_span.reset(token)
+        for hook in hooks:
+            hook.on_end(new_span)
+
+
+def traced(name: str | None = None) -> Callable[[T_Callable], T_Callable]:
+    """
+    Run the decorated function in a span named after its qualified name,
+    recording the data it returns.
+    """
+
+    def decorator(fn: T_Callable) -> T_Callable:
+        span_name = fn.__qualname__ if name is None else name
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return fn(*args, **kwargs)
+            with span(span_name) as active:
+                result = fn(*args, **kwargs)
+                active.record_data(result)
+                return result
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class ProfileReport(SpanHook):
+    """
+    Collects finished spans and summarizes them per span name. Self time is
+    the time of a span minus the time of its direct child spans.
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._child_seconds: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def on_end(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+            if span.parent is not None and span.duration is not None:
+                parent_id = id(span.parent)
+                self._child_seconds[parent_id] = (
+                    self._child_seconds.get(parent_id, 0.0) + span.duration
+                )
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            spans = list(self.spans)
+            child_seconds = dict(self._child_seconds)
+        ret: dict[str, dict[str, Any]] = {}
+        for finished in spans:
+            duration = finished.duration or 0.0
+            entry = ret.setdefault(
+                finished.name,
+                {
+                    "count": 0,
+                    "total_seconds": 0.0,
+                    "self_seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "rows": 0,
+                    "bytes": 0,
+                },
+            )
+            entry["count"] += 1
+            entry["total_seconds"] += duration
+            entry["self_seconds"] += max(
+                duration - child_seconds.get(id(finished), 0.0), 0.0
+            )
+            entry["max_seconds"] = max(entry["max_seconds"], duration)
+            entry["rows"] += finished.attributes.get("rows", 0)
+            entry["bytes"] += finished.attributes.get("bytes", 0)
+        return dict(
+            sorted(
+                ret.items(),
+                key=lambda item: item[1]["self_seconds"],
+                reverse=True,
+            )
+        )
+
+    def format(self) -> str:
+        """The summary as a text table, slowest self time first."""
+        header = (
+            f"{'span':<56} {'count':>6} {'total s':>9} {'self s':>9} "
+            f"{'max s':>9} {'rows':>12}"
+        )
+        lines = [header, "-" * len(header)]
+        for name, entry in self.summary().items():
+            lines.append(
+                f"{name[:56]:<56} {entry['count']:>6} "
+                f"{entry['total_seconds']:>9.4f} "
+                f"{entry['self_seconds']:>9.4f} "
+                f"{entry['max_seconds']:>9.4f} {entry['rows']:>12}"
+            )
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile() -> Iterator[ProfileReport]:
+    """Record the spans of a block of code in a ProfileReport."""
+    report = ProfileReport()
+    add_span_hook(report)
+    try:
+        yield report
+    finally:
+        remove_span_hook(report)
+
+
+def _otel_value(value: Any) -> Any:
+    if isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)) and all(
+        isinstance(item, (str, bool, int, float)) for item in value
+    ):
+        return list(value)
+    return str(value)
+
+
+class OpenTelemetryHook(SpanHook):
+    """
+    Forward spans to an OpenTelemetry tracer, nested the same way as the
+    pypeh spans. Attributes are prefixed with `pypeh.`.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError as exc:
+            raise ImportError(
+                "OpenTelemetryHook requires the 'opentelemetry-api' package."
+            ) from exc
+        self._trace = trace
+        self.tracer = (
+            tracer if tracer is not None else trace.get_tracer("pypeh")
+        )
+        self._otel_spans: dict[int, Any] = {}
+
+    def on_start(self, span: Span) -> None:
+        context = None
+        if span.parent is not None:
+            parent = self._otel_spans.get(id(span.parent))
+            if parent is not None:
+                context = self._trace.set_span_in_context(parent)
+        self._otel_spans[id(span)] = self.tracer.start_span(
+            span.name, context=context
+        )
+
+    def on_end(self, span: Span) -> None:
+        otel_span = self._otel_spans.pop(id(span), None)
+        if otel_span is None:
+            return
+        for key, value in span.attributes.items():
+            otel_span.set_attribute(f"pypeh.{key}", _otel_value(value))
+        otel_span.end()
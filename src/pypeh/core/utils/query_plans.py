@@ -0,0 +1,125 @@
+"""
+Capture the optimized query plans of the lazy frames the data operations
+collect, before they are collected. Use `explain` around the calls to
+inspect, e.g. to find the calculation design that defeats predicate
+pushdown or causes a cross join:
+
+    with explain() as report:
+        session.enrich(dataset_series, observations, derived_from)
+    print(report.format())
+
+Every captured plan is also logged on this module's logger. With
+`profile=True` the frames are collected through the profiler of the
+dataframe library and the plans carry the timings per plan node.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryPlan:
+    """
+    The optimized plan of a single collect. `stratum` holds the grouping
+    elements of an aggregation, or one list of them per stratification
+    when several are collected together. `node_timings` holds the per node
+    timings of a profiled collect.
+    """
+
+    operation: str
+    plan: str
+    dataset_label: str | None = None
+    stratum: list[str] | list[list[str]] | None = None
+    node_timings: Any = None
+
+    @property
+    def has_cross_join(self) -> bool:
+        return "CROSS JOIN" in self.plan
+
+    def format(self) -> str:
+        header = self.operation
+        if self.dataset_label is not None:
+            header += f" dataset={self.dataset_label}"
+        if self.stratum is not None:
+            header += f" stratum={self.stratum}"
+        lines = [header, self.plan]
+        if self.node_timings is not None:
+            lines.append(str(self.node_timings))
+        return "\n".join(lines)
+
+
+class ExplainReport:
+    def __init__(self, profile: bool = False, log_level: int = logging.INFO):
+        self.profile = profile
+        self.log_level = log_level
+        self.plans: list[QueryPlan] = []
+
+    def add(self, plan: QueryPlan) -> None:
+        self.plans.append(plan)
+        logger.log(self.log_level, "Query plan of %s", plan.format())
+
+    def for_dataset(self, dataset_label: str) -> list[QueryPlan]:
+        return [
+            plan for plan in self.plans if plan.dataset_label == dataset_label
+        ]
+
+    def format(self) -> str:
+        return "\n\n".join(plan.format() for plan in self.plans)
+
+
+_active_report: ContextVar[ExplainReport | None] = ContextVar(
+    "pypeh_explain_report", default=None
+)
+_plan_labels: ContextVar[dict[str, Any]] = ContextVar(
+    "pypeh_plan_labels", default={}
+)
+
+
+def active_report() -> ExplainReport | None:
+    """The report of the enclosing `explain` block, if any."""
+    return _active_report.get()
+
+
+def current_plan_labels() -> dict[str, Any]:
+    return _plan_labels.get()
+
+
+@contextmanager
+def plan_labels(**labels: Any) -> Iterator[None]:
+    """
+    Label the plans collected inside the block, e.g. with the dataset_label
+    or stratum the collected frame belongs to.
+    """
+    token = _plan_labels.set({**_plan_labels.get(), **labels})
+    try:
+        yield
+    finally:
+        _plan_labels.reset(token)
+
+
+@contextmanager
+def explain(
+    profile: bool = False, log_level: int = logging.INFO
+) -> Iterator[ExplainReport]:
+    """
+    Capture the query plans collected inside the block. With `profile=True`
+    the plans are collected with the in-memory engine to time their nodes,
+    whatever `collect_engine` returns.
+    """
+    report = ExplainReport(profile=profile, log_level=log_level)
+    token = _active_report.set(report)
+    try:
+        yield report
+    finally:
+        _active_report.reset(token)
@@ -1,6 +1,6 @@
-from rdflib import Graph
+from rdflib import Graph, URIRef
 from rdflib.namespace import DCTERMS, PROV, XSD
-from typing import Type
+from typing import IO, Iterator, Literal, Type
 
 from pypeh.core.models.semantic_profile import (
     PEH,
@@ -11,6 +11,12 @@ from pypeh.core.models.semantic_profile import (
     SemanticDatasetSeries,
 )
 from pypeh.core.models.internal_data_layout import Dataset, DatasetSeries
+from pypeh.core.utils.rdf_stream import (
+    DEFAULT_CHUNK_SIZE,
+    write_nquads,
+    write_ntriples,
+    write_turtle,
+)
 
 
 class GraphBuilder:
@@ -34,27 +40,76 @@ class GraphBuilder:
         provenance_info: dict,
         schema_profile: Type[SemanticDatasetSchema],
     ) -> Graph:
+        g = self._base_graph()
+        for triple in self.iter_series_triples(
+            series, provenance_info, schema_profile
+        ):
+            g.add(triple)
+
+        return g
+
+    def iter_series_triples(
+        self,
+        series: DatasetSeries,
+        provenance_info: dict,
+        schema_profile: Type[SemanticDatasetSchema],
+    ) -> Iterator[tuple]:
         semantic_series = SemanticDatasetSeries.from_dataset_series(
             series, **provenance_info
         )
-        g = self._base_graph()
-
-        for triple in semantic_series.to_rdf():
-            g.add(triple)
+        yield from semantic_series.to_rdf()
 
         for dataset in series.parts.values():
             assert isinstance(dataset, Dataset)
             semantic_dataset = SemanticDataset.from_dataset(
                 dataset, schema_profile=schema_profile
             )
-            self._add_dataset(g, semantic_dataset)
+            yield from self._iter_dataset_triples(semantic_dataset)
 
-        return g
+    def serialize_series(
+        self,
+        series: DatasetSeries,
+        destination: IO[str],
+        provenance_info: dict,
+        schema_profile: Type[SemanticDatasetSchema],
+        format: Literal["nt", "nquads", "turtle"] = "nt",
+        graph_identifier: str | None = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        Stream the triples of build_series to a text stream without building
+        an rdflib Graph. N-Quads are written to graph_identifier, by default
+        the series identifier. Returns the number of triples written.
+
+        Unlike an rdflib Graph, the writers do not deduplicate triples.
+        """
+        triples = self.iter_series_triples(
+            series, provenance_info, schema_profile
+        )
+        if format == "nt":
+            return write_ntriples(triples, destination, chunk_size=chunk_size)
+        if format == "nquads":
+            graph = URIRef(graph_identifier or series.identifier)
+            return write_nquads(
+                triples, destination, graph, chunk_size=chunk_size
+            )
+        if format == "turtle":
+            return write_turtle(
+                triples,
+                destination,
+                prefixes=self.PREFIXES,
+                chunk_size=chunk_size,
+            )
+        raise ValueError(f"Unsupported streaming RDF format: {format!r}")
+
+    def _iter_dataset_triples(
+        self, dataset: SemanticDataset
+    ) -> Iterator[tuple]:
+        yield from dataset.to_rdf()
+        yield from dataset.schema.to_rdf(dataset)
 
     def _add_dataset(self, g: Graph, dataset: SemanticDataset) -> None:
-        for triple in dataset.to_rdf():
-            g.add(triple)
-        for triple in dataset.schema.to_rdf(dataset):
+        for triple in self._iter_dataset_triples(dataset):
             g.add(triple)
 
     def _base_graph(self) -> Graph:
@@ -0,0 +1,155 @@
+"""
+Streaming RDF writers.
+
+The writers serialise an iterable of triples straight to a text stream,
+without collecting them in an `rdflib.Graph` first. Output only depends on
+the order of the incoming triples, so deterministic triple generators give
+byte-identical files.
+"""
+
+from __future__ import annotations
+
+import re
+
+from itertools import islice
+from typing import IO, Iterable, Iterator, Mapping
+
+from rdflib import BNode, Literal, URIRef
+from rdflib.namespace import RDF
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# characters that may not appear unescaped in an IRIREF
+_IRI_ESCAPES = {
+    code: f"\\u{code:04X}" for code in [*range(0x21), *map(ord, '<>"{}|^`\\')]
+}
+_LITERAL_ESCAPES = {
+    ord("\\"): "\\\\",
+    ord('"'): '\\"',
+    ord("\n"): "\\n",
+    ord("\r"): "\\r",
+}
+_PN_LOCAL = re.compile(r"[A-Za-z_][A-Za-z0-9_\-]*\Z")
+
+
+def _chunks(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def nt_term(term) -> str:
+    """Return the N-Triples form of an rdflib term."""
+    if isinstance(term, URIRef):
+        return f"<{str(term).translate(_IRI_ESCAPES)}>"
+    if isinstance(term, BNode):
+        return f"_:{term}"
+    if isinstance(term, Literal):
+        value = f'"{str(term).translate(_LITERAL_ESCAPES)}"'
+        if term.language:
+            return f"{value}@{term.language}"
+        if term.datatype:
+            return f"{value}^^{nt_term(term.datatype)}"
+        return value
+    raise TypeError(f"Cannot serialise RDF term of type {type(term)}")
+
+
+def write_ntriples(
+    triples: Iterable[tuple],
+    stream: IO[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write triples as N-Triples. Returns the number of triples written."""
+    count = 0
+    for chunk in _chunks(triples, chunk_size):
+        stream.write(
+            "".join(
+                f"{nt_term(s)} {nt_term(p)} {nt_term(o)} .\n"
+                for s, p, o in chunk
+            )
+        )
+        count += len(chunk)
+    return count
+
+
+def write_nquads(
+    triples: Iterable[tuple],
+    stream: IO[str],
+    graph: URIRef | str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Write triples as N-Quads in the named graph. Returns the count."""
+    graph_term = nt_term(URIRef(graph))
+    count = 0
+    for chunk in _chunks(triples, chunk_size):
+        stream.write(
+            "".join(
+                f"{nt_term(s)} {nt_term(p)} {nt_term(o)} {graph_term} .\n"
+                for s, p, o in chunk
+            )
+        )
+        count += len(chunk)
+    return count
+
+
+class _TurtleTerms:
+    def __init__(self, prefixes: Mapping[str, str]):
+        # longest namespace first so nested namespaces compact correctly
+        self._namespaces = sorted(
+            ((str(ns), prefix) for prefix, ns in prefixes.items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+
+    def __call__(self, term, predicate: bool = False) -> str:
+        if predicate and term == RDF.type:
+            return "a"
+        if isinstance(term, URIRef):
+            value = str(term)
+            for namespace, prefix in self._namespaces:
+                if value.startswith(namespace):
+                    local = value[len(namespace) :]
+                    if _PN_LOCAL.match(local):
+                        return f"{prefix}:{local}"
+        return nt_term(term)
+
+
+def write_turtle(
+    triples: Iterable[tuple],
+    stream: IO[str],
+    prefixes: Mapping[str, str] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Write triples as Turtle, flushing the output every chunk_size triples.
+
+    Consecutive triples that share a subject are grouped with ';'. Blank
+    nodes are written with explicit labels, so a chunk boundary never
+    changes the graph.
+    """
+    prefixes = prefixes or {}
+    term = _TurtleTerms(prefixes)
+    stream.write(
+        "".join(
+            f"@prefix {prefix}: <{namespace}> .\n"
+            for prefix, namespace in prefixes.items()
+        )
+    )
+
+    count = 0
+    subject = None
+    for chunk in _chunks(triples, chunk_size):
+        lines = []
+        for s, p, o in chunk:
+            if s == subject:
+                lines.append(f" ;\n    {term(p, True)} {term(o)}")
+            else:
+                if subject is not None:
+                    lines.append(" .\n")
+                lines.append(f"\n{term(s)} {term(p, True)} {term(o)}")
+                subject = s
+        stream.write("".join(lines))
+        count += len(chunk)
+    if subject is not None:
+        stream.write(" .\n")
+    return count
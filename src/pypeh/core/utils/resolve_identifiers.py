@@ -5,7 +5,7 @@ import re
 
 from pathlib import Path
 from http import HTTPStatus
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 from urllib.parse import urlparse
 
 from pypeh.core.models.uri_regex import PID_PATTERN
@@ -15,6 +15,11 @@ from pypeh.core.models import uri_regex
 if TYPE_CHECKING:
     from typing import Optional, Mapping, Union
 
+    import polars as pl
+    import pyarrow as pa
+
+    IdentifierColumn = Union[pl.Series, pa.Array, pa.ChunkedArray]
+
 logger = logging.getLogger(__name__)
 
 
@@ -133,3 +138,202 @@ def resource_path(path_or_url: Union[str, Path]) -> Union[Path, str]:
         return path_or_url  # It's a URL
     else:
         return Path(path_or_url)  # It's a local path
+
+
+## Columnar validation and expansion
+# The functions below take a polars Series or pyarrow (Chunked)Array of
+# strings and return a column of the same kind. Requires polars.
+
+# validator name -> pattern for the polars (Rust) regex engine and a guard
+# pattern, see `_native_pattern`
+_NATIVE_PATTERNS: dict[str, tuple[str, str | None] | None] = {}
+
+
+def _strip_negative_lookaheads(pattern: str) -> tuple[str, list[str]]:
+    """Remove the (?!...) groups from pattern, returning their bodies."""
+    stripped: list[str] = []
+    lookaheads: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("(?!", i):
+            depth, j = 1, i + 3
+            while depth > 0:
+                if pattern[j] == "\\":
+                    j += 1
+                elif pattern[j] == "(":
+                    depth += 1
+                elif pattern[j] == ")":
+                    depth -= 1
+                j += 1
+            lookaheads.append(pattern[i + 3 : j - 1])
+            i = j
+            continue
+        if pattern[i] == "\\":
+            stripped.append(pattern[i : i + 2])
+            i += 2
+            continue
+        stripped.append(pattern[i])
+        i += 1
+    return "".join(stripped), lookaheads
+
+
+def _native_pattern(validator_name: str) -> tuple[str, str | None] | None:
+    """
+    Translate a validator for the polars regex engine, which has no
+    lookarounds. Negative lookaheads are removed, which only makes the
+    pattern accept more: values that contain a match of a removed lookahead
+    (the guard pattern) are checked with python re instead. Returns None
+    when the pattern cannot be translated.
+    """
+    if validator_name in _NATIVE_PATTERNS:
+        return _NATIVE_PATTERNS[validator_name]
+
+    import polars as pl
+
+    pattern, flags = uri_regex._VALIDATOR_PATTERNS[validator_name]
+    pattern, lookaheads = _strip_negative_lookaheads(pattern)
+    inline_flags = "(?x)" if flags & re.VERBOSE else ""
+    if pattern.endswith("$") and not pattern.endswith("\\$"):
+        # python's "$" also matches before a trailing newline
+        pattern = f"{pattern[:-1]}\\n?\\z"
+    ret: tuple[str, str | None] | None = (
+        f"{inline_flags}{pattern}",
+        f"{inline_flags}{'|'.join(lookaheads)}" if lookaheads else None,
+    )
+    try:
+        for native_pattern in ret:
+            if native_pattern is not None:
+                pl.Series([""]).str.contains(native_pattern, strict=True)
+    except pl.exceptions.ComputeError:
+        logger.debug(
+            f"Validator {validator_name} is not supported by the polars "
+            "regex engine, falling back to python re."
+        )
+        ret = None
+    _NATIVE_PATTERNS[validator_name] = ret
+    return ret
+
+
+def _to_series(column: IdentifierColumn) -> pl.Series:
+    import polars as pl
+
+    if isinstance(column, pl.Series):
+        return column
+    ret = pl.from_arrow(column)
+    assert isinstance(ret, pl.Series)
+    return ret
+
+
+def _like_input(result: pl.Series, column: IdentifierColumn):
+    import polars as pl
+
+    if isinstance(column, pl.Series):
+        return result
+    return result.to_arrow()
+
+
+def _match_distinct(series: pl.Series, validator_name: str) -> pl.Series:
+    """Match every distinct value of series once with python re."""
+    import polars as pl
+
+    validator = getattr(uri_regex, validator_name)
+    distinct = series.drop_nulls().unique()
+    matches = [validator.match(value) is not None for value in distinct]
+    return series.replace_strict(
+        distinct,
+        pl.Series(matches, dtype=pl.Boolean),
+        default=None,
+        return_dtype=pl.Boolean,
+    )
+
+
+def _validate_column(
+    column: IdentifierColumn, validator_names: tuple[str, ...]
+):
+    """
+    Boolean mask of the values matching any of the validators, null for
+    null values.
+    """
+    series = _to_series(column)
+    mask = None
+    for validator_name in validator_names:
+        native = _native_pattern(validator_name)
+        if native is None:
+            validator_mask = _match_distinct(series, validator_name)
+        else:
+            pattern, guard = native
+            validator_mask = series.str.contains(pattern, strict=True)
+            if guard is not None:
+                guarded = validator_mask & series.str.contains(
+                    guard, strict=True
+                )
+                if guarded.any():
+                    validator_mask = validator_mask.scatter(
+                        guarded.arg_true(),
+                        _match_distinct(
+                            series.filter(guarded), validator_name
+                        ),
+                    )
+        mask = validator_mask if mask is None else mask | validator_mask
+    assert mask is not None
+    return _like_input(mask.alias(series.name), column)
+
+
+def validate_uri_column(column: IdentifierColumn):
+    return _validate_column(column, ("uri_validator",))
+
+
+def validate_uri_reference_column(column: IdentifierColumn):
+    return _validate_column(
+        column, ("uri_validator", "uri_relative_ref_validator")
+    )
+
+
+def validate_curie_column(column: IdentifierColumn):
+    return _validate_column(column, ("curie_validator",))
+
+
+def is_url_column(column: IdentifierColumn):
+    return _validate_column(column, ("url_validator",))
+
+
+def expand_curie_column(
+    column: IdentifierColumn,
+    namespaces: Mapping[str, str | None],
+    on_unknown: Literal["raise", "null", "keep"] = "raise",
+):
+    """
+    Expand the CURIEs in column to URIs by prepending the namespace bound to
+    their prefix. Values whose prefix is not in namespaces raise a
+    ValueError, become null or are kept unchanged, depending on on_unknown.
+    """
+    import polars as pl
+
+    if on_unknown not in ("raise", "null", "keep"):
+        raise ValueError(
+            f"on_unknown should be 'raise', 'null' or 'keep', not "
+            f"{on_unknown!r}"
+        )
+    series = _to_series(column)
+    parts = series.str.splitn(":", 2).struct.unnest()
+    prefixes = parts.get_column("field_0")
+    suffixes = parts.get_column("field_1")
+    bound = {
+        prefix: base for prefix, base in namespaces.items() if base is not None
+    }
+    bases = prefixes.replace_strict(
+        list(bound.keys()),
+        list(bound.values()),
+        default=None,
+        return_dtype=pl.String,
+    )
+    expanded = bases + suffixes
+    unresolved = expanded.is_null() & series.is_not_null()
+    if on_unknown == "raise" and unresolved.any():
+        unknown = sorted(series.filter(unresolved).unique().head(5))
+        raise ValueError(
+            f"Namespace of CURIEs {', '.join(unknown)} not part of context."
+        )
+    if on_unknown == "keep":
+        expanded = expanded.fill_null(series)
+    return _like_input(expanded.alias(series.name), column)
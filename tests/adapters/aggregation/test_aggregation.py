@@ -1,6 +1,7 @@
 import pytest
 
 from pypeh.core.interfaces.dataops import AggregationInterface
+from pypeh.core.utils.execution import ExecutionSettings, execution_settings
 
 
 @pytest.fixture(scope="module")
@@ -587,3 +588,61 @@ class TestCalculateFrequencies:
             .item()
             == 1
         )
+
+
+@pytest.mark.dataframe
+class TestExecutionEngines:
+    """Results must not depend on the collection engine."""
+
+    @staticmethod
+    def _per_engine(fn):
+        results = {}
+        for engine in ["in-memory", "streaming"]:
+            with execution_settings(ExecutionSettings(engine=engine)):
+                result = fn()
+            results[engine] = result.sort(result.columns)
+        return results
+
+    def test_calculate_for_strata(self, setup_adapter, sample_dataframe):
+        adapter = setup_adapter()
+        results = self._per_engine(
+            lambda: adapter.calculate_for_strata(
+                df=sample_dataframe.lazy(),
+                stratifications=[["group_a"], ["group_a", "group_b"]],
+                value_col="measurement",
+                stat_builders=["stat_count", "statistics_mean"],
+            )
+        )
+        assert results["streaming"].equals(results["in-memory"])
+
+    def test_group_results(self, setup_adapter, sample_dataframe):
+        adapter = setup_adapter()
+        df = sample_dataframe.lazy()
+
+        def summarize():
+            return adapter.group_results(
+                [
+                    adapter._calculate_for_stratum(
+                        df=df,
+                        group_cols=["group_a"],
+                        value_col="measurement",
+                        stat_builders=[stat_builder],
+                    )
+                    for stat_builder in ["stat_count", "statistics_mean"]
+                ],
+                strata=["group_a"],
+            )
+
+        results = self._per_engine(summarize)
+        assert results["streaming"].equals(results["in-memory"])
+
+    def test_calculate_frequency(self, setup_adapter, sample_dataframe):
+        adapter = setup_adapter()
+        results = self._per_engine(
+            lambda: adapter._calculate_frequency(
+                df=sample_dataframe.lazy(),
+                group_cols=["group_a"],
+                value_col="category",
+            )
+        )
+        assert results["streaming"].equals(results["in-memory"])
@@ -0,0 +1,168 @@
+import pytest
+
+from pypeh.adapters.persistence.dataset_ipc import (
+    dump_dataset_series_to_ipc,
+    dump_dataset_series_to_ipc_filesystem,
+    load_dataset_series_from_ipc,
+    load_dataset_series_from_ipc_filesystem,
+)
+from pypeh.adapters.persistence.dataset_parquet import (
+    dump_dataset_series_to_parquet,
+)
+from pypeh.core.models.constants import ObservablePropertyValueType
+from pypeh.core.models.internal_data_layout import Dataset, DatasetSeries
+
+
+pytestmark = pytest.mark.dataframe
+
+
+@pytest.fixture
+def dataset_series():
+    pl = pytest.importorskip("polars")
+
+    series = DatasetSeries(label="example_series")
+
+    sample = series.add_empty_dataset(
+        "SAMPLE", metadata={"described_by": "peh:layout_section_sample"}
+    )
+    series.add_observable_property(
+        observation_id="peh:obs_sample",
+        observable_property_id="peh:prop_id_sample",
+        data_type=ObservablePropertyValueType.STRING,
+        dataset_label="SAMPLE",
+        element_label="id_sample",
+        is_primary_key=True,
+    )
+    sample.add_observation_to_index("peh:obs_sample")
+    sample.data = pl.DataFrame({"id_sample": ["sample-a", "sample-b"]})
+
+    lab = series.add_empty_dataset(
+        "LAB", metadata={"described_by": "peh:layout_section_lab"}
+    )
+    series.add_observable_property(
+        observation_id="peh:obs_lab",
+        observable_property_id="peh:prop_id_sample",
+        data_type=ObservablePropertyValueType.STRING,
+        dataset_label="LAB",
+        element_label="id_sample",
+    )
+    series.add_observable_property(
+        observation_id="peh:obs_lab",
+        observable_property_id="peh:prop_chol",
+        data_type=ObservablePropertyValueType.FLOAT,
+        dataset_label="LAB",
+        element_label="chol",
+    )
+    lab.add_observation_to_index("peh:obs_lab")
+    lab.schema.add_foreign_key_link(
+        element_label="id_sample",
+        foreign_key_dataset_label="SAMPLE",
+        foreign_key_element_label="id_sample",
+    )
+    lab.data = pl.DataFrame(
+        {
+            "id_sample": ["sample-a", "sample-b"],
+            "chol": [1.2, 3.4],
+        }
+    )
+
+    return series
+
+
+def test_dataset_series_ipc_roundtrip_preserves_join_and_context(
+    tmp_path, dataset_series
+):
+    outputs = dump_dataset_series_to_ipc(dataset_series, tmp_path)
+
+    assert sorted(path.name for path in outputs) == [
+        "LAB.arrow",
+        "SAMPLE.arrow",
+    ]
+    loaded = load_dataset_series_from_ipc(tmp_path)
+
+    assert loaded.label == dataset_series.label
+    assert loaded.identifier == dataset_series.identifier
+    assert set(loaded.parts) == {"SAMPLE", "LAB"}
+    join = loaded.resolve_join("LAB", "SAMPLE")
+    assert join is not None
+    assert join.left_elements == ("id_sample",)
+    assert join.right_elements == ("id_sample",)
+    assert loaded.context_lookup("peh:obs_lab", "peh:prop_chol") == (
+        "LAB",
+        "chol",
+    )
+    lab = loaded["LAB"]
+    assert isinstance(lab, Dataset)
+    assert lab.observation_ids == {"peh:obs_lab"}
+    assert lab.data is not None
+    assert lab.data.to_dict(as_series=False) == {
+        "id_sample": ["sample-a", "sample-b"],
+        "chol": [1.2, 3.4],
+    }
+    assert (
+        lab.schema.elements["chol"].data_type
+        == ObservablePropertyValueType.FLOAT
+    )
+    assert loaded["SAMPLE"].schema.primary_keys == {"id_sample"}
+
+
+def test_dataset_series_ipc_memory_map_matches_buffered_read(
+    tmp_path, dataset_series
+):
+    outputs = dump_dataset_series_to_ipc(dataset_series, tmp_path)
+
+    mapped = load_dataset_series_from_ipc(outputs, memory_map=True)
+    buffered = load_dataset_series_from_ipc(outputs, memory_map=False)
+
+    for label in ("SAMPLE", "LAB"):
+        assert mapped[label].data.equals(buffered[label].data)
+
+
+def test_dataset_series_ipc_compressed_roundtrip(tmp_path, dataset_series):
+    dump_dataset_series_to_ipc(dataset_series, tmp_path, compression="zstd")
+
+    loaded = load_dataset_series_from_ipc(tmp_path)
+
+    assert loaded["LAB"].data.to_dict(as_series=False) == {
+        "id_sample": ["sample-a", "sample-b"],
+        "chol": [1.2, 3.4],
+    }
+
+
+def test_dataset_series_ipc_roundtrip_with_fsspec_filesystem(dataset_series):
+    fsspec = pytest.importorskip("fsspec")
+    file_system = fsspec.filesystem("memory")
+
+    outputs = dump_dataset_series_to_ipc_filesystem(
+        dataset_series, file_system, "memory-ipc-series"
+    )
+    loaded = load_dataset_series_from_ipc_filesystem(
+        file_system, "memory-ipc-series"
+    )
+
+    assert len(outputs) == 2
+    assert all(path.endswith(".arrow") for path in outputs)
+    assert set(loaded.parts) == {"SAMPLE", "LAB"}
+    assert loaded.resolve_join("LAB", "SAMPLE") is not None
+
+
+def test_dataset_series_ipc_load_rejects_parquet_files(
+    tmp_path, dataset_series
+):
+    pa = pytest.importorskip("pyarrow")
+    outputs = dump_dataset_series_to_parquet(dataset_series, tmp_path)
+
+    with pytest.raises(pa.ArrowInvalid):
+        load_dataset_series_from_ipc(outputs)
+
+
+def test_dataset_series_ipc_load_requires_pypeh_metadata(tmp_path):
+    pl = pytest.importorskip("polars")
+    path = tmp_path / "plain.arrow"
+    pl.DataFrame({"a": [1, 2]}).write_ipc(path)
+
+    with pytest.raises(
+        ValueError,
+        match="Arrow IPC file does not contain pypeh dataset metadata",
+    ):
+        load_dataset_series_from_ipc([path])
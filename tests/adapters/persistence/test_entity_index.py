@@ -0,0 +1,120 @@
+import pytest
+
+from pypeh.adapters.persistence.entity_index import (
+    EntityIndex,
+)
+from pypeh.adapters.persistence.hosts import DirectoryIO
+
+from tests.test_utils.dirutils import get_absolute_path
+
+
+@pytest.mark.core
+class TestEntityIndex:
+    @pytest.fixture(scope="class")
+    def index(self) -> EntityIndex:
+        root = get_absolute_path(
+            "../../core/session/input/default_localfile_data"
+        )
+        return EntityIndex.build(DirectoryIO(root=root))
+
+    def test_locate(self, index):
+        location = index.locate("peh:OBSERVATION_ADULTS_URINE_LAB")
+        assert location is not None
+        assert location.path.endswith("observations.yaml")
+        assert location.entity_type == "Observation"
+
+    def test_locate_by_type(self, index):
+        identifier = "peh:OBSERVATION_ADULTS_URINE_LAB"
+        assert index.locate(identifier, "Observation") is not None
+        assert index.locate(identifier, "ObservationDesign") is None
+
+    def test_nested_entities(self, index):
+        location = index.locate(
+            "TEST_DATA_LAYOUT_SECTION_SUBJECTTIMEPOINT", "DataLayoutSection"
+        )
+        assert location is not None
+        assert location.entity_type is None
+        assert location.path.endswith("multi_connection_datalayout.yaml")
+
+    def test_unknown_identifier(self, index):
+        assert index.locate("peh:DOES_NOT_EXIST") is None
+        assert "peh:DOES_NOT_EXIST" not in index
+
+
+OBSERVABLE_PROPERTIES = """\
+observable_properties:
+- id: prop_a
+  ui_label: "Prop A: é€"
+  unique_name: prop_a
+- id: prop_b
+  ui_label: Prop B
+  unique_name: prop_b
+observation_designs:
+  design_a:
+    observation_result_type: measurement
+"""
+
+
+@pytest.mark.core
+class TestEntityIndexOffsets:
+    @pytest.fixture
+    def repository(self, tmp_path):
+        (tmp_path / "props.yaml").write_text(
+            OBSERVABLE_PROPERTIES, encoding="utf-8"
+        )
+        return DirectoryIO(root=str(tmp_path))
+
+    def test_read_single_entity(self, repository):
+        index = EntityIndex.build(repository)
+        fs = repository.file_system
+        assert index.read_entity(fs, "prop_b") == {
+            "id": "prop_b",
+            "ui_label": "Prop B",
+            "unique_name": "prop_b",
+        }
+        assert index.read_entity(fs, "prop_a")["ui_label"] == "Prop A: é€"
+        assert index.read_entity(fs, "design_a") == {
+            "id": "design_a",
+            "observation_result_type": "measurement",
+        }
+
+    def test_incremental_refresh(self, repository, tmp_path):
+        index = EntityIndex.build(repository)
+        assert index.refresh(repository) == 0
+
+        (tmp_path / "more.yaml").write_text(
+            "observable_properties:\n- id: prop_c\n", encoding="utf-8"
+        )
+        assert index.refresh(repository) == 1
+        assert index.locate("prop_c").path.endswith("more.yaml")
+
+        (tmp_path / "props.yaml").write_text(
+            OBSERVABLE_PROPERTIES.replace("prop_b", "prop_dd"),
+            encoding="utf-8",
+        )
+        assert index.refresh(repository) == 1
+        assert "prop_b" not in index
+        assert index.read_entity(repository.file_system, "prop_dd")
+
+        (tmp_path / "more.yaml").unlink()
+        assert index.refresh(repository) == 1
+        assert "prop_c" not in index
+
+    def test_changed_file_is_reindexed_on_read(self, repository, tmp_path):
+        index = EntityIndex.build(repository)
+        (tmp_path / "props.yaml").write_text(
+            "# a longer header shifts every offset\n" + OBSERVABLE_PROPERTIES,
+            encoding="utf-8",
+        )
+        item = index.read_entity(repository.file_system, "prop_b")
+        assert item["ui_label"] == "Prop B"
+
+    def test_sidecar_roundtrip(self, repository):
+        assert EntityIndex.load(repository) is None
+        index = EntityIndex.build(repository)
+        index.save(repository)
+        loaded = EntityIndex.load(repository)
+        assert loaded.to_json() == index.to_json()
+        assert loaded.refresh(repository) == 0
+        # the sidecar is not picked up as a repository file
+        assert EntityIndex.build(repository).to_json() == index.to_json()
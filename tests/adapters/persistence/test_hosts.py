@@ -116,6 +116,45 @@ class TestDirectoryIO:
             i += 1
         assert i > 1
 
+    @pytest.mark.core
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_walk_parallel_preserves_order(self, provider, executor):
+        source = "config_basic/_Reference_YAML"
+        serial = list(provider.walk(source, format="yaml"))
+        parallel = list(
+            provider.walk(
+                source,
+                format="yaml",
+                max_workers=2,
+                executor=executor,
+                max_in_flight=1,
+            )
+        )
+        assert len(parallel) == len(serial) > 1
+        assert parallel == serial
+
+    @pytest.mark.core
+    def test_walk_parallel_rejects_unknown_executor(self, provider):
+        with pytest.raises(ValueError, match="Unsupported executor"):
+            list(
+                provider.walk("config_basic", max_workers=2, executor="fiber")
+            )
+
+    @pytest.mark.core
+    def test_iter_load_is_lazy(self, provider):
+        source = "config_basic/_Reference_YAML"
+        loaded = provider.iter_load(source, format="yaml", max_workers=2)
+        first = next(loaded)
+        assert isinstance(first, EntityList)
+        loaded.close()
+
+    @pytest.mark.core
+    def test_iter_load_single_file(self, provider):
+        source = "config_basic/_Reference_YAML/observable_entities.yaml"
+        loaded = list(provider.iter_load(source, max_workers=4))
+        assert len(loaded) == 1
+        assert isinstance(loaded[0], EntityList)
+
 
 @pytest.mark.core
 class TestLocalStorageProvider:
@@ -0,0 +1,200 @@
+import json
+import threading
+
+import pytest
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pypeh.adapters.persistence.hosts import WebIO
+from pypeh.adapters.persistence.http_cache import HttpCache, HttpCacheMiss
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # documents and request log live on the server instance
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, dict(self.headers)))
+        content_type = "application/json"
+        document = server.documents.get(self.path)
+        representations = server.negotiated.get(self.path)
+        if representations is not None:
+            # content negotiation on the Accept header
+            content_type = self.headers.get("Accept")
+            document = representations.get(content_type)
+        if document is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body, etag = document
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if representations is not None:
+            self.send_header("Vary", "Accept")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        document = self.server.documents.get(self.path)
+        self.send_response(200 if document else 404)
+        if document:
+            self.send_header("ETag", document[1])
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.requests = []
+    httpd.documents = {
+        f"/doc{i}.json": (json.dumps({"id": i}).encode(), f'"v{i}"')
+        for i in range(6)
+    }
+    httpd.negotiated = {
+        "/negotiated": {
+            "text/turtle": (b"<a> <b> <c> .", '"ttl"'),
+            "application/ld+json": (b'{"@id": "a"}', '"jsonld"'),
+        }
+    }
+    thread = threading.Thread(
+        target=httpd.serve_forever, args=(0.01,), daemon=True
+    )
+    thread.start()
+    host, port = httpd.server_address
+    httpd.base_url = f"http://{host}:{port}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.mark.core
+class TestHttpCache:
+    def test_content_addressed_storage(self, tmp_path):
+        cache = HttpCache(tmp_path)
+        a = cache.store("http://a", b"same", {"ETag": '"1"'})
+        b = cache.store("http://b", b"same", {})
+        assert a.content_hash == b.content_hash
+        assert len(list((tmp_path / "objects").rglob("*"))) == 2
+        assert cache.get("http://a").etag == '"1"'
+        assert cache.read(cache.get("http://b")) == b"same"
+        assert cache.get("http://c") is None
+
+    def test_vary(self, tmp_path):
+        cache = HttpCache(tmp_path)
+        cache.store(
+            "http://a",
+            b"nl",
+            {"Vary": "accept-language"},
+            {"Accept": "text/html", "Accept-Language": "nl"},
+        )
+        assert cache.get("http://a") is None
+        assert cache.get("http://a", {"accept": "text/html"}) is None
+        entry = cache.get(
+            "http://a", {"Accept": "text/html", "Accept-Language": "nl"}
+        )
+        assert cache.read(entry) == b"nl"
+        assert (
+            cache.get(
+                "http://a", {"Accept": "text/html", "Accept-Language": "en"}
+            )
+            is None
+        )
+        assert cache.store("http://b", b"any", {"Vary": "*"}) is None
+        assert cache.get("http://b") is None
+
+
+@pytest.mark.core
+class TestWebIOCache:
+    def test_conditional_get(self, server, tmp_path):
+        url = f"{server.base_url}/doc1.json"
+        web_io = WebIO(http_cache=tmp_path)
+        assert web_io.retrieve_data(url) == {"id": 1}
+        assert web_io.retrieve_data(url) == {"id": 1}
+        assert len(server.requests) == 2
+        assert "If-None-Match" not in server.requests[0][1]
+        assert server.requests[1][1]["If-None-Match"] == '"v1"'
+
+    def test_changed_document_is_replaced(self, server, tmp_path):
+        url = f"{server.base_url}/doc1.json"
+        web_io = WebIO(http_cache=tmp_path)
+        web_io.retrieve_data(url)
+        server.documents["/doc1.json"] = (b'{"id": 10}', '"v10"')
+        assert web_io.retrieve_data(url) == {"id": 10}
+        entry = HttpCache(tmp_path).get(url, web_io.session.headers)
+        assert entry.etag == '"v10"'
+
+    def test_content_negotiation(self, server, tmp_path):
+        url = f"{server.base_url}/negotiated"
+        web_io = WebIO(http_cache=tmp_path)
+        assert web_io.fetch(url, format_type="text/turtle") == (
+            b"<a> <b> <c> .",
+            "text/turtle",
+        )
+        assert web_io.fetch(url, format_type="application/ld+json") == (
+            b'{"@id": "a"}',
+            "application/ld+json",
+        )
+        assert "If-None-Match" not in server.requests[1][1]
+
+        assert web_io.fetch(url, format_type="text/turtle") == (
+            b"<a> <b> <c> .",
+            "text/turtle",
+        )
+        assert server.requests[2][1]["If-None-Match"] == '"ttl"'
+        offline = WebIO(http_cache=tmp_path, cache_mode="cache_only")
+        assert offline.fetch(url, format_type="application/ld+json") == (
+            b'{"@id": "a"}',
+            "application/ld+json",
+        )
+
+    def test_cache_only(self, server, tmp_path):
+        url = f"{server.base_url}/doc2.json"
+        WebIO(http_cache=tmp_path).retrieve_data(url)
+        offline = WebIO(http_cache=tmp_path, cache_mode="cache_only")
+        server.requests.clear()
+        assert offline.retrieve_data(url) == {"id": 2}
+        assert server.requests == []
+        with pytest.raises(HttpCacheMiss):
+            offline.retrieve_data(f"{server.base_url}/doc3.json")
+
+    def test_refresh(self, server, tmp_path):
+        url = f"{server.base_url}/doc2.json"
+        WebIO(http_cache=tmp_path).retrieve_data(url)
+        WebIO(http_cache=tmp_path, cache_mode="refresh").retrieve_data(url)
+        assert "If-None-Match" not in server.requests[-1][1]
+
+    def test_invalid_cache_mode(self):
+        with pytest.raises(ValueError, match="cache_mode"):
+            WebIO(cache_mode="offline")
+
+    def test_get_metadata_etag(self, server):
+        metadata = WebIO().get_metadata(f"{server.base_url}/doc4.json")
+        assert metadata["etag"] == '"v4"'
+
+
+@pytest.mark.core
+class TestWebIOResolveMany:
+    def test_resolve_many(self, server, tmp_path):
+        urls = [f"{server.base_url}/doc{i}.json" for i in range(6)]
+        web_io = WebIO(http_cache=tmp_path)
+        results = web_io.resolve_many(urls + urls[:2], max_concurrency=3)
+        assert list(results) == urls
+        assert [result["id"] for result in results.values()] == list(range(6))
+        assert len(server.requests) == 6
+
+    def test_return_exceptions(self, server):
+        urls = [f"{server.base_url}/doc0.json", f"{server.base_url}/missing"]
+        results = WebIO(max_retries=0).resolve_many(
+            urls, format_type="json", return_exceptions=True
+        )
+        assert results[urls[0]] == {"id": 0}
+        assert isinstance(results[urls[1]], Exception)
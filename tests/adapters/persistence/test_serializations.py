@@ -7,7 +7,9 @@ import rdflib
 from peh_model.peh import EntityList
 from pydantic import BaseModel
 
+from pypeh.adapters.persistence import serializations
 from pypeh.core.cache.containers import CacheContainer, CacheContainerFactory
+from pypeh.core.models.proxy import TypedLazyProxy
 from pypeh.core.models.constants import ValidationErrorLevel
 from pypeh.core.models.validation_errors import (
     TypeCastError,
@@ -100,6 +102,51 @@ class TestYamlIO:
             data = yaml_io.load(f)
         assert isinstance(data, EntityList)
 
+    def test_trusted_defers_validation(self):
+        source = get_absolute_path(
+            "./input/config_basic/_Reference_YAML/observable_properties.yaml"
+        )
+        yaml_io = YamlIO()
+        eager = yaml_io.load(source)
+        roots = yaml_io.load(source, trusted=True)
+
+        assert isinstance(roots, list)
+        assert all(isinstance(root, TypedLazyProxy) for root in roots)
+        assert len(roots) == len(eager.observable_properties)
+
+        cache = CacheContainerFactory.new()
+        cache.unpack_entity_list(roots)
+        for observable_property in eager.observable_properties:
+            loaded = cache.get(observable_property.id, "ObservableProperty")
+            assert loaded == observable_property
+
+    def test_trusted_keeps_non_entity_slots_eager(self):
+        yaml_io = YamlIO()
+        roots = yaml_io.load(
+            io.StringIO(
+                "observable_properties:\n"
+                "  - id: prop_a\n"
+                "    ui_label: a\n"
+                "observed_values:\n"
+                "  - value: '1'\n"
+            ),
+            trusted=True,
+        )
+        assert isinstance(roots[0], EntityList)
+        assert len(roots[0].observed_values) == 1
+        assert [root.id for root in roots[1:]] == ["prop_a"]
+
+    def test_trusted_proxies_are_picklable(self):
+        import pickle
+
+        yaml_io = YamlIO()
+        roots = yaml_io.load(
+            io.StringIO("observable_properties:\n  - id: prop_a\n"),
+            trusted=True,
+        )
+        restored = pickle.loads(pickle.dumps(roots))
+        assert restored[0].resolve().id == "prop_a"
+
 
 @pytest.mark.core
 class TestJsonIO:
@@ -110,6 +157,26 @@ class TestJsonIO:
             data = json_io.load(f)
         assert isinstance(data, EntityList)
 
+    def test_without_orjson(self, monkeypatch):
+        source = get_absolute_path("./input/observation_results.json")
+        json_io = JsonIO()
+        with open(source, "r") as f:
+            expected = json_io.load(f)
+        monkeypatch.setattr(serializations, "orjson", None)
+        with open(source, "r") as f:
+            data = json_io.load(f)
+        assert data == expected
+
+    def test_trusted_from_string(self):
+        json_io = JsonIO()
+        roots = json_io.load(
+            '{"observable_properties": {"prop_a": {"ui_label": "a"}}}',
+            trusted=True,
+        )
+        assert len(roots) == 1
+        assert roots[0].id == "prop_a"
+        assert roots[0].resolve().ui_label == "a"
+
 
 @pytest.mark.dataframe
 class TestCsvIO:
@@ -78,3 +78,208 @@ class TestCache:
         assert len(ret.observations) > 0
         assert isinstance(ret.observable_properties, list)
         assert len(ret.observable_properties) > 0
+
+
+@pytest.mark.core
+class TestDeferredEntities:
+    @staticmethod
+    def _layout_proxy(loads: list):
+        from peh_model.peh import DataLayout
+
+        from pypeh.core.models.proxy import TypedLazyProxy
+
+        raw = {
+            "id": "layout_a",
+            "sections": [
+                {"id": "section_a", "ui_label": "A"},
+                {"id": "section_b", "ui_label": "B"},
+            ],
+        }
+
+        def loader():
+            loads.append(raw["id"])
+            return DataLayout(**raw)
+
+        return TypedLazyProxy(
+            "layout_a",
+            DataLayout,
+            loader=loader,
+            nested_identifiers=("section_a", "section_b"),
+        )
+
+    def test_proxy_materialised_on_first_get(self):
+        from peh_model.peh import DataLayout
+
+        loads = []
+        container = CacheContainerFactory.new()
+        container.add(self._layout_proxy(loads))
+        assert loads == []
+        assert container.exists("layout_a")
+
+        layout = container.get("layout_a", "DataLayout")
+        assert isinstance(layout, DataLayout)
+        assert container.get("layout_a", "DataLayout") is layout
+        assert loads == ["layout_a"]
+
+    def test_nested_lookup_loads_parent(self):
+        from peh_model.peh import DataLayoutSection
+
+        loads = []
+        container = CacheContainerFactory.new()
+        container.add(self._layout_proxy(loads))
+        assert container.exists("section_b", "DataLayoutSection")
+
+        section = container.get("section_b", "DataLayoutSection")
+        assert isinstance(section, DataLayoutSection)
+        assert loads == ["layout_a"]
+        assert len(container) == 3
+
+    def test_get_all_resolves_deferred_nested_entities(self):
+        loads = []
+        container = CacheContainerFactory.new()
+        container.add(self._layout_proxy(loads))
+
+        sections = list(container.get_all("DataLayoutSection"))
+        assert {section.id for section in sections} == {
+            "section_a",
+            "section_b",
+        }
+        assert loads == ["layout_a"]
+
+    def test_pop_drops_deferred_nested_entities(self):
+        loads = []
+        container = CacheContainerFactory.new()
+        container.add(self._layout_proxy(loads))
+        container.pop("layout_a", "DataLayout")
+
+        assert not container.exists("section_a", "DataLayoutSection")
+        assert container.get("section_a", "DataLayoutSection") is None
+        assert list(container.get_all("DataLayoutSection")) == []
+        assert loads == []
+
+
+@pytest.mark.core
+class TestIndexedContainer:
+    @pytest.fixture(scope="class")
+    def containers(self):
+        source = get_absolute_path("../../input/roundtrip")
+        roots = DirectoryIO().load(source, format="yaml")
+        mapping = CacheContainerFactory.new("mapping")
+        indexed = CacheContainerFactory.new("indexed")
+        for root in roots:
+            for entity in load_entities_from_tree(root):
+                mapping.add(entity)
+                indexed.add(entity)
+        return mapping, indexed
+
+    def test_factory(self):
+        from pypeh.core.cache.containers import (
+            IndexedContainer,
+            MappingContainer,
+        )
+
+        assert isinstance(CacheContainerFactory.new(), MappingContainer)
+        assert isinstance(
+            CacheContainerFactory.new("indexed"), IndexedContainer
+        )
+        with pytest.raises(ValueError, match="Registered types"):
+            CacheContainerFactory.new("unknown")
+
+    def test_slots(self):
+        container = CacheContainerFactory.new("indexed")
+        assert not hasattr(container, "__dict__")
+
+    def test_same_content_as_mapping(self, containers):
+        mapping, indexed = containers
+        assert len(indexed) == len(mapping)
+        for entity_type in ("Observation", "ObservableProperty"):
+            assert {e.id for e in indexed.get_all(entity_type)} == {
+                e.id for e in mapping.get_all(entity_type)
+            }
+        for entity in mapping.get_all():
+            assert indexed.get(entity.id, type(entity).__name__) is entity
+        assert indexed.get("missing", "Observation") is None
+
+    def test_reverse_indexes_match_scan(self, containers):
+        mapping, indexed = containers
+        observations = list(mapping.get_all("Observation"))
+        assert len(observations) > 0
+        for observation in observations:
+            design_id = indexed.get_observation_design_id(observation.id)
+            assert design_id == observation.observation_design
+            assert design_id == mapping.get_observation_design_id(
+                observation.id
+            )
+
+    @pytest.mark.parametrize("container_type", ["mapping", "indexed"])
+    def test_view_observation_design(self, container_type, monkeypatch):
+        container = CacheContainerFactory.new(container_type)
+        container.add(ObservationDesign(id="design_a"))
+        container.add(ObservationDesign(id="design_b"))
+        container.add(Observation(id="obs_a", observation_design="design_a"))
+        view = CacheContainerView(container)
+
+        cached = view.get("obs_a", "Observation")
+        lookups = []
+        get = type(container).get
+
+        def record_get(self, entity_id, entity_type=None):
+            lookups.append(entity_id)
+            return get(self, entity_id, entity_type)
+
+        monkeypatch.setattr(type(container), "get", record_get)
+        assert view.get_observation_design(cached).id == "design_a"
+        # the design is looked up once, not the observation first
+        assert lookups == ["design_a"]
+        # observations that are not cached resolve their own reference
+        uncached = Observation(id="obs_b", observation_design="design_b")
+        assert view.get_observation_design(uncached).id == "design_b"
+        assert view.get_observation_design(Observation(id="obs_c")) is None
+
+    def test_derived_from_and_pop(self):
+        from peh_model.peh import DerivedObservation
+
+        container = CacheContainerFactory.new("indexed")
+        container.add(ObservationDesign(id="design_a"))
+        container.add(Observation(id="obs_a", observation_design="design_a"))
+        container.add(
+            DerivedObservation(
+                id="obs_b",
+                observation_design="design_a",
+                was_derived_from="obs_a",
+            )
+        )
+        view = CacheContainerView(container)
+        assert view.get_derived_from_id("obs_b") == "obs_a"
+        assert view.get_derived_from_id("obs_a") is None
+        assert view.get_observation_design_id("obs_b") == "design_a"
+
+        container.pop("obs_b", "DerivedObservation")
+        assert container.get_derived_from_id("obs_b") is None
+        assert list(container.get_all("DerivedObservation")) == []
+
+    def test_deferred_observation_is_indexed_on_load(self):
+        from pypeh.core.models.proxy import TypedLazyProxy
+
+        loads = []
+
+        def loader():
+            loads.append("obs_a")
+            return Observation(id="obs_a", observation_design="design_a")
+
+        container = CacheContainerFactory.new("indexed")
+        container.add(TypedLazyProxy("obs_a", Observation, loader=loader))
+        assert loads == []
+        assert container.get_observation_design_id("obs_a") == "design_a"
+        assert loads == ["obs_a"]
+
+
+@pytest.mark.core
+class TestIndexedDeferredEntities(TestDeferredEntities):
+    @pytest.fixture(autouse=True)
+    def indexed_default(self, monkeypatch):
+        from pypeh.core.cache.containers import IndexedContainer
+
+        monkeypatch.setattr(
+            CacheContainerFactory, "_default_container", IndexedContainer
+        )
@@ -0,0 +1,194 @@
+import io
+import json
+
+import pytest
+
+import pickle
+
+from peh_model.peh import DataLayout, DataLayoutSection, ObservableProperty
+
+from pypeh.core.cache.containers import CacheContainerFactory
+from pypeh.core.cache.snapshot import (
+    SNAPSHOT_MAGIC,
+    SnapshotContainer,
+    dump_snapshot,
+    load_snapshot,
+    parse_snapshot_header,
+)
+from pypeh.core.cache.utils import load_entities_from_tree
+from pypeh.adapters.persistence.hosts import DirectoryIO
+
+from tests.test_utils.dirutils import get_absolute_path
+
+
+def _rewrite_header(data: bytes, **changes) -> bytes:
+    header, body_start = parse_snapshot_header(data)
+    metadata = header.to_metadata()
+    metadata.update(changes)
+    header_bytes = json.dumps(metadata, sort_keys=True).encode("utf-8")
+    return (
+        SNAPSHOT_MAGIC
+        + len(header_bytes).to_bytes(4, "little")
+        + header_bytes
+        + data[body_start:]
+    )
+
+
+@pytest.mark.core
+class TestSnapshot:
+    @pytest.fixture(scope="class")
+    def container(self):
+        source = get_absolute_path("../../input/roundtrip")
+        container = CacheContainerFactory.new()
+        roots = DirectoryIO().load(source, format="yaml")
+        for root in roots:
+            for entity in load_entities_from_tree(root):
+                container.add(entity)
+        return container
+
+    @pytest.fixture(scope="class")
+    def snapshot(self, container):
+        buffer = io.BytesIO()
+        dump_snapshot(container, buffer)
+        return buffer.getvalue()
+
+    def test_roundtrip(self, container, snapshot):
+        loaded = load_snapshot(io.BytesIO(snapshot))
+        assert len(loaded) == len(container)
+        for entity in container.get_all():
+            entity_type = type(entity).__name__
+            assert loaded.get(entity.id, entity_type) == entity
+
+    def test_header(self, container, snapshot):
+        header, _ = parse_snapshot_header(snapshot)
+        assert header.entity_count == len(container)
+        assert header.content_hash.startswith("sha256:")
+
+    def test_nested_entities_share_identity(self):
+        section = DataLayoutSection(id="section_a", ui_label="A")
+        layout = DataLayout(id="layout_a", sections=[section])
+        container = CacheContainerFactory.new()
+        container.add(layout)
+        container.add(section)
+
+        buffer = io.BytesIO()
+        header = dump_snapshot(container, buffer)
+        assert header.entity_count == 2
+        assert header.record_count == 1
+
+        loaded = load_snapshot(io.BytesIO(buffer.getvalue()))
+        loaded_layout = loaded.get("layout_a", "DataLayout")
+        loaded_section = loaded.get("section_a", "DataLayoutSection")
+        assert loaded_section == section
+        assert loaded_layout.sections[0] is loaded_section
+
+    def test_corrupt_content_is_rejected(self, snapshot):
+        tampered = bytearray(snapshot)
+        tampered[-2] ^= 0xFF
+        with pytest.raises(ValueError, match="hash mismatch"):
+            load_snapshot(io.BytesIO(bytes(tampered)))
+
+    def test_truncated_snapshot_is_rejected(self, snapshot):
+        with pytest.raises(ValueError, match="truncated"):
+            load_snapshot(io.BytesIO(snapshot[:-10]))
+
+    def test_not_a_snapshot(self):
+        with pytest.raises(ValueError, match="Not a pypeh cache snapshot"):
+            load_snapshot(io.BytesIO(b"id: not_a_snapshot\n"))
+
+    def test_version_mismatch(self, snapshot):
+        with pytest.raises(ValueError, match="Unsupported snapshot version"):
+            load_snapshot(io.BytesIO(_rewrite_header(snapshot, version=99)))
+
+    def test_peh_model_mismatch(self, snapshot):
+        data = _rewrite_header(snapshot, peh_model_version="0.0.0-other")
+        with pytest.raises(ValueError, match="Rebuild the snapshot"):
+            load_snapshot(io.BytesIO(data))
+        loaded = load_snapshot(io.BytesIO(data), check_peh_model_version=False)
+        assert len(loaded) > 0
+
+
+@pytest.mark.core
+class TestSnapshotContainer:
+    @pytest.fixture(scope="class")
+    def source(self):
+        source = get_absolute_path("../../input/roundtrip")
+        container = CacheContainerFactory.new()
+        for root in DirectoryIO().load(source, format="yaml"):
+            for entity in load_entities_from_tree(root):
+                container.add(entity)
+        return container
+
+    @pytest.fixture
+    def path(self, source, tmp_path):
+        path = tmp_path / "cache.snapshot"
+        with open(path, "wb") as f:
+            dump_snapshot(source, f)
+        return path
+
+    def test_lazy_lookup(self, source, path):
+        with SnapshotContainer(path) as container:
+            assert len(container) == len(source)
+            assert container._decoded == {}
+            observation = next(source.get_all("Observation"))
+            assert container.exists(observation.id, "Observation")
+            assert container.get(observation.id, "Observation") == observation
+            assert len(container._decoded) < len(source)
+            assert {e.id for e in container.get_all("Observation")} == {
+                e.id for e in source.get_all("Observation")
+            }
+
+    def test_nested_entities_share_identity(self, tmp_path):
+        section = DataLayoutSection(id="section_a", ui_label="A")
+        container = CacheContainerFactory.new()
+        container.add(DataLayout(id="layout_a", sections=[section]))
+        container.add(section)
+        path = tmp_path / "layout.snapshot"
+        with open(path, "wb") as f:
+            dump_snapshot(container, f)
+
+        with SnapshotContainer(path) as shared:
+            loaded_section = shared.get("section_a", "DataLayoutSection")
+            layout = shared.get("layout_a", "DataLayout")
+            assert layout.sections[0] is loaded_section
+
+    def test_overlay_and_pop(self, source, path):
+        with SnapshotContainer(path) as container:
+            added = ObservableProperty(id="overlay_property", ui_label="x")
+            container.add(added)
+            assert container.get("overlay_property") is added
+            assert len(container) == len(source) + 1
+
+            observation = next(source.get_all("Observation"))
+            popped = container.pop(observation.id, "Observation")
+            assert popped == observation
+            assert not container.exists(observation.id)
+            assert container.get(observation.id) is None
+            assert len(container) == len(source)
+
+            container.clear()
+            assert len(container) == 0
+            assert list(container.get_all()) == []
+
+    def test_pickle_reopens_file(self, source, path):
+        with SnapshotContainer(path) as container:
+            container.add(ObservableProperty(id="overlay_property"))
+            clone = pickle.loads(pickle.dumps(container))
+        with clone:
+            assert clone.path == str(path)
+            assert len(clone) == len(source) + 1
+            assert clone.exists("overlay_property")
+
+    def test_pack_entity_list(self, source, path):
+        with SnapshotContainer(path) as container:
+            packed = container.pack_entity_list()
+        assert len(packed.observations) == len(
+            list(source.get_all("Observation"))
+        )
+
+    def test_corrupt_snapshot_is_rejected(self, path):
+        data = bytearray(path.read_bytes())
+        data[-2] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="hash mismatch"):
+            SnapshotContainer(path)
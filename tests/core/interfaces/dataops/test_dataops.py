@@ -21,6 +21,7 @@ from pypeh.core.cache.containers import (
 from pypeh.core.cache.utils import load_entities_from_tree
 from pypeh.core.interfaces.dataops import (
     DataOpsInterface,
+    JoinPlan,
     T_DataType,
     ValidationInterface,
 )
@@ -31,8 +32,12 @@ from pypeh.core.models.internal_data_layout import (
     DatasetSeries,
     ElementReference,
     ForeignKey,
+    JoinSpec,
 )
 from pypeh.core.models.validation_errors import ValidationErrorReport
+from pypeh.core.utils.execution import ExecutionSettings, execution_settings
+from pypeh.core.utils.profiling import profile
+from pypeh.core.utils.query_plans import explain
 from pypeh.core.models.constants import (
     ObservablePropertyValueType,
     ValidationErrorLevel,
@@ -78,6 +83,7 @@ class DataOpsProtocol(Protocol, Generic[T_DataType]):
         dataset_series: DatasetSeries[T_DataType],
         *,
         new_label: str | None = None,
+        lazy: bool = False,
     ) -> DatasetSeries[T_DataType]: ...
 
     def enrich(
@@ -1030,9 +1036,11 @@ class TestEnrichment(abc.ABC):
         """Return the adapter implementation to test."""
         raise NotImplementedError
 
-    def container(self, path: str) -> CacheContainerView:
+    def container(
+        self, path: str, cache_container: str | None = None
+    ) -> CacheContainerView:
         source = get_absolute_path(path)
-        container = CacheContainerFactory.new()
+        container = CacheContainerFactory.new(cache_container)
         host = DirectoryIO()
         roots = host.load(source, format="yaml", maxdepth=3)
         for root in roots:
@@ -1086,10 +1094,10 @@ class TestEnrichment(abc.ABC):
         )
         assert isinstance(ret, ExecutionPlan)
 
-    def test_dependency_graph_compilation(self):
+    def enrich(self, cache_container: str | None = None):
         data_import_config_id = "peh:ENRICHMENT_TEST_IMPORT_CONFIG"
         src_path = "./input/ProcessingExamples/Enrichment_03_MULTI_STEP"
-        cache_view = self.container(src_path)
+        cache_view = self.container(src_path, cache_container)
         dataset_series = self.raw_dataset_series(
             data_import_config_id=data_import_config_id, cache_view=cache_view
         )
@@ -1119,7 +1127,10 @@ class TestEnrichment(abc.ABC):
             ],
             cache_view=cache_view,
         )
+        return adapter, dataset_series
 
+    def test_dependency_graph_compilation(self):
+        adapter, dataset_series = self.enrich()
         enriched_data = {}
         for dataset_label in dataset_series:
             dataset = dataset_series[dataset_label]
@@ -1261,6 +1272,312 @@ class TestDataFrameDataOps(
             split_series_data[dataset_label] = dataset.data
         assert adapter.matches_schema(split_series_data, split_series)
 
+    def test_split_by_observation_multi_hop_join(self):
+        import polars as pl
+
+        adapter = self.get_adapter()
+        dataset_series = DatasetSeries(label="multi_hop")
+        # subject <- sample <- measurement, the observation spans subject
+        # and measurement only
+        for label, elements in (
+            ("subject", [("id", True), ("age", False)]),
+            ("sample", [("id", True), ("subject_id", False)]),
+            ("measurement", [("sample_id", False), ("value", False)]),
+        ):
+            dataset = dataset_series.add_empty_dataset(label)
+            for element_label, is_primary_key in elements:
+                dataset.add_observable_property(
+                    observable_property_id=f"{label}_{element_label}",
+                    data_type=ObservablePropertyValueType.STRING,
+                    element_label=element_label,
+                    is_primary_key=is_primary_key,
+                )
+        dataset_series["sample"].schema.add_foreign_key_link(
+            "subject_id", "subject", "id"
+        )
+        dataset_series["measurement"].schema.add_foreign_key_link(
+            "sample_id", "sample", "id"
+        )
+        dataset_series["subject"].add_observation_to_index("obs:1")
+        dataset_series["measurement"].add_observation_to_index("obs:1")
+        for label, element_label in (
+            ("subject", "id"),
+            ("subject", "age"),
+            ("measurement", "value"),
+        ):
+            dataset_series._register_observable_property(
+                f"{label}_{element_label}", "obs:1", label, element_label
+            )
+
+        dataset_series["subject"].data = pl.DataFrame(
+            {"id": ["s1", "s2"], "age": ["40", "50"]}
+        )
+        dataset_series["sample"].data = pl.DataFrame(
+            {"id": ["x1", "x2"], "subject_id": ["s2", "s1"]}
+        )
+        dataset_series["measurement"].data = pl.DataFrame(
+            {"sample_id": ["x1", "x2"], "value": ["1.5", "2.5"]}
+        )
+
+        split_series = adapter.split_by_observation(dataset_series)
+        dataset = split_series["obs:1"]
+        assert dataset is not None
+        assert dataset.metadata["source_datasets"] == [
+            "measurement",
+            "subject",
+        ]
+        _, value_label = split_series.context_lookup(
+            "obs:1", "measurement_value"
+        )
+        _, id_label = split_series.context_lookup("obs:1", "subject_id")
+        result = dataset.data.sort(id_label)
+        assert result.width == 3
+        assert result.get_column(id_label).to_list() == ["s1", "s2"]
+        assert result.get_column(value_label).to_list() == ["2.5", "1.5"]
+
+    def test_split_by_observation_shares_joins(self, monkeypatch):
+        import polars as pl
+
+        adapter = self.get_adapter()
+        dataset_series = DatasetSeries(label="shared_join")
+        subject = dataset_series.add_empty_dataset("subject")
+        sample = dataset_series.add_empty_dataset("sample")
+        for element_label in ("id", "age", "sex"):
+            subject.add_observable_property(
+                observable_property_id=f"subject_{element_label}",
+                data_type=ObservablePropertyValueType.STRING,
+                element_label=element_label,
+                is_primary_key=element_label == "id",
+            )
+        for element_label in ("subject_id", "age", "weight"):
+            sample.add_observable_property(
+                observable_property_id=f"sample_{element_label}",
+                data_type=ObservablePropertyValueType.STRING,
+                element_label=element_label,
+            )
+        sample.schema.add_foreign_key_link("subject_id", "subject", "id")
+        # both observations span subject and sample, with different fields
+        for observation_id, refs in (
+            (
+                "obs:1",
+                [("subject", "id"), ("subject", "age"), ("sample", "age")],
+            ),
+            (
+                "obs:2",
+                [("subject", "id"), ("subject", "sex"), ("sample", "weight")],
+            ),
+        ):
+            for label in ("subject", "sample"):
+                dataset_series[label].add_observation_to_index(observation_id)
+            for label, element_label in refs:
+                dataset_series._register_observable_property(
+                    f"{label}_{element_label}",
+                    observation_id,
+                    label,
+                    element_label,
+                )
+        subject.data = pl.DataFrame(
+            {"id": ["s1", "s2"], "age": ["40", "50"], "sex": ["F", "M"]}
+        )
+        sample.data = pl.DataFrame(
+            {
+                "subject_id": ["s2", "s1"],
+                "age": ["1", "2"],
+                "weight": ["3", "4"],
+            }
+        )
+
+        join_plans = []
+        execute_join_plan = adapter.execute_join_plan
+
+        def record_join_plan(*args, join_plan, **kwargs):
+            join_plans.append(join_plan)
+            return execute_join_plan(*args, join_plan=join_plan, **kwargs)
+
+        monkeypatch.setattr(adapter, "execute_join_plan", record_join_plan)
+        split_series = adapter.split_by_observation(dataset_series)
+        assert len(join_plans) == 1
+
+        # output labels are the same as when splitting a single observation
+        assert split_series["obs:1"].get_element_labels() == [
+            "id",
+            "subject__age",
+            "age",
+        ]
+        assert split_series["obs:1"].data.columns == [
+            "age",
+            "subject__age",
+            "id",
+        ]
+        assert split_series["obs:2"].get_element_labels() == [
+            "id",
+            "sex",
+            "weight",
+        ]
+        assert split_series["obs:2"].data.sort("id").rows() == [
+            ("4", "s1", "F"),
+            ("3", "s2", "M"),
+        ]
+
+        with explain() as report:
+            lazy_series = adapter.split_by_observation(
+                dataset_series, lazy=True
+            )
+        assert len(join_plans) == 2
+        # the shared join is collected once for the group
+        assert [
+            plan.operation for plan in report.plans if "JOIN" in plan.plan
+        ] == ["normalize_output"]
+        for observation_id in ("obs:1", "obs:2"):
+            lazy_data = lazy_series[observation_id].data
+            assert isinstance(lazy_data, pl.LazyFrame)
+            assert "JOIN" not in lazy_data.explain()
+            assert lazy_data.collect().equals(
+                split_series[observation_id].data
+            )
+
+    def _join_plan(self, **kwargs) -> JoinPlan:
+        return JoinPlan.from_join_specs(
+            base_dataset_label="base",
+            join_specs=[
+                JoinSpec(
+                    left_elements=("key",),
+                    left_dataset="base",
+                    right_elements=("key",),
+                    right_dataset="lookup",
+                )
+            ],
+            required_fields_by_dataset={"lookup": {"value"}},
+            **kwargs,
+        )
+
+    def test_execute_join_plan_semi_join(self):
+        import polars as pl
+
+        adapter = self.get_adapter()
+        base = pl.DataFrame({"key": [3, 1, 3]})
+        lookup = pl.DataFrame({"key": range(100), "value": range(100, 200)})
+        join_plan = self._join_plan()
+        result = adapter.execute_join_plan(base, {"lookup": lookup}, join_plan)
+        assert result.get_column("value").to_list() == [103, 101, 103]
+        (diagnostics,) = join_plan.diagnostics
+        assert diagnostics.left_rows == 3
+        assert diagnostics.right_rows == 100
+        assert diagnostics.prefiltered_right_rows == 2
+        assert diagnostics.output_rows == 3
+
+        lazy_plan = self._join_plan()
+        lazy_result = adapter.execute_join_plan(
+            base.lazy(), {"lookup": lookup}, lazy_plan
+        )
+        assert lazy_result.collect().equals(result)
+        assert lazy_plan.diagnostics[0].output_rows is None
+
+    def test_execute_join_plan_duplicate_keys(self, caplog):
+        import logging
+
+        import polars as pl
+
+        caplog.set_level(logging.DEBUG)
+        adapter = self.get_adapter()
+        base = pl.DataFrame({"key": [1, 2]})
+        lookup = pl.DataFrame({"key": [1, 1, 2], "value": [1, 2, 3]})
+        join_plan = self._join_plan()
+        result = adapter.execute_join_plan(base, {"lookup": lookup}, join_plan)
+        assert result.height == 3
+        (record,) = [
+            record
+            for record in caplog.records
+            if "increased the row count from 2 to 3" in record.getMessage()
+        ]
+        assert record.levelno == logging.DEBUG
+
+        caplog.clear()
+        declared_plan = self._join_plan(unique_key_datasets={"lookup"})
+        adapter.execute_join_plan(base, {"lookup": lookup}, declared_plan)
+        assert "increased the row count" not in caplog.text
+
+        enforced_plan = self._join_plan(enforce_unique_keys=True)
+        with pytest.raises(ValueError, match="not unique"):
+            adapter.execute_join_plan(base, {"lookup": lookup}, enforced_plan)
+
+    def test_profile_with_streaming_engine(self, caplog):
+        import polars as pl
+
+        adapter = self.get_adapter()
+        data = pl.LazyFrame({"key": [1, 2]})
+        with execution_settings(ExecutionSettings(engine="streaming")):
+            with explain(profile=True) as report:
+                result = adapter.normalize_output(data)
+        assert result.equals(data.collect())
+        (plan,) = report.plans
+        assert plan.node_timings is not None
+        assert "instead of the streaming engine" in caplog.text
+
+        caplog.clear()
+        with execution_settings(ExecutionSettings(engine="in-memory")):
+            with explain(profile=True):
+                adapter.normalize_output(data)
+        assert "instead of" not in caplog.text
+
+    def test_subset_by_id_group(self):
+        import polars as pl
+
+        pa = pytest.importorskip("pyarrow")
+        adapter = self.get_adapter()
+        data = pl.DataFrame(
+            {
+                "study": ["s1", "s1", "s2", "s2"],
+                "id": [1, 2, 1, 2],
+                "value": [10.0, 20.0, 30.0, 40.0],
+            }
+        )
+        identifying_elements = ["study", "id"]
+        expected = [20.0, 30.0]
+        id_groups = [
+            [("s2", 1), ("s1", 2), ("s3", 1)],
+            pl.DataFrame({"a": ["s2", "s1"], "b": [1, 2]}),
+            pl.LazyFrame({"study": ["s1", "s2"], "id": [2, 1]}),
+            # dtypes are cast to those of data
+            pa.table(
+                {"study": ["s1", "s2"], "id": pa.array([2, 1], pa.int8())}
+            ),
+        ]
+        for id_group in id_groups:
+            result = adapter.subset(
+                data,
+                element_group=["value"],
+                id_group=id_group,
+                identifying_elements=identifying_elements,
+            )
+            assert result.get_column("value").to_list() == expected
+
+        lazy_result = adapter.subset(
+            data.lazy(),
+            element_group=["value"],
+            id_group=id_groups[0],
+            identifying_elements=identifying_elements,
+        )
+        assert lazy_result.collect().get_column("value").to_list() == expected
+
+        with pytest.raises(ValueError, match="id_group has 1 columns"):
+            adapter.subset(
+                data,
+                element_group=["value"],
+                id_group=pl.DataFrame({"id": [1]}),
+                identifying_elements=identifying_elements,
+            )
+
+    def test_get_element_values_as_series(self):
+        import polars as pl
+
+        adapter = self.get_adapter()
+        data = pl.DataFrame({"id": [1, 2, 2]})
+        series = adapter.get_element_values(data, "id", as_series=True)
+        assert isinstance(series, pl.Series)
+        assert series.to_list() == [1, 2, 2]
+        assert adapter.get_element_values(data.lazy(), "id") == {1, 2}
+
 
 @pytest.mark.dataframe
 class TestDataFrameEnrichment(TestEnrichment):
@@ -1276,6 +1593,64 @@ class TestDataFrameEnrichment(TestEnrichment):
         except ImportError:
             pytest.skip("Necessary modules not installed")
 
+    def test_enrich_explain(self):
+        with explain() as report:
+            _, dataset_series = self.enrich()
+        plans = report.for_dataset("SUBJECTUNIQUE")
+        assert len(plans) == 1
+        assert plans[0].operation == "normalize_output"
+        assert plans[0].node_timings is None
+        assert not plans[0].has_cross_join
+        assert all(plan.dataset_label is not None for plan in report.plans)
+        assert "SUBJECTUNIQUE" in report.format()
+
+    def test_enrich_indexed_container(self):
+        _, mapping = self.enrich()
+        _, indexed = self.enrich(cache_container="indexed")
+        for dataset_label in mapping:
+            assert indexed[dataset_label].data.equals(
+                mapping[dataset_label].data
+            )
+
+    @pytest.mark.parametrize("engine", ["streaming", "auto"])
+    def test_enrich_engines(self, engine):
+        with execution_settings(ExecutionSettings(engine="in-memory")):
+            _, in_memory = self.enrich()
+        with execution_settings(ExecutionSettings(engine=engine)):
+            _, other = self.enrich()
+        for dataset_label in in_memory:
+            assert other[dataset_label].data.equals(
+                in_memory[dataset_label].data
+            )
+
+    @pytest.mark.parametrize("engine", ["in-memory", "streaming"])
+    def test_enrich_udf_spans(self, engine):
+        with execution_settings(ExecutionSettings(engine=engine)):
+            with profile() as report:
+                self.enrich()
+        udf_spans = [
+            s for s in report.spans if s.name.startswith("apply_map.")
+        ]
+        assert len(udf_spans) > 0
+        # the UDFs may run on polars threads, outside the enrich span
+        for udf_span in udf_spans:
+            assert udf_span.parent is not None
+
+    def test_enrich_over_memory_budget(self, tmp_path):
+        _, in_memory = self.enrich()
+        settings = ExecutionSettings(
+            memory_budget=1, spill_directory=str(tmp_path)
+        )
+        with execution_settings(settings), profile() as report:
+            _, spilled = self.enrich()
+        assert any(s.name == "spill" for s in report.spans)
+        # the spill directory is removed once the data is collected
+        assert list(tmp_path.iterdir()) == []
+        for dataset_label in in_memory:
+            assert spilled[dataset_label].data.equals(
+                in_memory[dataset_label].data
+            )
+
     def raw_data(self) -> dict:
         import polars as pl
 
@@ -1324,9 +1699,11 @@ class TestAggregation(abc.ABC):
         """Return the adapter implementation to test."""
         raise NotImplementedError
 
-    def container(self, path: str) -> CacheContainerView:
+    def container(
+        self, path: str, cache_container: str | None = None
+    ) -> CacheContainerView:
         source = get_absolute_path(path)
-        container = CacheContainerFactory.new()
+        container = CacheContainerFactory.new(cache_container)
         host = DirectoryIO()
         roots = host.load(source, format="yaml", maxdepth=3)
         for root in roots:
@@ -1350,10 +1727,10 @@ class TestAggregation(abc.ABC):
             cache_view=cache_view,
         )
 
-    def test_summarize(self):
+    def summarize(self, cache_container: str | None = None):
         data_import_config_id = "peh:ENRICHMENT_TEST_IMPORT_CONFIG"
         src_path = "./input/AggregationExamples/Aggregation"
-        cache_view = self.container(src_path)
+        cache_view = self.container(src_path, cache_container)
         dataset_series = self.raw_dataset_series(
             data_import_config_id=data_import_config_id, cache_view=cache_view
         )
@@ -1394,6 +1771,10 @@ class TestAggregation(abc.ABC):
             target_derived_from=target_derived_from,
             cache_view=cache_view,
         )
+        return adapter, ret
+
+    def test_summarize(self):
+        adapter, ret = self.summarize()
         assert isinstance(ret, DatasetSeries)
         assert len(ret.parts) == 2
 
@@ -1438,6 +1819,58 @@ class TestDataFrameAggregation(TestAggregation):
         except ImportError:
             pytest.skip("Necessary modules not installed")
 
+    def test_summarize_explain(self, caplog):
+        with caplog.at_level("INFO", logger="pypeh.core.utils.query_plans"):
+            with explain(profile=True) as report:
+                self.summarize()
+        assert [plan.dataset_label for plan in report.plans] == [
+            "TEST_SUMMARY",
+            "TEST_SUMMARY2",
+        ]
+        for plan in report.plans:
+            assert plan.operation == "group_results"
+            assert plan.stratum == ["current_year", "current_month"]
+            assert "AGGREGATE" in plan.plan
+            assert "node" in plan.node_timings.columns
+        assert "TEST_SUMMARY2" in caplog.text
+
+    def test_summarize_indexed_container(self):
+        _, mapping = self.summarize()
+        _, indexed = self.summarize(cache_container="indexed")
+        for dataset_label in mapping:
+            # group_by does not keep the order of the groups
+            expected = mapping[dataset_label].data
+            observed = indexed[dataset_label].data
+            assert observed.sort(expected.columns).equals(
+                expected.sort(expected.columns)
+            )
+
+    @pytest.mark.parametrize("engine", ["streaming", "auto"])
+    def test_summarize_engines(self, engine):
+        with execution_settings(ExecutionSettings(engine="in-memory")):
+            _, in_memory = self.summarize()
+        with execution_settings(ExecutionSettings(engine=engine)):
+            _, other = self.summarize()
+        for dataset_label in in_memory:
+            # group_by does not keep the order of the groups
+            expected = in_memory[dataset_label].data
+            observed = other[dataset_label].data
+            assert observed.sort(expected.columns).equals(
+                expected.sort(expected.columns)
+            )
+
+    def test_summarize_over_memory_budget(self):
+        _, in_memory = self.summarize()
+        with execution_settings(ExecutionSettings(memory_budget=1)):
+            _, streamed = self.summarize()
+        for dataset_label in in_memory:
+            # group_by does not keep the order of the groups
+            expected = in_memory[dataset_label].data
+            observed = streamed[dataset_label].data
+            assert observed.sort(expected.columns).equals(
+                expected.sort(expected.columns)
+            )
+
     def raw_data(self) -> dict:
         import polars as pl
 
@@ -7,7 +7,12 @@ from pypeh.core.cache.containers import (
     CacheContainerView,
 )
 from pypeh.core.cache.utils import load_entities_from_tree
-from pypeh.core.models.graph import Graph, Node
+from pypeh.core.models.graph import (
+    ExecutionPlan,
+    ExecutionStep,
+    Graph,
+    Node,
+)
 from pypeh.core.interfaces.dataops import DataEnrichmentInterface
 from pypeh.core.models.internal_data_layout import (
     ContextIndexProtocol,
@@ -112,6 +117,28 @@ class TestGraph:
 
         assert "Circular dependency detected" in str(excinfo.value)
 
+    def test_execution_plan_checkpoints_datasets_once(self):
+        def compute(datasets, node, base_fields):
+            return datasets[node.dataset_label] + [node.field_label]
+
+        plan = ExecutionPlan(
+            [
+                ExecutionStep(node=Node("A", "a1"), compute=compute),
+                ExecutionStep(node=Node("B", "b1"), compute=compute),
+                ExecutionStep(node=Node("A", "a2"), compute=compute),
+            ]
+        )
+        checkpoints = []
+
+        def checkpoint(result, dataset_label):
+            checkpoints.append((dataset_label, list(result)))
+            return result
+
+        datasets = {"A": [], "B": []}
+        plan.run(datasets, base_fields={}, checkpoint=checkpoint)
+        assert datasets == {"A": ["a1", "a2"], "B": ["b1"]}
+        assert checkpoints == [("B", ["b1"]), ("A", ["a1", "a2"])]
+
     def test_add_calculation_scalar_argument(self):
         g = Graph()
         target = Node("A", "result")
@@ -520,6 +520,92 @@ class TestJoinConditions:
         assert join.right_dataset == "C"
 
 
+@pytest.mark.core
+class TestMemoisedIndexes:
+    @staticmethod
+    def _series(n_parts: int) -> DatasetSeries:
+        series = DatasetSeries(label="series")
+        for i in range(n_parts):
+            dataset = series.add_empty_dataset(f"D{i}")
+            dataset.add_observable_property(
+                f"id_{i}", ObservablePropertyValueType.STRING
+            )
+        return series
+
+    def test_joins_resolved_lazily(self, monkeypatch):
+        series = self._series(30)
+        calls = []
+        original = Dataset.resolve_join
+
+        def counting_resolve_join(self, other):
+            calls.append((self.label, other.label))
+            return original(self, other)
+
+        monkeypatch.setattr(Dataset, "resolve_join", counting_resolve_join)
+        joins = series.resolve_all_joins()
+        assert len(joins) == 30 * 29 // 2
+        assert calls == []
+
+        key = frozenset(["D3", "D1"])
+        assert key in joins
+        assert joins[key] is None
+        assert calls == [("D1", "D3")]
+
+        assert series.resolve_all_joins().get(key) is None
+        assert len(calls) == 1
+        assert joins.get(frozenset(["D1", "missing"])) is None
+        assert frozenset(["D1"]) not in joins
+
+    def test_join_cache_invalidated_by_foreign_key(self):
+        series = self._series(3)
+        key = frozenset(["D0", "D1"])
+        assert series.resolve_all_joins()[key] is None
+
+        dataset = series["D1"]
+        dataset.add_observable_property(
+            "d0_ref", ObservablePropertyValueType.STRING
+        )
+        dataset.schema.add_foreign_key_link("d0_ref", "D0", "id_0")
+        join = series.resolve_all_joins()[key]
+        assert join == JoinSpec(
+            left_elements=("id_0",),
+            left_dataset="D0",
+            right_elements=("d0_ref",),
+            right_dataset="D1",
+        )
+        assert dict(series.resolve_all_joins()) == {
+            key: join,
+            frozenset(["D0", "D2"]): None,
+            frozenset(["D1", "D2"]): None,
+        }
+
+    def test_indexes_invalidated(self):
+        series = self._series(2)
+        index = series.get_contextual_field_reference_index()
+        assert set(index) == {"id_0", "id_1"}
+        assert series.get_contextual_field_reference_index() == index
+        validation_index = series._get_validation_index()
+        assert validation_index == series._get_validation_index()
+        # lookups of missing properties leave the memoised index unchanged
+        with pytest.raises(KeyError):
+            validation_index["missing"]
+        with pytest.raises(TypeError):
+            validation_index["missing"] = {}  # type: ignore[index]
+        assert "missing" not in series._get_validation_index()
+
+        series["D0"].add_observable_property(
+            "extra", ObservablePropertyValueType.STRING
+        )
+        assert "extra" in series.get_contextual_field_reference_index()
+
+        series.register_dataset(Dataset(label="D2"))
+        series["D2"].add_observable_property(
+            "id_0", ObservablePropertyValueType.STRING
+        )
+        assert series.get_contextual_field_reference_index()["id_0"] is None
+        assert set(series._get_validation_index()["id_0"]) == {"D0", "D2"}
+
+
 @pytest.mark.core
 class TestToTarget:
     @staticmethod
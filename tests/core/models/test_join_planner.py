@@ -0,0 +1,137 @@
+import pytest
+
+from pypeh.core.models.constants import ObservablePropertyValueType
+from pypeh.core.models.internal_data_layout import DatasetSeries, JoinSpec
+from pypeh.core.models.join_planner import JoinGraph, plan_join_tree
+
+
+def _series(links: dict[str, list[str]]) -> DatasetSeries:
+    """
+    Build a series where every dataset has an 'id' primary key and a
+    '<other>_id' foreign key for each dataset it references.
+    """
+    series = DatasetSeries(label="series")
+    labels = set(links)
+    for referenced in links.values():
+        labels.update(referenced)
+    for label in sorted(labels):
+        dataset = series.add_empty_dataset(label)
+        dataset.add_observable_property(
+            f"{label}_id_prop",
+            ObservablePropertyValueType.STRING,
+            element_label="id",
+            is_primary_key=True,
+        )
+        dataset.add_observable_property(
+            f"{label}_value_prop",
+            ObservablePropertyValueType.FLOAT,
+            element_label=f"{label}_value",
+        )
+    for label, referenced_labels in links.items():
+        dataset = series[label]
+        for referenced in referenced_labels:
+            dataset.add_observable_property(
+                f"{label}_{referenced}_prop",
+                ObservablePropertyValueType.STRING,
+                element_label=f"{referenced}_id",
+            )
+            dataset.schema.add_foreign_key_link(
+                f"{referenced}_id", referenced, "id"
+            )
+    return series
+
+
+@pytest.mark.core
+class TestJoinPlanner:
+    def test_direct_join_is_a_single_edge(self):
+        series = _series({"B": ["A"]})
+        tree = series.plan_join_tree("A", ["B"])
+        assert tree.join_specs == [
+            JoinSpec(
+                left_elements=("id",),
+                left_dataset="A",
+                right_elements=("A_id",),
+                right_dataset="B",
+            )
+        ]
+
+    def test_multi_hop_through_intermediate(self):
+        # A <- B <- C: A and C are only connected through B
+        series = _series({"B": ["A"], "C": ["B"]})
+        assert series.resolve_join("A", "C") is None
+
+        tree = series.plan_join_tree(
+            "A", ["C"], required_fields_by_dataset={"C": {"C_value"}}
+        )
+        assert tree.dataset_labels == ["A", "B", "C"]
+        assert [js.left_dataset for js in tree.join_specs] == ["A", "B"]
+        # intermediate datasets only contribute join keys
+        assert tree.required_fields_by_dataset == {
+            "A": {"id"},
+            "B": {"A_id", "id"},
+            "C": {"B_id", "C_value"},
+        }
+        assert series.resolve_join_path("C", "A") == [
+            JoinSpec(
+                left_elements=("B_id",),
+                left_dataset="C",
+                right_elements=("id",),
+                right_dataset="B",
+            ),
+            JoinSpec(
+                left_elements=("A_id",),
+                left_dataset="B",
+                right_elements=("id",),
+                right_dataset="A",
+            ),
+        ]
+
+    def test_steiner_tree_shares_intermediate(self):
+        # HUB links A with both C and D; the tree uses HUB once
+        series = _series({"HUB": ["A"], "C": ["HUB"], "D": ["HUB"]})
+        tree = series.plan_join_tree("A", ["C", "D"])
+        assert sorted(tree.dataset_labels) == ["A", "C", "D", "HUB"]
+        assert len(tree.join_specs) == 3
+
+    def test_shared_reference_is_a_direct_join(self):
+        # B and C both reference A: joined directly without A
+        series = _series({"B": ["A"], "C": ["A"]})
+        tree = series.plan_join_tree("B", ["C"])
+        assert tree.dataset_labels == ["B", "C"]
+        assert tree.join_specs[0].left_elements == ("A_id",)
+
+    def test_join_order_by_cardinality(self):
+        series = _series({"B": ["A"], "C": ["A"], "D": ["A"]})
+        tree = series.plan_join_tree(
+            "A", ["B", "C", "D"], cardinalities={"B": 500, "C": 5, "D": 50}
+        )
+        assert tree.dataset_labels == ["A", "C", "D", "B"]
+
+    def test_unreachable_dataset(self):
+        series = _series({"B": ["A"], "D": ["C"]})
+        with pytest.raises(ValueError, match="Could not resolve join path"):
+            series.plan_join_tree("A", ["D"])
+        assert series.resolve_join_path("A", "D") is None
+
+    def test_join_graph_follows_schema_changes(self):
+        series = _series({"B": ["A"]})
+        series.add_empty_dataset("C").add_observable_property(
+            "c_b", ObservablePropertyValueType.STRING, element_label="B_id"
+        )
+        assert series.resolve_join_path("A", "C") is None
+        series["C"].schema.add_foreign_key_link("B_id", "B", "id")
+        assert len(series.resolve_join_path("A", "C")) == 2
+
+    def test_plan_on_explicit_graph(self):
+        graph = JoinGraph()
+        graph.add_edge(
+            JoinSpec(
+                left_elements=("x",),
+                left_dataset="P",
+                right_elements=("y",),
+                right_dataset="Q",
+            )
+        )
+        tree = plan_join_tree(graph, "Q", ["P"])
+        assert tree.join_specs[0].left_dataset == "Q"
+        assert tree.join_specs[0].left_elements == ("y",)
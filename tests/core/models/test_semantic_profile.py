@@ -1,7 +1,10 @@
+import io
+import itertools
 import pytest
 
 from datetime import datetime
-from rdflib import Graph
+from rdflib import Dataset as RDFDataset, Graph, Literal, URIRef
+from rdflib.compare import isomorphic
 
 from pypeh.core.cache.containers import (
     CacheContainerFactory,
@@ -13,6 +16,7 @@ from pypeh.core.cache.utils import load_entities_from_tree
 
 from pypeh.core.models.semantic_profile import CSVWDatasetSchema
 from pypeh.core.utils.rdf_graph_builder import GraphBuilder
+from pypeh.core.utils.rdf_stream import write_ntriples
 from tests.test_utils.dirutils import get_absolute_path
 
 
@@ -50,3 +54,82 @@ class TestSemanticProfile:
             schema_profile=CSVWDatasetSchema,
         )
         assert isinstance(ret, Graph)
+
+
+@pytest.mark.core
+class TestStreamingSerialization:
+    @pytest.fixture(scope="class")
+    def dataset_series(self) -> DatasetSeries:
+        container = CacheContainerFactory.new()
+        roots = DirectoryIO().load(get_absolute_path("input"), format="yaml")
+        for root in roots:
+            for entity in load_entities_from_tree(root):
+                container.add(entity)
+        cache_view = CacheContainerView(container)
+        layout = cache_view.get(
+            "peh:CODEBOOK_v2.4_LAYOUT_SAMPLE_METADATA", "DataLayoutLayout"
+        )
+        # N-Triples requires absolute IRIs
+        counter = itertools.count()
+        return DatasetSeries.from_peh_datalayout(
+            layout,
+            cache_view=cache_view,
+            id_factory=lambda: f"https://example.org/id/{next(counter)}",
+        )
+
+    @staticmethod
+    def _serialize(dataset_series, format, chunk_size=7) -> str:
+        stream = io.StringIO()
+        GraphBuilder().serialize_series(
+            dataset_series,
+            stream,
+            provenance_info={
+                "creator": "https://orcid.org/000-000-000X",
+                "created": datetime(2024, 1, 1),
+            },
+            schema_profile=CSVWDatasetSchema,
+            format=format,
+            chunk_size=chunk_size,
+        )
+        return stream.getvalue()
+
+    @pytest.fixture(scope="class")
+    def expected(self, dataset_series) -> Graph:
+        return GraphBuilder().build_series(
+            dataset_series,
+            provenance_info={
+                "creator": "https://orcid.org/000-000-000X",
+                "created": datetime(2024, 1, 1),
+            },
+            schema_profile=CSVWDatasetSchema,
+        )
+
+    @pytest.mark.parametrize("format", ["nt", "turtle"])
+    def test_stream_matches_graph(self, dataset_series, expected, format):
+        data = self._serialize(dataset_series, format)
+        parsed = Graph().parse(data=data, format=format)
+        assert len(parsed) == len(expected)
+        assert isomorphic(parsed, expected)
+
+    def test_nquads_named_graph(self, dataset_series, expected):
+        data = self._serialize(dataset_series, "nquads")
+        parsed = RDFDataset()
+        parsed.parse(data=data, format="nquads")
+        graph = parsed.graph(URIRef(dataset_series.identifier))
+        assert isomorphic(graph, expected)
+
+    @pytest.mark.parametrize("format", ["nt", "nquads", "turtle"])
+    def test_output_is_reproducible(self, dataset_series, format):
+        first = self._serialize(dataset_series, format)
+        assert first == self._serialize(dataset_series, format, chunk_size=1)
+
+    def test_literal_escaping(self):
+        stream = io.StringIO()
+        subject = URIRef("https://example.org/s")
+        write_ntriples(
+            [(subject, URIRef("https://example.org/p"), Literal('a "b"\nc'))],
+            stream,
+        )
+        parsed = Graph().parse(data=stream.getvalue(), format="nt")
+        predicate = URIRef("https://example.org/p")
+        assert parsed.value(subject, predicate) == Literal('a "b"\nc')
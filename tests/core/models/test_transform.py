@@ -0,0 +1,93 @@
+import pytest
+
+from pypeh.core.models.transform import FieldMapping
+
+pl = pytest.importorskip("polars")
+
+
+def _double(value):
+    return None if value is None else value * 2
+
+
+@pytest.fixture
+def records():
+    return [
+        {"legacy_id": "1", "weight": 10, "name": " a ", "extra": True},
+        {"legacy_id": "2", "weight": None, "name": "b", "extra": False},
+    ]
+
+
+@pytest.mark.core
+class TestFieldMappingFrame:
+    def test_matches_row_wise_transform(self, records):
+        field_mapping = FieldMapping(
+            source_to_target={
+                "legacy_id": "id",
+                "weight": "weight_g",
+                "name": "label",
+                "missing": "other",
+            },
+            default_values={"unit": "g", "id": "unused"},
+            transformers={
+                "legacy_id": int,
+                "weight": _double,
+                "name": str.strip,
+            },
+        )
+        result = field_mapping.transform_frame_to_target(pl.DataFrame(records))
+        expected = [field_mapping.transform_to_target(r) for r in records]
+        assert result.columns == list(expected[0].keys())
+        assert result.to_dicts() == expected
+
+    def test_lazy_frame(self, records):
+        field_mapping = FieldMapping(
+            source_to_target={"weight": "weight_g", "name": "label"},
+            transformers={
+                "weight": _double,
+                "name": pl.col("name").str.len_chars(),
+            },
+            include_unmapped_fields=False,
+        )
+        lazy_frame = pl.LazyFrame(records)
+        with pytest.raises(ValueError, match="return dtype"):
+            field_mapping.transform_frame_to_target(lazy_frame)
+
+        result = field_mapping.transform_frame_to_target(
+            lazy_frame, return_dtypes={"weight": pl.Int64}
+        )
+        assert isinstance(result, pl.LazyFrame)
+        assert result.collect().rows() == [(20, 3), (None, 1)]
+
+    def test_round_trip(self, records):
+        field_mapping = FieldMapping(source_to_target={"legacy_id": "id"})
+        frame = pl.DataFrame(records)
+        target = field_mapping.transform_frame_to_target(frame)
+        assert "id" in target.columns
+        assert field_mapping.transform_frame_to_source(target).equals(frame)
+
+    def test_defaults_without_source_columns(self):
+        field_mapping = FieldMapping(
+            source_to_target={"a": "A"},
+            default_values={"c": 1},
+            include_unmapped_fields=False,
+        )
+        records = [{"b": 1}, {"b": 2}, {"b": 3}]
+        frame = pl.DataFrame(records)
+        expected = [field_mapping.transform_to_target(r) for r in records]
+        assert field_mapping.transform_frame_to_target(frame).to_dicts() == (
+            expected
+        )
+        lazy_result = field_mapping.transform_frame_to_target(frame.lazy())
+        assert lazy_result.collect().to_dicts() == expected
+
+    def test_str_expression_differs_from_row_wise(self):
+        field_mapping = FieldMapping(
+            source_to_target={"flag": "flag"}, transformers={"flag": str}
+        )
+        records = [{"flag": True}, {"flag": None}]
+        result = field_mapping.transform_frame_to_target(pl.DataFrame(records))
+        # polars formats booleans in lower case and keeps nulls
+        assert result["flag"].to_list() == ["true", None]
+        assert [
+            field_mapping.transform_to_target(r)["flag"] for r in records
+        ] == ["True", "None"]
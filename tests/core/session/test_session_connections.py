@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from pypeh.adapters.persistence.hosts import WebIO
+from pypeh.core.models.settings import ImportConfig, LocalFileConfig
+from pypeh.core.session.connections import ConnectionManager, ConnectionPool
+
+
+@pytest.mark.core
+class TestConnectionPool:
+    @staticmethod
+    def _manager(root, **kwargs) -> ConnectionManager:
+        config = ImportConfig(
+            connection_map={
+                "local": LocalFileConfig(
+                    label="local",
+                    config_dict={"root_folder": str(root)},
+                )
+            }
+        ).to_validated_import_config()
+        return ConnectionManager(config, **kwargs)
+
+    def test_connection_is_reused(self, tmp_path):
+        manager = self._manager(tmp_path)
+        with manager.get_connection(connection_label="local") as first:
+            pass
+        with manager.get_connection(connection_label="local") as second:
+            assert second is first
+
+    def test_concurrent_checkouts_are_exclusive(self, tmp_path):
+        manager = self._manager(tmp_path)
+        with manager.get_connection(connection_label="local") as first:
+            with manager.get_connection(connection_label="local") as second:
+                assert second is not first
+
+    def test_pool_size_zero_disables_pooling(self, tmp_path):
+        manager = self._manager(tmp_path, pool_size=0)
+        with manager.get_connection(connection_label="local") as first:
+            pass
+        with manager.get_connection(connection_label="local") as second:
+            assert second is not first
+
+    def test_idle_timeout(self, tmp_path):
+        manager = self._manager(tmp_path, idle_timeout=0.0)
+        with manager.get_connection(connection_label="local") as first:
+            pass
+        time.sleep(0.01)
+        with manager.get_connection(connection_label="local") as second:
+            assert second is not first
+
+    def test_unhealthy_connection_is_replaced(self, tmp_path, monkeypatch):
+        manager = self._manager(tmp_path)
+        with manager.get_connection(connection_label="local") as first:
+            pass
+        monkeypatch.setattr(first, "is_alive", lambda: False)
+        with manager.get_connection(connection_label="local") as second:
+            assert second is not first
+
+    def test_close_all(self, tmp_path):
+        manager = self._manager(tmp_path)
+        with manager.get_connection(connection_label="local") as first:
+            pass
+        manager.close_all()
+        with manager.get_connection(connection_label="local") as second:
+            assert second is not first
+
+    def test_pooled_web_connection_keeps_session(self):
+        pool = ConnectionPool(settings=None)  # type: ignore[arg-type]
+        adapter = pool.acquire()
+        assert isinstance(adapter, WebIO)
+        pool.release(adapter)
+        assert pool.acquire().session is adapter.session
+        adapter.close()
+        pool.release(adapter)
+        assert len(pool) == 0
+
+    def test_failed_connection_is_not_reused(self, tmp_path, monkeypatch):
+        manager = self._manager(tmp_path)
+        closed = []
+        with pytest.raises(RuntimeError, match="boom"):
+            with manager.get_connection(connection_label="local") as first:
+                monkeypatch.setattr(first, "close", lambda: closed.append(1))
+                raise RuntimeError("boom")
+        assert closed == [1]
+        with manager.get_connection(connection_label="local") as second:
+            assert second is not first
+
+    def test_session_pool_settings(self, tmp_path):
+        from pypeh import Session
+
+        session = Session(
+            connection_config=[
+                LocalFileConfig(
+                    label="local",
+                    config_dict={"root_folder": str(tmp_path)},
+                )
+            ],
+            default_connection=None,
+            pool_size=0,
+            idle_timeout=None,
+        )
+        assert session.connection_manager.pool_size == 0
+        assert session.connection_manager.idle_timeout is None
+        assert Session().connection_manager.pool_size == 4
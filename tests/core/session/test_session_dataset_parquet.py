@@ -91,6 +91,43 @@ class TestSessionParquet:
         assert lab_data is not None
         assert lab_data.shape == (2, 2)
 
+    def test_session_dataset_series_ipc_roundtrip(
+        self, parquet_session, dataset_series
+    ):
+        source_paths = parquet_session.dump_tabular_dataset_series(
+            dataset_series,
+            "series_ipc",
+            file_format="ipc",
+            connection_label="local_file",
+        )
+        assert all(path.endswith(".arrow") for path in source_paths)
+
+        loaded = parquet_session.read_tabular_dataset_series(
+            source_paths, file_format="ipc", connection_label="local_file"
+        )
+
+        assert set(loaded.parts) == {"SAMPLE", "LAB"}
+        assert loaded.context_lookup("peh:obs_lab", "peh:prop_chol") == (
+            "LAB",
+            "chol",
+        )
+        assert loaded.resolve_join("LAB", "SAMPLE") is not None
+        lab_dataset = loaded["LAB"]
+        assert isinstance(lab_dataset, Dataset)
+        assert lab_dataset.data is not None
+        assert lab_dataset.data.equals(dataset_series["LAB"].data)
+
+    def test_session_dataset_series_rejects_unknown_format(
+        self, parquet_session, dataset_series
+    ):
+        with pytest.raises(NotImplementedError, match="file_format='ipc'"):
+            parquet_session.dump_tabular_dataset_series(
+                dataset_series,
+                "series_csv",
+                file_format="csv",  # type: ignore[arg-type]
+                connection_label="local_file",
+            )
+
     def test_session_read_dataset_series_requires_explicit_files(
         self, parquet_session
     ):
@@ -11,9 +11,15 @@ from pypeh.core.cache.containers import CacheContainerView
 from pypeh.core.interfaces.dataops import (
     AggregationInterface,
     DataEnrichmentInterface,
+    ValidationInterface,
 )
 from pypeh.core.models.internal_data_layout import DatasetSeries
-from pypeh.core.models.settings import LocalFileConfig
+from pypeh.core.models.settings import ImportConfig, LocalFileConfig
+from pypeh.core.models.validation_errors import ValidationErrorReport
+from pypeh.core.utils.execution import (
+    ExecutionSettings,
+    current_execution_settings,
+)
 
 from pypeh.core.utils.namespaces import NamespaceManager
 from tests.test_utils.dirutils import get_absolute_path
@@ -49,6 +55,110 @@ class TestSessionResource:
         )
         assert isinstance(ret, Observation)
 
+    def test_load_resource_loads_defining_file_only(self):
+        session = get_session()
+        ret = session.load_resource(
+            "peh:OBSERVATION_ADULTS_URINE_LAB",
+            "Observation",
+            connection_label="local_file",
+        )
+        assert isinstance(ret, Observation)
+        assert len(session.cache) == 1
+        # the index is built once and reused
+        index = session.get_entity_index("local_file")
+        assert session.get_entity_index("local_file") is index
+        assert (
+            session.load_resource(
+                "peh:DOES_NOT_EXIST",
+                "Observation",
+                connection_label="local_file",
+            )
+            is None
+        )
+
+    def test_persisted_entity_index(self, tmp_path):
+        import shutil
+
+        shutil.copytree(
+            get_absolute_path("./input/default_localfile_data"),
+            tmp_path,
+            dirs_exist_ok=True,
+        )
+        session = get_session(str(tmp_path))
+        session.persist_entity_indexes = True
+        index = session.get_entity_index("local_file")
+        assert (tmp_path / ".pypeh-entity-index.idx").exists()
+
+        restored = get_session(str(tmp_path))
+        restored.persist_entity_indexes = True
+        assert (
+            restored.get_entity_index("local_file").to_json()
+            == index.to_json()
+        )
+        ret = restored.load_resource(
+            "peh:OBSERVATION_ADULTS_URINE_LAB_DESIGN",
+            "ObservationDesign",
+            connection_label="local_file",
+        )
+        assert ret.id == "peh:OBSERVATION_ADULTS_URINE_LAB_DESIGN"
+
+    def test_load_resource_through_import_map(self):
+        session = Session(
+            connection_config=[
+                LocalFileConfig(
+                    label="peh_repository",
+                    namespaces=["peh:"],
+                    config_dict={
+                        "root_folder": get_absolute_path(
+                            "./input/default_localfile_data"
+                        ),
+                    },
+                ),
+            ],
+        )
+        ret = session.load_resource(
+            "peh:OBSERVATION_ADULTS_URINE_LAB_DESIGN", "ObservationDesign"
+        )
+        assert ret.id == "peh:OBSERVATION_ADULTS_URINE_LAB_DESIGN"
+        with pytest.raises(ValueError, match="No connection_label"):
+            session.load_resource("TEST_DATA_LAYOUT", "DataLayout")
+
+    def test_resolve_typed_lazy_proxy(self):
+        from pypeh.core.models.proxy import TypedLazyProxy
+
+        session = get_session()
+        session.connection_manager._import_map = ImportConfig.dict_to_trie(
+            {"peh:": "local_file"}
+        )
+        proxy = TypedLazyProxy(
+            "peh:OBSERVATION_ADULTS_URINE_LAB", Observation, loader=None
+        )
+        ret = session.resolve_typed_lazy_proxy(proxy)
+        assert isinstance(ret, Observation)
+        assert ret.id == proxy.id
+
+    def test_lazy_resource(self):
+        session = get_session()
+        lazy = session.lazy_resource(
+            "peh:OBSERVATION_ADULTS_ANALYTICALINFO", "Observation"
+        )
+        assert len(session.cache) == 0
+        with pytest.raises(ValueError, match="No connection_label"):
+            lazy.observation_design
+
+        session = get_session()
+        session.connection_manager._import_map = ImportConfig.dict_to_trie(
+            {"peh:": "local_file"}
+        )
+        lazy = session.lazy_resource(
+            "peh:OBSERVATION_ADULTS_ANALYTICALINFO", "Observation"
+        )
+        assert len(session.cache) == 0
+        assert lazy.observation_design == (
+            "peh:OBSERVATION_ADULTS_ANALYTICALINFO_DESIGN"
+        )
+        assert session.cache.exists(lazy.id, "Observation")
+
 
 @pytest.mark.core
 class TestSessionDump:
@@ -70,6 +180,82 @@ class TestSessionDump:
         assert "observations" in test_data
 
 
+@pytest.mark.core
+class TestSessionLoadPersistedCache:
+    def test_parallel_load_matches_serial_load(self):
+        serial = get_session("../../adapters/persistence/input")
+        serial.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+        )
+        parallel = get_session("../../adapters/persistence/input")
+        parallel.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+            max_workers=2,
+        )
+        assert len(serial.cache) > 0
+        assert len(parallel.cache) == len(serial.cache)
+        for entity in serial.cache.get_all():
+            assert parallel.cache.exists(entity.id, type(entity).__name__)
+
+    def test_trusted_load_matches_validated_load(self):
+        validated = get_session("../../adapters/persistence/input")
+        validated.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+        )
+        trusted = get_session("../../adapters/persistence/input")
+        trusted.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+            trusted=True,
+        )
+        for entity in validated.cache.get_all():
+            entity_type = type(entity).__name__
+            assert trusted.cache.get(entity.id, entity_type) == entity
+
+    def test_cache_snapshot_roundtrip(self, tmp_path):
+        session = get_session("../../adapters/persistence/input")
+        session.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+        )
+        output = str(tmp_path / "cache.snapshot")
+        session.dump_cache(
+            output, file_format="snapshot", connection_label="local_file"
+        )
+
+        restored = get_session("../../adapters/persistence/input")
+        restored.load_cache_snapshot(output, connection_label="local_file")
+        assert len(restored.cache) == len(session.cache)
+        for entity in session.cache.get_all():
+            entity_type = type(entity).__name__
+            assert restored.cache.get(entity.id, entity_type) == entity
+
+    def test_open_cache_snapshot(self, tmp_path):
+        from pypeh.core.cache.snapshot import SnapshotContainer
+
+        session = get_session("../../adapters/persistence/input")
+        session.load_persisted_cache(
+            source="config_basic/_Reference_YAML",
+            connection_label="local_file",
+        )
+        output = str(tmp_path / "cache.snapshot")
+        session.dump_cache(
+            output, file_format="snapshot", connection_label="local_file"
+        )
+
+        shared = get_session("../../adapters/persistence/input")
+        shared.open_cache_snapshot(output, connection_label="local_file")
+        assert isinstance(shared.cache, SnapshotContainer)
+        assert len(shared.cache) == len(session.cache)
+        for entity in session.cache.get_all():
+            entity_type = type(entity).__name__
+            assert shared.cache.get(entity.id, entity_type) == entity
+        shared.cache.close()
+
+
 @pytest.mark.core
 class TestSessionMint:
     def test_mint_and_cache(self):
@@ -190,6 +376,7 @@ class RecordingAggregationAdapter(AggregationInterface):
                 "target_observations": target_observations,
                 "target_derived_from": target_derived_from,
                 "cache_view": cache_view,
+                "execution_settings": current_execution_settings(),
             }
         )
         return self._result
@@ -253,11 +440,27 @@ class RecordingEnrichmentAdapter(DataEnrichmentInterface):
                 "target_observations": target_observations,
                 "target_derived_from": target_derived_from,
                 "cache_view": cache_view,
+                "execution_settings": current_execution_settings(),
             }
         )
         return self._result
 
 
+class RecordingValidationAdapter(ValidationInterface):
+    def __init__(self):
+        self.execution_settings: list[ExecutionSettings] = []
+
+    def validate(
+        self,
+        dataset,
+        dependent_dataset_series=None,
+        cache_view=None,
+        allow_incomplete=False,
+    ) -> ValidationErrorReport:
+        self.execution_settings.append(current_execution_settings())
+        return ValidationErrorReport(timestamp="", total_errors=0)
+
+
 @pytest.mark.core
 class TestAdapterSignatureContracts:
     @staticmethod
@@ -403,3 +606,41 @@ class TestSessionEnrich:
                     self._make_observation("source_b"),
                 ],
             )
+
+
+@pytest.mark.core
+class TestSessionExecutionSettings:
+    def test_adapters_run_with_session_settings(self):
+        session = Session(
+            default_connection=None, memory_budget="1MB", engine="streaming"
+        )
+        # adapters are registered on the class, keep these to this session
+        session._adapter_mapping = {}
+        validation_adapter = RecordingValidationAdapter()
+        enrichment_adapter = RecordingEnrichmentAdapter(
+            result=DatasetSeries(label="enriched")
+        )
+        aggregation_adapter = RecordingAggregationAdapter(
+            result=DatasetSeries(label="summary")
+        )
+        session.register_adapter("validation", validation_adapter)
+        session.register_adapter("enrichment", enrichment_adapter)
+        session.register_adapter("aggregation", aggregation_adapter)
+
+        dataset_series = DatasetSeries(label="source")
+        dataset = dataset_series.add_empty_dataset("A")
+        dataset.data = {"x": [1, 2]}
+        session.validate_tabular_dataset(dataset)
+        session.validate_tabular_dataset_series(dataset_series)
+        session.enrich(dataset_series, [], [])
+        session.aggregate(dataset_series, [], [])
+
+        recorded = [
+            *validation_adapter.execution_settings,
+            enrichment_adapter.calls[0]["execution_settings"],
+            aggregation_adapter.calls[0]["execution_settings"],
+        ]
+        assert len(recorded) == 4
+        for settings in recorded:
+            assert settings is session.execution_settings
+        assert current_execution_settings() == ExecutionSettings()
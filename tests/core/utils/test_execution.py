@@ -0,0 +1,73 @@
+import os
+
+import pytest
+
+from pypeh.core.utils.execution import (
+    ExecutionSettings,
+    collect_engine,
+    current_execution_settings,
+    current_spill_directory,
+    execution_settings,
+    over_memory_budget,
+    parse_byte_size,
+)
+
+
+@pytest.mark.core
+class TestExecutionSettings:
+    @pytest.mark.parametrize(
+        "size, expected",
+        [
+            (1024, 1024),
+            ("512", 512),
+            ("2kb", 2000),
+            ("1.5 GiB", 3 * 2**29),
+            ("8GB", 8 * 10**9),
+        ],
+    )
+    def test_parse_byte_size(self, size, expected):
+        assert parse_byte_size(size) == expected
+
+    @pytest.mark.parametrize("size", ["", "GB", "1 parsec", "-1MB"])
+    def test_parse_byte_size_invalid(self, size):
+        with pytest.raises(ValueError):
+            parse_byte_size(size)
+
+    def test_over_memory_budget(self, tmp_path):
+        with over_memory_budget(10**12) as spill:
+            assert not spill
+            assert current_spill_directory() is None
+
+        settings = ExecutionSettings(
+            memory_budget=100, spill_directory=str(tmp_path)
+        )
+        with execution_settings(settings):
+            assert current_execution_settings() is settings
+            with over_memory_budget(None) as spill:
+                assert not spill
+            with over_memory_budget(100) as spill:
+                assert not spill
+            with over_memory_budget(101) as spill:
+                assert spill
+                directory = current_spill_directory()
+                assert os.path.dirname(directory) == str(tmp_path)
+            assert current_spill_directory() is None
+            assert not os.path.exists(directory)
+        assert current_execution_settings() == ExecutionSettings()
+
+    def test_collect_engine(self):
+        assert collect_engine() == "in-memory"
+        with execution_settings(ExecutionSettings(engine="streaming")):
+            assert collect_engine() == "streaming"
+        with execution_settings(ExecutionSettings(memory_budget=0)):
+            with over_memory_budget(1):
+                assert collect_engine() == "streaming"
+        with execution_settings(
+            ExecutionSettings(memory_budget=0, engine="in-memory")
+        ):
+            with over_memory_budget(1):
+                assert collect_engine() == "in-memory"
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError):
+            ExecutionSettings(engine="gpu")
@@ -0,0 +1,152 @@
+import pytest
+
+from pypeh.core.utils import profiling
+from pypeh.core.utils.profiling import (
+    NOOP_SPAN,
+    ProfileReport,
+    current_span,
+    profile,
+    span,
+    traced,
+)
+
+
+@traced()
+def _double(values):
+    return [value * 2 for value in values]
+
+
+@pytest.mark.core
+class TestProfiling:
+    def test_spans_are_noops_without_hooks(self):
+        assert not profiling.is_enabled()
+        with span("outer", rows=1) as active:
+            assert active is NOOP_SPAN
+            active.set_attribute("rows", 2)
+            assert current_span() is NOOP_SPAN
+        assert NOOP_SPAN.attributes == {}
+        assert _double([1]) == [2]
+
+    def test_nested_spans_and_report(self):
+        with profile() as report:
+            with span("outer", dataset_label="A") as outer:
+                assert current_span() is outer
+                with span("inner") as inner:
+                    inner.set_attribute("rows", 10)
+                assert _double([1, 2]) == [2, 4]
+            with pytest.raises(ValueError):
+                with span("failing"):
+                    raise ValueError("boom")
+        assert not profiling.is_enabled()
+
+        by_name = {finished.name: finished for finished in report.spans}
+        assert by_name["inner"].parent is by_name["outer"]
+        assert by_name["_double"].parent is by_name["outer"]
+        assert by_name["outer"].attributes == {"dataset_label": "A"}
+        assert by_name["failing"].attributes == {"error": "ValueError"}
+
+        summary = report.summary()
+        assert summary["inner"]["count"] == 1
+        assert summary["inner"]["rows"] == 10
+        outer_summary = summary["outer"]
+        assert outer_summary["self_seconds"] <= outer_summary["total_seconds"]
+        assert "outer" in report.format()
+
+    def test_explicit_parent_on_other_thread(self):
+        import threading
+
+        def run(parent):
+            with span("orphan"):
+                pass
+            with span("child", parent=parent):
+                pass
+
+        with profile() as report:
+            with span("outer") as outer:
+                worker = threading.Thread(target=run, args=(outer,))
+                worker.start()
+                worker.join()
+
+        by_name = {finished.name: finished for finished in report.spans}
+        assert by_name["orphan"].parent is None
+        assert by_name["child"].parent is by_name["outer"]
+
+    def test_record_data(self):
+        pl = pytest.importorskip("polars")
+        from pypeh.core.models.internal_data_layout import DatasetSeries
+
+        series = DatasetSeries(label="series")
+        series.add_empty_dataset("A").data = pl.DataFrame({"x": [1, 2]})
+        series.add_empty_dataset("B").data = pl.DataFrame({"x": [1]})
+        report = ProfileReport()
+        profiling.add_span_hook(report)
+        try:
+            with span("series") as active:
+                active.record_data(series)
+                active.record_data(pl.LazyFrame({"x": [1]}))
+        finally:
+            profiling.remove_span_hook(report)
+        (finished,) = report.spans
+        assert finished.attributes["dataset_labels"] == ["A", "B"]
+        assert finished.attributes["rows"] == 3
+        assert finished.attributes["bytes"] > 0
+
+    def test_opentelemetry_hook(self):
+        pytest.importorskip("opentelemetry")
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        hook = profiling.OpenTelemetryHook(provider.get_tracer("test"))
+        profiling.add_span_hook(hook)
+        try:
+            with span("outer", dataset_labels=["A"]):
+                with span("inner"):
+                    pass
+        finally:
+            profiling.remove_span_hook(hook)
+        inner, outer = exporter.get_finished_spans()
+        assert inner.parent.span_id == outer.context.span_id
+        assert outer.attributes["pypeh.dataset_labels"] == ("A",)
+
+
+@pytest.mark.dataframe
+class TestSessionProfiling:
+    def test_session_spans(self, tmp_path):
+        pl = pytest.importorskip("polars")
+        from pypeh import LocalFileConfig, Session
+        from pypeh.core.models.internal_data_layout import DatasetSeries
+
+        session = Session(
+            connection_config=[
+                LocalFileConfig(
+                    label="local_file",
+                    config_dict={"root_folder": str(tmp_path)},
+                )
+            ],
+            default_connection=None,
+        )
+        series = DatasetSeries(label="series")
+        series.add_empty_dataset("A").data = pl.DataFrame({"x": [1, 2, 3]})
+
+        with session.profile() as report:
+            paths = session.dump_tabular_dataset_series(
+                series, "out", connection_label="local_file"
+            )
+            session.read_tabular_dataset_series(
+                paths,
+                connection_label="local_file",
+                validate_foreign_keys=False,
+            )
+        summary = report.summary()
+        assert summary["Session.dump_tabular_dataset_series"]["rows"] == 3
+        assert summary["Session.read_tabular_dataset_series"]["rows"] == 3
+        (dump,) = [s for s in report.spans if s.name == "parquet.dump"]
+        assert dump.parent.name == "Session.dump_tabular_dataset_series"
+        assert dump.attributes["dataset_labels"] == ["A"]
+        assert dump.attributes["file_bytes"] > 0
@@ -0,0 +1,65 @@
+import logging
+
+import pytest
+
+from pypeh.core.utils.query_plans import (
+    QueryPlan,
+    active_report,
+    current_plan_labels,
+    explain,
+    plan_labels,
+)
+
+
+@pytest.mark.core
+class TestQueryPlans:
+    def test_plan_labels_nest(self):
+        assert current_plan_labels() == {}
+        with plan_labels(dataset_label="A"):
+            with plan_labels(stratum=["x"]):
+                assert current_plan_labels() == {
+                    "dataset_label": "A",
+                    "stratum": ["x"],
+                }
+            assert current_plan_labels() == {"dataset_label": "A"}
+        assert current_plan_labels() == {}
+
+    def test_explain_report(self, caplog):
+        assert active_report() is None
+        with caplog.at_level(logging.DEBUG):
+            with explain(log_level=logging.DEBUG) as report:
+                assert active_report() is report
+                report.add(
+                    QueryPlan(
+                        operation="group_results",
+                        plan="CROSS JOIN:\n...",
+                        dataset_label="A",
+                        stratum=["x"],
+                    )
+                )
+                report.add(QueryPlan(operation="collect", plan="DF"))
+        assert active_report() is None
+        (plan,) = report.for_dataset("A")
+        assert plan.has_cross_join
+        assert "group_results dataset=A stratum=['x']" in report.format()
+        assert "CROSS JOIN" in caplog.text
+
+
+@pytest.mark.dataframe
+class TestDataFrameAdapterCollect:
+    def test_collect_captures_plan(self):
+        pl = pytest.importorskip("polars")
+        from pypeh.adapters.dataops.dataframe_adapter import DataFrameAdapter
+
+        adapter = DataFrameAdapter()
+        data = pl.LazyFrame({"x": [1, 2, 3]}).filter(pl.col("x") > 1)
+        assert adapter.normalize_output(data).height == 2
+
+        with explain(profile=True) as report:
+            with plan_labels(dataset_label="A"):
+                result = adapter.normalize_output(data)
+        assert result.height == 2
+        (plan,) = report.plans
+        assert plan.dataset_label == "A"
+        assert "FILTER" in plan.plan
+        assert plan.node_timings.height > 0
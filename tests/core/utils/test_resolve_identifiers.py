@@ -0,0 +1,69 @@
+import pytest
+
+from pypeh.core.utils import resolve_identifiers as ri
+
+pl = pytest.importorskip("polars")
+
+VALUES = [
+    "https://w3id.org/peh/subject/1?a=b#c",
+    "peh:subject_1",
+    "not a uri",
+    "https://[::1]:8080/x",
+    "urn:isbn:0451450523",
+    "data/subject.csv",
+    None,
+    "https://w3id.org/peh\n",
+    "https://192.168.1.1/x",
+    "http://user@10.1.1.1",
+    "http://11.1.1.1/",
+    "https://example.org/10.1.1.1",
+]
+
+
+@pytest.mark.core
+class TestColumnarIdentifiers:
+    @pytest.mark.parametrize(
+        "column_fn, scalar_fn",
+        [
+            (ri.validate_uri_column, ri.validate_uri),
+            (ri.validate_uri_reference_column, ri.validate_uri_reference),
+            (ri.validate_curie_column, ri.validate_curie),
+            (ri.is_url_column, ri.is_url),
+        ],
+    )
+    def test_matches_scalar_validation(self, column_fn, scalar_fn):
+        mask = column_fn(pl.Series("identifier", VALUES))
+        assert mask.name == "identifier"
+        assert mask.to_list() == [
+            None if value is None else bool(scalar_fn(value))
+            for value in VALUES
+        ]
+
+    def test_arrow_input(self):
+        pa = pytest.importorskip("pyarrow")
+        mask = ri.validate_curie_column(pa.array(["peh:a", "not a curie"]))
+        assert isinstance(mask, pa.Array)
+        assert mask.to_pylist() == [True, False]
+
+    def test_expand_curie_column(self):
+        namespaces = {"peh": "https://w3id.org/peh/", "unbound": None}
+        column = pl.Series(["peh:a", "peh:b:c", None, "https://x.org/d"])
+        expanded = ri.expand_curie_column(
+            column, namespaces, on_unknown="keep"
+        )
+        assert expanded.to_list() == [
+            "https://w3id.org/peh/a",
+            "https://w3id.org/peh/b:c",
+            None,
+            "https://x.org/d",
+        ]
+        assert ri.expand_curie_column(
+            column, namespaces, on_unknown="null"
+        ).to_list() == [
+            "https://w3id.org/peh/a",
+            "https://w3id.org/peh/b:c",
+            None,
+            None,
+        ]
+        with pytest.raises(ValueError, match="unbound:e"):
+            ri.expand_curie_column(pl.Series(["unbound:e"]), namespaces)
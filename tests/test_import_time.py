@@ -0,0 +1,86 @@
+import subprocess
+import sys
+
+import pytest
+
+# cumulative time of a cold `import pypeh`, in microseconds. The lazy
+# package import takes well under a millisecond, the budget leaves room for
+# slow machines while catching an eager import of Session (~0.5 s).
+IMPORT_BUDGET_US = 100_000
+
+HEAVY_MODULES = (
+    "peh_model",
+    "linkml_runtime",
+    "polars",
+    "pydantic",
+    "requests",
+    "fsspec",
+)
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _cumulative_import_time(stderr: str, module: str) -> int:
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"{module} not found in -X importtime output")
+
+
+@pytest.mark.core
+class TestImportTime:
+    def test_import_budget(self):
+        result = _run("import pypeh", "-X", "importtime")
+        assert (
+            _cumulative_import_time(result.stderr, "pypeh") < IMPORT_BUDGET_US
+        )
+
+    def test_import_is_lazy(self):
+        result = _run(
+            "import sys, pypeh; "
+            f"print(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        assert result.stdout.strip() == "[]"
+
+    def test_public_names_resolve(self):
+        result = _run(
+            "import sys, pypeh; "
+            "from pypeh import Session, NamespaceManager; "
+            "print(Session.__module__, pypeh.__version__ is not None, "
+            "'peh_model.pydanticmodel_v2' in sys.modules)"
+        )
+        assert result.stdout.split() == [
+            "pypeh.core.session.session",
+            "True",
+            "False",
+        ]
+
+    def test_uri_validators_compile_on_first_use(self):
+        result = _run(
+            "from pypeh.core.models import uri_regex; "
+            "compiled = 'curie_validator' in vars(uri_regex); "
+            "uri_regex.curie_validator.match('ex:a'); "
+            "print(compiled, 'curie_validator' in vars(uri_regex))"
+        )
+        assert result.stdout.split() == ["False", "True"]
+
+    def test_validation_dto_type_hints_resolve(self):
+        result = _run(
+            "import sys, typing; "
+            "from pypeh.core.models.validation_dto import ("
+            "ValidationDesign, ValidationExpression); "
+            "typing.get_type_hints(ValidationExpression.from_peh); "
+            "typing.get_type_hints(ValidationDesign.from_peh); "
+            "print('peh_model.pydanticmodel_v2' in sys.modules)"
+        )
+        assert result.stdout.strip() == "False"
@@ -1,6 +1,13 @@
 import pytest
+import re
 
-from pypeh.core.utils.namespaces import ImportMap
+from peh_model.peh import ObservableProperty
+
+from pypeh.core.utils.namespaces import (
+    ImportMap,
+    NamespaceManager,
+    generate_ulids,
+)
 from pypeh.core.models.settings import (
     LocalFileConfig,
     S3Config,
@@ -36,6 +43,14 @@ class TestImportMap:
             ["s3://another.file", "s3://this.file"]
         )
 
+    def test_importmap_curie(self):
+        import_map = ImportMap()
+        import_map["peh:"] = "peh_repository"
+        import_map["https://w3id.org/peh/"] = "peh_web"
+        assert import_map["peh:OBSERVATION_A"] == "peh_repository"
+        assert import_map["https://w3id.org/peh/OBSERVATION_A"] == "peh_web"
+        assert import_map["other:OBSERVATION_A"] is None
+
 
 @pytest.mark.core
 class TestConfigMap:
@@ -58,3 +73,55 @@ class TestConfigMap:
         assert isinstance(import_config, ImportConfig)
         validated_config = import_config.to_validated_import_config()
         assert isinstance(validated_config, ValidatedImportConfig)
+
+
+ULID_PATTERN = r"[0-9A-HJKMNP-TV-Z]{26}"
+
+
+@pytest.mark.core
+class TestBulkMinting:
+    def test_generate_ulids_is_monotonic(self):
+        ulids = generate_ulids(2000) + generate_ulids(5)
+        assert len(set(ulids)) == len(ulids)
+        assert ulids == sorted(ulids)
+        assert all(re.fullmatch(ULID_PATTERN, ulid) for ulid in ulids)
+
+    def test_mint_many(self):
+        nm = NamespaceManager("https://w3id.org/example/id/")
+        iris = nm.mint_many(ObservableProperty, 100)
+        assert len(set(iris)) == 100
+        pattern = (
+            r"https://w3id\.org/example/id/observable-property/" + ULID_PATTERN
+        )
+        assert all(re.fullmatch(pattern, iri) for iri in iris)
+
+        nm.set_suffix_strategy(iter(range(3)).__next__)
+        assert nm.mint_many(ObservableProperty, 3)[-1].endswith("/2")
+
+    def test_mint_column(self):
+        pl = pytest.importorskip("polars")
+        nm = NamespaceManager("https://w3id.org/example/id/")
+        column = nm.mint_column(50, name="subject_id")
+        assert isinstance(column, pl.Series)
+        assert column.name == "subject_id"
+        assert column.dtype == pl.String
+        ids = column.to_list()
+        assert ids == sorted(ids) and len(set(ids)) == 50
+        assert all(
+            re.fullmatch(r"https://w3id\.org/example/id/" + ULID_PATTERN, id_)
+            for id_ in ids
+        )
+
+    def test_id_factory_pool(self):
+        nm = NamespaceManager("https://w3id.org/example/id/")
+        factory = nm.get_id_factory(pool_size=4)
+        ids = [factory() for _ in range(10)]
+        assert ids == sorted(ids) and len(set(ids)) == 10
+
+    def test_base_cache_follows_bindings(self):
+        nm = NamespaceManager()
+        nm.bind("project", "https://w3id.org/a")
+        nm.register_class(ObservableProperty, "project")
+        assert nm.mint(ObservableProperty).startswith("https://w3id.org/a/")
+        nm.bind("project", "https://w3id.org/b")
+        assert nm.mint(ObservableProperty).startswith("https://w3id.org/b/")